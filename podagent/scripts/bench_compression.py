@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark extractive pre-compression of hierarchical map inputs without any
+LLM calls: map-phase token reduction, time, and a cheap retention proxy (the
+share of each group's distinct content words, 4+ letters, that survive).
+
+Summary-level quality impact is measured end to end by summarizing with and
+without --compress under two labels and scoring one against the other:
+  python podagent/scripts/summarize.py EPISODE --hierarchical --podcasts-json eval.json --summary-label full
+  python podagent/scripts/summarize.py EPISODE --hierarchical --compress textrank \
+    --podcasts-json eval.json --summary-label textrank
+  python podagent/scripts/evaluate.py --predictions eval.json --reference-label full
+
+Usage:
+  PYTHONPATH=podagent/src python podagent/scripts/bench_compression.py --limit 5 \
+    --ratios 0.4 0.5 0.6 --index podagent/data/processed/faiss.index
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from podagent import config  # noqa: E402
+from podagent.models.agent import PodcastSummarizer, load_chunks_for_episode  # noqa: E402
+from podagent.models.batch import load_manifest  # noqa: E402
+from podagent.models.compression import METHODS  # noqa: E402
+from podagent.retriever.bm25 import bm25_tokenize  # noqa: E402
+
+
+def content_words(text: str) -> set:
+    return {t for t in bm25_tokenize(text) if len(t) >= 4 and not t.isdigit()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Map-phase extractive compression benchmark.")
+    parser.add_argument("--interim-dir", type=Path, default=config.INTERIM_DIR, help="Directory with manifest.jsonl and chunk files.")
+    parser.add_argument("--episodes", nargs="*", default=None, help="Episode ids (default: every manifest entry).")
+    parser.add_argument("--limit", type=int, default=5, help="At most this many episodes.")
+    parser.add_argument("--group-size", type=int, default=8, help="Chunks per group, as in hierarchical mode.")
+    parser.add_argument("--methods", nargs="*", choices=METHODS, default=None, help="Scoring methods (default: all available).")
+    parser.add_argument("--ratios", nargs="*", type=float, default=[0.4, 0.5, 0.6], help="Keep ratios to compare.")
+    parser.add_argument("--index", type=Path, default=None, help="Saved index; enables the embedding method.")
+    args = parser.parse_args()
+
+    retriever = None
+    if args.index:
+        from podagent.retriever import EmbeddingRetriever
+
+        retriever = EmbeddingRetriever.load(args.index)
+    methods = args.methods or [m for m in METHODS if m != "embedding" or retriever is not None]
+    agent = PodcastSummarizer(summarizer=object(), retriever=retriever)
+
+    entries = load_manifest(args.interim_dir, episode_ids=args.episodes, limit=args.limit)
+    episodes = [(e["episode_id"], load_chunks_for_episode(e["episode_id"], interim_dir=args.interim_dir)) for e in entries]
+    episodes = [(episode_id, chunks) for episode_id, chunks in episodes if chunks]
+    if not episodes:
+        raise SystemExit("No episodes with chunks found.")
+    originals = {episode_id: agent.group_texts(chunks, args.group_size) for episode_id, chunks in episodes}
+    print(f"{len(episodes)} episodes, {sum(len(g) for g in originals.values())} groups of {args.group_size} chunks")
+    print(f"{'method':<10} {'ratio':>5} {'tokens in':>10} {'tokens out':>10} {'reduction':>9} {'words':>7} {'ms/group':>9}")
+
+    for method in methods:
+        for ratio in args.ratios:
+            tokens_in = tokens_out = groups = 0
+            coverage = 0.0
+            seconds = 0.0
+            for episode_id, chunks in episodes:
+                started = time.perf_counter()
+                texts, stats = agent.map_inputs(episode_id, chunks, args.group_size, method, ratio)
+                seconds += time.perf_counter() - started
+                tokens_in += stats.tokens_in
+                tokens_out += stats.tokens_out
+                groups += stats.groups
+                for original, text in zip(originals[episode_id], texts):
+                    words = content_words(original)
+                    coverage += len(words & content_words(text)) / max(len(words), 1)
+            reduction = 1.0 - tokens_out / tokens_in if tokens_in else 0.0
+            print(
+                f"{method:<10} {ratio:>5.2f} {tokens_in:>10} {tokens_out:>10} {reduction:>9.1%} "
+                f"{coverage / max(groups, 1):>7.3f} {1000 * seconds / max(groups, 1):>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Measure cold-start import time of every script with `python -X importtime`.
+
+Each script is run with `--help` in a fresh interpreter, so all of its
+top-level imports execute and argparse exits before any work starts. The
+script fails if any run exceeds `--budget-ms` or imports one of the heavy
+modules that should only load on first use (torch, faiss, provider SDKs, ...).
+
+Usage:
+  python podagent/scripts/bench_imports.py --budget-ms 400
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that must not be imported just to start a script.
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "faiss",
+    "bert_score",
+    "rouge_score",
+    "nltk",
+    "openai",
+    "together",
+    "fastapi",
+)
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    (total ms, {top-level module: cumulative ms}) from `-X importtime` output.
+    Nested imports are indented under their importer, so summing the
+    unindented rows gives the total without double counting.
+    """
+    total_us = 0
+    top: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, fields = line.partition(":")
+        parts = fields.split("|")
+        if len(parts) != 3:
+            continue
+        cumulative = int(parts[1].strip())
+        name = parts[2].rstrip()
+        if name.startswith(" ") and not name.startswith("  "):
+            total_us += cumulative
+            top[name.strip()] = cumulative / 1000.0
+    return total_us / 1000.0, top
+
+
+def imported_modules(stderr: str) -> List[str]:
+    names = []
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            names.append(line.rsplit("|", 1)[-1].strip())
+    return names
+
+
+def measure(script: Path, repeat: int) -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Best-of-`repeat` import time for one script, with its heaviest top-level
+    imports and any heavy modules it pulled in.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(ROOT / "src"), env.get("PYTHONPATH")) if p)
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", str(script), "--help"],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{script.name} --help failed:\n{proc.stderr[-2000:]}")
+        total, top = parse_importtime(proc.stderr)
+        if best is None or total < best[0]:
+            heavy = sorted(
+                {name.split(".")[0] for name in imported_modules(proc.stderr)} & set(HEAVY_MODULES)
+            )
+            best = (total, top, heavy)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark for the scripts.")
+    parser.add_argument("scripts", nargs="*", type=Path, help="Scripts to measure (default: all in scripts/).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per script; the fastest is reported.")
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Fail when a script's imports exceed this.")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest top-level imports to list per script.")
+    args = parser.parse_args()
+
+    scripts = args.scripts or sorted(
+        p for p in (ROOT / "scripts").glob("*.py") if p.name != Path(__file__).name
+    )
+    failures = []
+    for script in scripts:
+        total, top, heavy = measure(script, args.repeat)
+        heaviest = sorted(top.items(), key=lambda kv: -kv[1])[: args.top]
+        detail = ", ".join(f"{name} {ms:.0f}ms" for name, ms in heaviest)
+        print(f"{script.name:32s} {total:8.1f} ms  ({detail})")
+        if heavy:
+            failures.append(f"{script.name} imports {', '.join(heavy)} at startup")
+        if total > args.budget_ms:
+            failures.append(f"{script.name} takes {total:.0f} ms > {args.budget_ms:.0f} ms budget")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        raise SystemExit(1)
+    print(f"All {len(scripts)} scripts within {args.budget_ms:.0f} ms and free of heavy imports.")
+
+
+if __name__ == "__main__":
+    main()
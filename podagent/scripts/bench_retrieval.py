@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Benchmark dense-only vs hybrid (BM25 + dense) retrieval latency, and with
+--compare-backends the memory, latency and recall of each vector storage mode
+(numpy float32/float16, int8, PQ, with and without float32 re-ranking) against
+flat FAISS. --episodes compares flat chunk search with two-stage
+(episode centroid, then chunk) search.
+
+Queries come from --queries (one per line) or are sampled from the indexed
+chunks: a few of each sampled chunk's rarest terms (names, numbers, jargon),
+so "hit" reports how often the source chunk is retrieved in the top k.
+
+Usage:
+  PYTHONPATH=podagent/src python podagent/scripts/bench_retrieval.py \
+    --index podagent/data/processed/chunks.index --episode-filter
+  PYTHONPATH=podagent/src python podagent/scripts/bench_retrieval.py \
+    --index podagent/data/processed/chunks.index --compare-backends --scale 50
+"""
+import argparse
+import copy
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from podagent import config  # noqa: E402
+from podagent.retriever import EmbeddingRetriever, build_index_from_chunks  # noqa: E402
+from podagent.retriever.backends import FaissBackend, load_faiss, make_backend  # noqa: E402
+from podagent.retriever.bm25 import bm25_tokenize  # noqa: E402
+
+
+def sample_queries(retriever: EmbeddingRetriever, n: int, terms: int, seed: int):
+    """
+    (query, source row) pairs built from each sampled chunk's highest-IDF terms.
+    """
+    rng = random.Random(seed)
+    bm25 = retriever.bm25
+    rows = rng.sample(range(len(retriever.chunks)), min(n, len(retriever.chunks)))
+    queries = []
+    for row in rows:
+        tokens = set(bm25_tokenize(retriever.chunks[row]["text"]))
+        ranked = sorted(
+            (t for t in tokens if t in bm25.term_ids and len(t) > 2),
+            key=lambda t: -bm25.idf[bm25.term_ids[t]],
+        )
+        if ranked:
+            queries.append((" ".join(ranked[:terms]), row))
+    return queries
+
+
+def run(retriever, queries, k, episode_filter, **search_kwargs):
+    latencies = []
+    hits = 0
+    for query, row in queries:
+        episode_id = retriever.chunks[row].get("episode_id") if (episode_filter and row is not None) else None
+        started = time.perf_counter()
+        results = retriever.search(query, k=k, episode_id=episode_id, **search_kwargs)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if row is not None:
+            hits += any(r.chunk is retriever.chunks[row] for r in results)
+    return latencies, hits
+
+
+def compare_backends(retriever, queries, k, scale, episode_filter, seed) -> None:
+    """
+    Memory, latency and recall@k of each vector backend and storage mode
+    against exact flat search over the same vectors. `scale` tiles the corpus with small noise to estimate
+    behaviour at larger sizes.
+    """
+    base = retriever.backend.reconstruct(np.arange(retriever.backend.ntotal))
+    vectors = base
+    if scale > 1:
+        rng = np.random.default_rng(seed)
+        noisy = np.repeat(base, scale - 1, axis=0)
+        noisy += rng.normal(0.0, 0.02, noisy.shape).astype(np.float32)
+        noisy /= np.linalg.norm(noisy, axis=1, keepdims=True)
+        vectors = np.vstack([base, noisy])
+    query_vecs = retriever.encode([q for q, _ in queries])
+    filters = [None] * len(queries)
+    if episode_filter:
+        # Episode rows within the original corpus; tiled copies stay unfiltered.
+        filters = [retriever._rows_for(retriever.chunks[row].get("episode_id"), None) for _, row in queries]
+
+    backends = []
+    if load_faiss() is not None:
+        backends.append(("faiss/flat", FaissBackend.from_vectors(vectors)))
+    for storage in ("float32", "float16", "int8", "pq"):
+        started = time.perf_counter()
+        store = make_backend(vectors, backend="numpy", storage=storage)
+        backends.append((f"numpy/{storage}", store))
+        if storage in ("int8", "pq"):
+            print(f"built {storage} codes in {time.perf_counter() - started:.1f}s")
+            # Same codes; the float32 re-rank matrix is memory-mapped from disk when serving.
+            reranked = copy.copy(store)
+            reranked.full = vectors
+            backends.append((f"numpy/{storage}+rerank", reranked))
+
+    reference = None
+    print(f"\n{vectors.shape[0]} vectors x {vectors.shape[1]} dims, {len(queries)} queries, k={k}")
+    for name, backend in backends:
+        for vec, rows in zip(query_vecs[:5], filters[:5]):
+            backend.search(vec, k, rows)
+        latencies = []
+        results = []
+        for vec, rows in zip(query_vecs, filters):
+            started = time.perf_counter()
+            results.append([row for row, _ in backend.search(vec, k, rows)])
+            latencies.append((time.perf_counter() - started) * 1000)
+        reference = reference or results
+        recall = statistics.fmean(
+            len(set(got) & set(want)) / max(1, len(want)) for got, want in zip(results, reference)
+        )
+        print(
+            f"{name:20s} mean={statistics.fmean(latencies):7.3f}ms  p50={statistics.median(latencies):7.3f}ms"
+            f"  resident={backend.nbytes / 2**20:8.1f}MiB  recall@{k}={recall:.4f}"
+        )
+
+
+def compare_two_stage(retriever, queries, num_episodes, chunks_per_episode) -> None:
+    """
+    Latency of flat chunk search (enough results to cover the same chunk count)
+    against `search_episodes`, and how often both surface the source episode.
+    """
+    retriever.episodes  # build centroids outside the timed loop
+    rows = [
+        ("flat", lambda q: {r.chunk.get("episode_id") for r in retriever.search(q, k=num_episodes * chunks_per_episode)}),
+        ("two-stage", lambda q: {r.episode_id for r in retriever.search_episodes(q, num_episodes, chunks_per_episode)}),
+    ]
+    print(f"\n{len(retriever.episodes)} episodes, {len(retriever.chunks)} chunks, top {num_episodes} episodes")
+    for name, run_query in rows:
+        latencies = []
+        hits = 0
+        for query, row in queries:
+            started = time.perf_counter()
+            found = run_query(query)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if row is not None:
+                hits += retriever.chunks[row].get("episode_id") in found
+        line = f"{name:16s} mean={statistics.fmean(latencies):7.3f}ms  p50={statistics.median(latencies):7.3f}ms"
+        if queries and queries[0][1] is not None:
+            line += f"  episode hit={hits / len(queries):.1%}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dense vs hybrid retrieval latency benchmark.")
+    parser.add_argument("--index", type=Path, default=None, help="Saved index (default: build from --interim-dir).")
+    parser.add_argument("--interim-dir", type=Path, default=config.INTERIM_DIR, help="Chunk JSONL directory.")
+    parser.add_argument("--queries", type=Path, default=None, help="Text file with one query per line.")
+    parser.add_argument("--num-queries", type=int, default=200, help="Sampled queries when --queries is not given.")
+    parser.add_argument("--query-terms", type=int, default=3, help="Rare terms per sampled query.")
+    parser.add_argument("--k", type=int, default=5, help="Results per query.")
+    parser.add_argument("--episode-filter", action="store_true", help="Restrict each sampled query to its source episode.")
+    parser.add_argument("--backend", choices=["auto", "faiss", "numpy"], default="auto", help="Vector backend for --index.")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map numpy vectors when loading --index.")
+    parser.add_argument(
+        "--compare-backends",
+        action="store_true",
+        help="Also compare vector backends (recall is measured against the first one: FAISS when installed).",
+    )
+    parser.add_argument("--scale", type=int, default=1, help="Tile the corpus this many times for --compare-backends.")
+    parser.add_argument("--episodes", type=int, default=0, help="Also compare flat vs two-stage search returning this many episodes.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.index:
+        retriever = EmbeddingRetriever.load(args.index, backend=args.backend, mmap=args.mmap)
+    else:
+        retriever = build_index_from_chunks(interim_dir=args.interim_dir, backend=args.backend)
+    if not retriever.chunks:
+        raise SystemExit("No chunks indexed.")
+
+    if args.queries:
+        lines = args.queries.read_text(encoding="utf-8").splitlines()
+        queries = [(line.strip(), None) for line in lines if line.strip()]
+    else:
+        queries = sample_queries(retriever, args.num_queries, args.query_terms, args.seed)
+
+    # Warm up the encoder, BM25 postings and filter selectors.
+    for mode in ("dense", "hybrid"):
+        run(retriever, queries[:5], args.k, args.episode_filter, mode=mode)
+
+    print(f"{len(retriever.chunks)} chunks, {len(queries)} queries, k={args.k}, backend={retriever.backend.name}")
+    baseline = None
+    for name, kwargs in (
+        ("dense", {"mode": "dense"}),
+        ("hybrid/rrf", {"mode": "hybrid", "fusion": "rrf"}),
+        ("hybrid/weighted", {"mode": "hybrid", "fusion": "weighted"}),
+    ):
+        latencies, hits = run(retriever, queries, args.k, args.episode_filter, **kwargs)
+        mean = statistics.fmean(latencies)
+        p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+        baseline = mean if baseline is None else baseline
+        line = f"{name:16s} mean={mean:7.3f}ms  p50={statistics.median(latencies):7.3f}ms  p95={p95:7.3f}ms"
+        line += f"  overhead={mean - baseline:+7.3f}ms"
+        if not args.queries:
+            line += f"  hit@{args.k}={hits / len(queries):.1%}"
+        print(line)
+
+    if args.episodes:
+        compare_two_stage(retriever, queries, args.episodes, 3)
+
+    if args.compare_backends:
+        compare_backends(retriever, queries, args.k, args.scale, args.episode_filter and not args.queries, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Check native ROUGE-L against rouge-score and benchmark both on long inputs.
+
+By default every summary in podcasts.json is scored against its entry's full
+transcript (the worst case: ~2k-word abstract vs ~40k-word reference).
+
+Usage:
+  PYTHONPATH=podagent/src python podagent/scripts/bench_rouge.py \
+    --podcasts-json podagent/src/web/frontend/src/data/podcasts.json
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from podagent.eval.metrics import get_rouge_scorer, rouge_l  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Native ROUGE-L parity check and benchmark.")
+    parser.add_argument(
+        "--podcasts-json",
+        type=Path,
+        default=ROOT / "src" / "web" / "frontend" / "src" / "data" / "podcasts.json",
+        help="podcasts.json with summaries and transcripts.",
+    )
+    parser.add_argument("--no-stemmer", action="store_true", help="Disable Porter stemming.")
+    args = parser.parse_args()
+
+    data = json.loads(args.podcasts_json.read_text(encoding="utf-8"))
+    pairs = []
+    for key, entry in data.items():
+        transcript = entry.get("transcript") or ""
+        for label, summary in (entry.get("summaries") or {}).items():
+            abstract = summary.get("abstract", "") if isinstance(summary, dict) else str(summary)
+            if transcript and abstract:
+                pairs.append((f"{key}/{label}", transcript, abstract))
+    if not pairs:
+        raise SystemExit("No summary/transcript pairs found.")
+
+    use_stemmer = not args.no_stemmer
+    reference_scorer = get_rouge_scorer(use_stemmer)
+    if reference_scorer is None:
+        print("rouge-score is not installed; benchmarking native implementation only.", file=sys.stderr)
+
+    native_total = 0.0
+    reference_total = 0.0
+    mismatches = 0
+    for name, transcript, abstract in pairs:
+        started = time.perf_counter()
+        native = rouge_l(transcript, abstract, use_stemmer=use_stemmer)
+        native_s = time.perf_counter() - started
+        native_total += native_s
+
+        line = f"{name[:70]:70s}  F={native['rougeL_f']:.4f}  native={native_s * 1000:8.1f}ms"
+        if reference_scorer is not None:
+            started = time.perf_counter()
+            ref = reference_scorer.score(transcript, abstract)["rougeL"]
+            ref_s = time.perf_counter() - started
+            reference_total += ref_s
+            same = all(
+                math.isclose(a, b, rel_tol=0, abs_tol=1e-12)
+                for a, b in (
+                    (native["rougeL_f"], ref.fmeasure),
+                    (native["rougeL_p"], ref.precision),
+                    (native["rougeL_r"], ref.recall),
+                )
+            )
+            mismatches += 0 if same else 1
+            line += f"  rouge_score={ref_s * 1000:8.1f}ms  {'ok' if same else 'MISMATCH'}"
+        print(line)
+
+    print(f"\n{len(pairs)} pairs  native total {native_total:.2f}s", end="")
+    if reference_scorer is not None:
+        speedup = reference_total / native_total if native_total else float("inf")
+        print(f"  rouge_score total {reference_total:.2f}s  speedup {speedup:.1f}x  mismatches {mismatches}")
+        if mismatches:
+            raise SystemExit(1)
+    else:
+        print()
+
+
+if __name__ == "__main__":
+    main()
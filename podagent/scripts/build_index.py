@@ -4,6 +4,7 @@ Build an embedding index over chunked transcripts.
 """
 import argparse
 import sys
+import time
 from pathlib import Path
 
 
@@ -28,6 +29,30 @@ def main():
         default="sentence-transformers/all-MiniLM-L6-v2",
         help="SentenceTransformer model name.",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["auto", "faiss", "numpy"],
+        default="auto",
+        help="Vector backend (auto: faiss when installed, numpy otherwise).",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["float32", "float16", "int8", "pq"],
+        default="float32",
+        help="Vector storage: float32, float16, scalar-quantized int8, or product-quantized codes (non-float32 uses the numpy backend).",
+    )
+    parser.add_argument(
+        "--no-rerank-vectors",
+        action="store_true",
+        help="With int8/pq storage, don't also save float32 vectors for re-ranking.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Encoder processes; each loads the model and takes an equal share of the CPU threads.",
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per encoder batch.")
     parser.add_argument(
         "--output",
         type=Path,
@@ -36,9 +61,20 @@ def main():
     )
     args = parser.parse_args()
 
-    retriever = build_index_from_chunks(interim_dir=args.interim_dir, model_name=args.model_name)
+    started = time.perf_counter()
+    retriever = build_index_from_chunks(
+        interim_dir=args.interim_dir,
+        model_name=args.model_name,
+        backend=args.backend,
+        storage=args.storage,
+        rerank=not args.no_rerank_vectors,
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"Indexed {len(retriever.chunks)} chunks in {elapsed:.1f}s with {args.workers} worker(s)")
     retriever.save(args.output)
-    print(f"Saved index to {args.output}")
+    print(f"Saved {retriever.backend.name} ({retriever.backend.storage}) index to {args.output}")
 
 
 if __name__ == "__main__":
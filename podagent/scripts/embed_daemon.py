@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Run the embedding daemon: a long-lived process that keeps the encoder and
+indexes warm and serves encode/search requests on a Unix socket. While it is
+running, `EmbeddingRetriever` (summarize.py --index, build_index.py,
+search_episodes.py, ...) uses it automatically; set PODAGENT_EMBED_DAEMON=0 to
+opt out.
+
+Examples:
+  python podagent/scripts/embed_daemon.py --index podagent/data/processed/chunks.index &
+  python podagent/scripts/embed_daemon.py --status
+  python podagent/scripts/embed_daemon.py --stop
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from podagent.retriever.daemon import DaemonClient, DaemonError, EmbeddingDaemon, default_socket_path  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm embedding/search daemon on a Unix socket.")
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Socket path (default: $PODAGENT_EMBED_SOCKET or a per-user path in the temp dir).",
+    )
+    parser.add_argument(
+        "--model-name",
+        type=str,
+        action="append",
+        default=None,
+        help="SentenceTransformer model to preload (repeatable; default all-MiniLM-L6-v2).",
+    )
+    parser.add_argument("--index", type=Path, action="append", default=[], help="Saved index to preload (repeatable).")
+    parser.add_argument("--backend", choices=["auto", "faiss", "numpy"], default="auto", help="Backend for preloaded indexes.")
+    parser.add_argument("--mmap", action="store_true", help="Memory-map preloaded numpy vectors.")
+    parser.add_argument("--status", action="store_true", help="Print the running daemon's status and exit.")
+    parser.add_argument("--stop", action="store_true", help="Stop the running daemon and exit.")
+    args = parser.parse_args()
+
+    socket_path = args.socket or default_socket_path()
+    if args.status or args.stop:
+        client = DaemonClient(socket_path, timeout=10.0)
+        try:
+            reply, _ = client.request({"op": "shutdown" if args.stop else "ping"})
+        except DaemonError as exc:
+            raise SystemExit(f"No embedding daemon at {socket_path}: {exc}")
+        print(json.dumps(reply, indent=2))
+        return
+
+    daemon = EmbeddingDaemon(socket_path)
+    models = args.model_name or ["sentence-transformers/all-MiniLM-L6-v2"]
+    for model_name in models:
+        daemon.preload_model(model_name)
+    for index_path in args.index:
+        # Keys must match what clients send; EmbeddingRetriever.load defaults apart from these.
+        daemon.preload_index(
+            index_path,
+            {"model_name": models[0], "backend": args.backend, "mmap": args.mmap, "storage": None, "rerank": False},
+        )
+    print(f"Embedding daemon listening on {socket_path} (models: {', '.join(models)})", flush=True)
+    daemon.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
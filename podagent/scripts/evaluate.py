@@ -1,28 +1,151 @@
 #!/usr/bin/env python3
 """
-Evaluate a predicted summary against a reference using ROUGE-L and optional BERTScore.
+Evaluate summaries using ROUGE-L and optional BERTScore.
+
+Single pair:
+  python podagent/scripts/evaluate.py --reference "..." --prediction "..."
+
+Batch (directory of output JSONs or a merged podcasts.json):
+  python podagent/scripts/evaluate.py \
+    --predictions podagent/src/web/frontend/src/data/podcasts.json \
+    --reference-label GPT-4o --results results.csv
+
+Faithfulness/coverage of output JSONs against the indexed transcript chunks:
+  python podagent/scripts/evaluate.py --faithfulness \
+    --predictions outputs/ --index data/processed/chunks.index --results faithfulness.json
 """
 import argparse
+import json
 import sys
+import time
 from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT / "src"))
 
+from podagent.eval.batch import (  # noqa: E402
+    build_pairs,
+    evaluate_pairs,
+    load_predictions,
+    load_references,
+    write_results,
+)
 from podagent.eval.metrics import compute_bert_score, compute_rouge_l  # noqa: E402
 
 
 def main():
     parser = argparse.ArgumentParser(description="Evaluate summaries.")
-    parser.add_argument("--reference", required=True, help="Reference summary text.")
-    parser.add_argument("--prediction", required=True, help="Model summary text.")
+    parser.add_argument("--reference", help="Reference summary text.")
+    parser.add_argument("--prediction", help="Model summary text.")
+    parser.add_argument(
+        "--predictions",
+        type=Path,
+        default=None,
+        help="Batch mode: directory of output JSONs (scripts/summarize.py --output-json) or a merged podcasts.json.",
+    )
+    parser.add_argument(
+        "--references",
+        type=Path,
+        default=None,
+        help="Batch mode: directory of <key>.txt reference files or a JSON object mapping key -> text.",
+    )
+    parser.add_argument(
+        "--reference-label",
+        type=str,
+        default=None,
+        help="Batch mode: use the summary with this label as the reference for the other labels of the same key.",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="ROUGE worker processes (default: CPU count).")
+    parser.add_argument("--no-bert", action="store_true", help="Skip BERTScore in batch mode.")
+    parser.add_argument("--bert-batch-size", type=int, default=32, help="BERTScore batch size.")
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=None,
+        help="Batch mode: write the results table here (.csv, or .json).",
+    )
+    parser.add_argument(
+        "--faithfulness",
+        action="store_true",
+        help="Score output JSONs (--predictions: a file or directory) for embedding-based faithfulness, coverage and compression. Requires --index.",
+    )
+    parser.add_argument("--index", type=Path, default=None, help="Saved FAISS index for --faithfulness.")
+    parser.add_argument(
+        "--support-threshold",
+        type=float,
+        default=0.45,
+        help="Cosine similarity at which a claim counts as supported by its best chunk.",
+    )
     args = parser.parse_args()
 
-    rouge = compute_rouge_l(args.reference, args.prediction)
-    bert = compute_bert_score(args.reference, args.prediction)
-    print("ROUGE-L:", rouge)
-    print("BERTScore:", bert)
+    if args.faithfulness:
+        if args.predictions is None or args.index is None:
+            parser.error("--faithfulness requires --predictions and --index.")
+        run_faithfulness(args)
+        return
+
+    if args.predictions is None:
+        if args.reference is None or args.prediction is None:
+            parser.error("--reference and --prediction are required unless --predictions is given.")
+        rouge = compute_rouge_l(args.reference, args.prediction)
+        bert = compute_bert_score(args.reference, args.prediction)
+        print("ROUGE-L:", rouge)
+        print("BERTScore:", bert)
+        return
+
+    if args.references is None and args.reference_label is None:
+        parser.error("Batch mode needs --references or --reference-label.")
+
+    references = load_references(args.references) if args.references else None
+    pairs = build_pairs(load_predictions(args.predictions), references, args.reference_label)
+    if not pairs:
+        raise SystemExit("No prediction/reference pairs matched.")
+
+    started = time.perf_counter()
+    rows = evaluate_pairs(
+        pairs,
+        workers=args.workers,
+        use_bert=not args.no_bert,
+        bert_batch_size=args.bert_batch_size,
+    )
+    elapsed = time.perf_counter() - started
+
+    for row in rows:
+        metrics = "  ".join(f"{k}={v:.4f}" for k, v in row.items() if isinstance(v, float))
+        print(f"{row['key']}\t{row['label']}\t{metrics}")
+    print(f"Scored {len(rows)} pairs in {elapsed:.2f}s", file=sys.stderr)
+
+    if args.results:
+        write_results(rows, args.results)
+        print(f"Wrote results: {args.results}")
+
+
+def run_faithfulness(args) -> None:
+    from podagent.eval.faithfulness import FaithfulnessScorer
+    from podagent.retriever import EmbeddingRetriever
+
+    paths = sorted(args.predictions.glob("*.json")) if args.predictions.is_dir() else [args.predictions]
+    scorer = FaithfulnessScorer(
+        EmbeddingRetriever.load(args.index),
+        support_threshold=args.support_threshold,
+    )
+    reports = []
+    for path in paths:
+        summary = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(summary, dict) or "episode_id" not in summary:
+            continue
+        report = scorer.score(summary)
+        reports.append({"file": path.name, **report.to_dict()})
+        print(
+            f"{path.name}\tsupport={report.mean_support:.3f}  unsupported={report.unsupported_rate:.2%}  "
+            f"coverage={report.coverage:.2%}  compression={report.compression_ratio:.4f}"
+        )
+
+    if args.results:
+        args.results.parent.mkdir(parents=True, exist_ok=True)
+        args.results.write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Wrote results: {args.results}")
 
 
 if __name__ == "__main__":
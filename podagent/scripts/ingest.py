@@ -32,6 +32,17 @@ def main():
     parser.add_argument(
         "--overlap-words", type=int, default=120, help="Word overlap between chunks."
     )
+    parser.add_argument(
+        "--fixed-boundaries",
+        action="store_true",
+        help="Cut chunks at exactly --max-words instead of at content anchors (boundaries then shift after any edit).",
+    )
+    parser.add_argument(
+        "--host",
+        action="append",
+        default=[],
+        help="Show host name as it appears in the transcript (repeatable); added to config.KNOWN_HOSTS for speaker roles.",
+    )
     args = parser.parse_args()
 
     manifest = process_all_transcripts(
@@ -39,6 +50,8 @@ def main():
         output_dir=args.output_dir,
         max_words=args.max_words,
         overlap_words=args.overlap_words,
+        content_defined=not args.fixed_boundaries,
+        hosts=list(config.KNOWN_HOSTS) + args.host,
     )
     print(f"Wrote manifest: {manifest}")
 
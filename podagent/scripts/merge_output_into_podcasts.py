@@ -35,24 +35,12 @@ def _clean_title_from_filename(stem: str) -> str:
     return title
 
 
-def _infer_transcript_and_title(episode_id: str) -> tuple[str, str]:
+def _infer_title(episode_id: str) -> str:
     chunks = load_chunks_for_episode(episode_id)
-    if chunks:
-        source_path = chunks[0].get("source_path")
-        if source_path:
-            p = Path(source_path)
-            try:
-                transcript = p.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                transcript = ""
-            title = _clean_title_from_filename(p.stem)
-            return transcript, title
-
-        # Fallback: stitch together the stored chunk texts
-        transcript = "\n\n".join((c.get("text") or "").strip() for c in chunks if c.get("text"))
-        return transcript, episode_id
-
-    return "", episode_id
+    source_path = chunks[0].get("source_path") if chunks else None
+    if source_path:
+        return _clean_title_from_filename(Path(source_path).stem)
+    return episode_id
 
 
 def _infer_host(title: str, episode_id: str) -> str:
@@ -90,7 +78,7 @@ def main() -> None:
     if not episode_id:
         raise SystemExit("output_json is missing `episode_id`.")
 
-    transcript, inferred_title = _infer_transcript_and_title(episode_id)
+    inferred_title = _infer_title(episode_id)
     title = args.title or inferred_title or episode_id
     host = args.host or _infer_host(title, episode_id)
 
@@ -125,7 +113,8 @@ def main() -> None:
         "outline": outline,
         "quotes": quotes,
         "q_and_a": q_and_a,
-        "transcript": transcript,
+        # The transcript is not embedded; it is served per chunk by the backend.
+        "episode_id": episode_id,
     }
 
     args.podcasts_json.parent.mkdir(parents=True, exist_ok=True)
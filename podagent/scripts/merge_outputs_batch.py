@@ -107,9 +107,11 @@ def main() -> None:
             "duration": args.duration or entry.get("duration", ""),
             "tags": tags,
             "summaries": summaries,
-            "transcript": entry.get("transcript", ""),
+            "episode_id": episode_id,
         }
     )
+    # Transcripts are served per chunk by the backend rather than embedded.
+    entry.pop("transcript", None)
 
     existing[podcast_key] = entry
     args.podcasts_json.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Find the episodes that best match a question, with supporting chunks.
+
+Example:
+  python podagent/scripts/search_episodes.py \
+    --index podagent/data/processed/chunks.index \
+    --query "which episodes discuss alien civilizations?"
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from podagent import config  # noqa: E402
+from podagent.retriever import EmbeddingRetriever  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Two-stage episode search over a saved index.")
+    parser.add_argument("--query", type=str, required=True, help="Question to search the archive for.")
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=config.PROCESSED_DIR / "chunks.index",
+        help="Saved index (built with scripts/build_index.py).",
+    )
+    parser.add_argument("--episodes", type=int, default=5, help="Episodes to return.")
+    parser.add_argument("--chunks", type=int, default=3, help="Supporting chunks per episode.")
+    parser.add_argument("--speaker", type=str, default=None, help='Only chunks where this speaker talks (a name, or "host"/"guest").')
+    parser.add_argument("--retrieval", choices=["dense", "hybrid"], default="dense", help="Chunk retrieval mode.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    retriever = EmbeddingRetriever.load(args.index, mode=args.retrieval)
+    results = retriever.search_episodes(
+        args.query,
+        num_episodes=args.episodes,
+        chunks_per_episode=args.chunks,
+        speaker=args.speaker,
+    )
+
+    if args.json:
+        payload = [
+            {
+                "episode_id": r.episode_id,
+                "score": r.score,
+                "centroid_score": r.centroid_score,
+                "chunks": [
+                    {
+                        "chunk_id": c.chunk.get("chunk_id"),
+                        "start_time": c.chunk.get("start_time"),
+                        "score": c.score,
+                        "text": c.chunk.get("text"),
+                    }
+                    for c in r.chunks
+                ],
+            }
+            for r in results
+        ]
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return
+
+    for rank, r in enumerate(results, 1):
+        print(f"{rank}. {r.episode_id}  score={r.score:.3f}  centroid={r.centroid_score:.3f}")
+        for c in r.chunks:
+            text = " ".join(c.chunk.get("text", "").split())
+            print(f"     chunk {c.chunk.get('chunk_id')}  {c.score:.3f}  {text[:120]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,14 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT / "src"))
 
-from podagent import config  # noqa: E402
-from podagent.models import OpenAISummarizer, PodcastSummarizer, TogetherSummarizer  # noqa: E402
-from podagent.models.agent import load_chunks_for_episode  # noqa: E402
-from podagent.retriever import EmbeddingRetriever  # noqa: E402
+from podagent import config, tracing  # noqa: E402
+from podagent.models import LoopBudget, PodcastSummarizer  # noqa: E402
+from podagent.models.agent import load_chunks_for_episode, summary_to_dict  # noqa: E402
+from podagent.models.cache import SummaryCache  # noqa: E402
+from podagent.models.providers import available_providers, create_summarizer, parse_provider_options  # noqa: E402
+from podagent.models.usage import UsageLedger, load_price_table  # noqa: E402
+
+API_KEY_ENV = {"openai": "OPENAI_API_KEY", "together": "TOGETHER_API_KEY"}
 
 
 def main():
@@ -26,11 +30,36 @@ def main():
         default=None,
         help="Optional focus question; triggers retrieval if provided.",
     )
+    parser.add_argument(
+        "--speaker",
+        type=str,
+        default=None,
+        help='With --query and --index, only retrieve chunks where this speaker talks (a name, or "host"/"guest").',
+    )
     parser.add_argument(
         "--mode",
-        choices=["openai", "together"],
+        choices=available_providers(),
         default="openai",
-        help="Summarizer provider: OpenAI gpt-4o or Together-hosted models.",
+        help=(
+            "Summarizer provider: OpenAI gpt-4o, Together-hosted models, a local fake (no network), "
+            "or record/replay of real responses via --cassette."
+        ),
+    )
+    parser.add_argument(
+        "--cassette",
+        type=Path,
+        default=None,
+        help="JSONL file of captured responses: written by --mode record, served by --mode replay.",
+    )
+    parser.add_argument(
+        "--provider-option",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help=(
+            "Extra provider option, repeatable. fake: latency_ms, latency_jitter, tokens_per_s, error_rate, seed, "
+            "sleep, prompts; record: provider; replay: prompts, realtime."
+        ),
     )
     parser.add_argument(
         "--model-name",
@@ -38,6 +67,17 @@ def main():
         default=None,
         help="Model name (defaults: openai=gpt-4o, together=meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo).",
     )
+    parser.add_argument(
+        "--retrieval",
+        choices=["dense", "hybrid"],
+        default="dense",
+        help="Retrieval mode with --index: dense embeddings only, or BM25 + dense fusion (better on names and numbers).",
+    )
+    parser.add_argument(
+        "--rerank",
+        action="store_true",
+        help="With an int8/pq --index, re-score the top candidates against the saved float32 vectors.",
+    )
     parser.add_argument(
         "--index",
         type=Path,
@@ -50,6 +90,49 @@ def main():
         default=5,
         help="Number of chunks to use as context when not running hierarchical mode.",
     )
+    parser.add_argument(
+        "--mmr-lambda",
+        type=float,
+        default=0.7,
+        help="Relevance vs. diversity of retrieved context chunks (1.0 = relevance only).",
+    )
+    parser.add_argument(
+        "--auto",
+        action="store_true",
+        help=(
+            "Let the planner choose single-pass, map-reduce or tree reduce (and the group size) from the episode's "
+            "token count, the model's context window and a latency/cost model; overrides --hierarchical/--group-size."
+        ),
+    )
+    parser.add_argument(
+        "--planner-objective",
+        choices=["balanced", "latency", "cost"],
+        default="balanced",
+        help="What --auto optimizes for.",
+    )
+    parser.add_argument(
+        "--agentic",
+        action="store_true",
+        help=(
+            "Run the planner/retriever/critic loop: plan themes and sub-questions, answer them from retrieved "
+            "evidence, and revise the answers the critic flags, within the --max-* budget."
+        ),
+    )
+    parser.add_argument("--max-calls", type=int, default=24, help="Agentic mode: LLM calls allowed per episode.")
+    parser.add_argument(
+        "--max-tokens", type=int, default=120_000, help="Agentic mode: prompt + completion tokens allowed per episode."
+    )
+    parser.add_argument("--max-seconds", type=float, default=180.0, help="Agentic mode: wall time allowed per episode.")
+    parser.add_argument(
+        "--critic-rounds", type=int, default=2, help="Agentic mode: critique/revise rounds before giving up on a pass."
+    )
+    parser.add_argument("--loop-workers", type=int, default=4, help="Agentic mode: concurrent sub-question calls.")
+    parser.add_argument(
+        "--map-workers",
+        type=int,
+        default=1,
+        help="Concurrent group-summary calls in hierarchical and auto modes.",
+    )
     parser.add_argument(
         "--hierarchical",
         action="store_true",
@@ -61,6 +144,21 @@ def main():
         default=8,
         help="How many chunks per group in hierarchical mode.",
     )
+    parser.add_argument(
+        "--compress",
+        choices=["tfidf", "textrank", "embedding"],
+        default=None,
+        help=(
+            "Hierarchical mode: keep only the most central sentences of each group before the map call "
+            "(embedding scoring uses the stored chunk vectors of --index)."
+        ),
+    )
+    parser.add_argument(
+        "--compress-ratio",
+        type=float,
+        default=0.5,
+        help="Share of each group's tokens kept by --compress.",
+    )
     parser.add_argument(
         "--structured",
         action="store_true",
@@ -118,27 +216,57 @@ def main():
         default=1800,
         help="Max tokens allowed for the final structured summary response.",
     )
+    parser.add_argument(
+        "--no-verify-quotes",
+        action="store_true",
+        help="Skip checking structured quotes/evidence against the transcript substring index built at ingest.",
+    )
+    parser.add_argument(
+        "--summary-cache",
+        type=Path,
+        nargs="?",
+        const=config.SUMMARY_CACHE_DIR,
+        default=None,
+        help=(
+            "Memoize group and final summaries in this directory (default data/processed/summary_cache) and keep "
+            "group boundaries stable, so re-summarizing a corrected transcript only re-runs the changed groups."
+        ),
+    )
+    parser.add_argument(
+        "--price-table",
+        type=Path,
+        default=None,
+        help="JSON file of per-model prices (USD per 1M tokens, {model: {prompt, completion}}) overriding the defaults in config.MODEL_PRICES.",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="Record spans for this run and write them as a Chrome trace-event JSON file (open in chrome://tracing or Perfetto).",
+    )
     args = parser.parse_args()
 
+    if args.trace:
+        tracing.start_trace()
+
+    ledger = UsageLedger(prices=load_price_table(args.price_table))
+    provider_options = parse_provider_options(args.provider_option)
+    if args.cassette:
+        provider_options["cassette"] = str(args.cassette)
     try:
-        if args.mode == "together":
-            summarizer = TogetherSummarizer(
-                model=args.model_name or "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo"
-            )
-        else:
-            summarizer = OpenAISummarizer(model=args.model_name or "gpt-4o")
+        summarizer = create_summarizer(args.mode, model=args.model_name, ledger=ledger, **provider_options)
     except Exception as exc:
         print(f"Failed to initialize summarizer: {exc}", file=sys.stderr)
-        if args.mode == "together":
-            print("Tip: export `TOGETHER_API_KEY` before running.", file=sys.stderr)
-        else:
-            print("Tip: export `OPENAI_API_KEY` before running.", file=sys.stderr)
+        if args.mode in API_KEY_ENV:
+            print(f"Tip: export `{API_KEY_ENV[args.mode]}` before running.", file=sys.stderr)
         raise SystemExit(1) from exc
 
     retriever = None
     if args.index:
+        from podagent.retriever import EmbeddingRetriever
+
         try:
-            retriever = EmbeddingRetriever.load(args.index)
+            retriever = EmbeddingRetriever.load(args.index, mode=args.retrieval, rerank=args.rerank)
         except Exception as exc:
             print(f"Could not load index; continuing without retrieval. Error: {exc}")
 
@@ -146,36 +274,83 @@ def main():
         summarizer=summarizer,
         retriever=retriever,
         max_context_chunks=args.context_chunks,
+        mmr_lambda=args.mmr_lambda,
+        map_workers=args.map_workers,
+        planner_objective=args.planner_objective,
+        summary_cache=SummaryCache(args.summary_cache) if args.summary_cache else None,
+        stable_groups=bool(args.summary_cache),
     )
     try:
-        result = agent.summarize_episode(
-            args.episode_id,
-            query=args.query,
-            hierarchical=args.hierarchical,
-            group_size=args.group_size,
-            structured=args.structured,
-            intermediate_min_words=args.intermediate_min_words,
-            intermediate_max_words=args.intermediate_max_words,
-            final_target_words=args.final_target_words,
-            final_max_tokens=args.final_max_tokens,
-        )
+        with tracing.span("summarize_episode", episode_id=args.episode_id, mode=args.mode):
+            result = agent.summarize_episode(
+                args.episode_id,
+                query=args.query,
+                hierarchical=args.hierarchical,
+                group_size=args.group_size,
+                structured=args.structured,
+                intermediate_min_words=args.intermediate_min_words,
+                intermediate_max_words=args.intermediate_max_words,
+                final_target_words=args.final_target_words,
+                final_max_tokens=args.final_max_tokens,
+                verify_quotes=not args.no_verify_quotes,
+                speaker=args.speaker,
+                compress=args.compress,
+                compress_ratio=args.compress_ratio,
+                auto=args.auto,
+                agentic=args.agentic,
+                budget=LoopBudget(args.max_calls, args.max_tokens, args.max_seconds, args.critic_rounds, args.loop_workers),
+            )
     except Exception as exc:
         print(f"Summarization failed: {exc}", file=sys.stderr)
-        if args.mode == "together":
-            print("Tip: ensure `TOGETHER_API_KEY` is set and reachable when using `--mode together`.", file=sys.stderr)
-        else:
-            print("Tip: ensure `OPENAI_API_KEY` is set and reachable when using `--mode openai`.", file=sys.stderr)
+        if args.mode in API_KEY_ENV:
+            print(
+                f"Tip: ensure `{API_KEY_ENV[args.mode]}` is set and reachable when using `--mode {args.mode}`.",
+                file=sys.stderr,
+            )
         raise SystemExit(1) from exc
+    finally:
+        tracer = tracing.stop_trace()
+        if tracer and args.trace:
+            tracer.export(args.trace)
+            print(f"Wrote trace: {args.trace}", file=sys.stderr)
 
-    raw_output = {
-        "episode_id": result.episode_id,
-        "abstract": result.abstract,
-        "outline": result.outline,
-        "quotes": result.quotes,
-        "q_and_a": result.q_and_a,
-        "keywords": result.keywords,
-        "evidence": [{"chunk": r.chunk, "score": r.score} for r in (result.evidence or [])],
-    }
+    raw_output = summary_to_dict(result)
+
+    if result.usage:
+        totals = result.usage["totals"]
+        cost = "n/a (unpriced model)" if totals["cost_usd"] is None else f"${totals['cost_usd']:.4f}"
+        print(
+            f"Usage: {totals['calls']} calls, {totals['prompt_tokens']} prompt + "
+            f"{totals['completion_tokens']} completion tokens, {totals['latency_s']:.1f}s LLM time, cost {cost}",
+            file=sys.stderr,
+        )
+
+    if result.plan:
+        print(f"Strategy: {result.plan['strategy']} ({result.plan['reason']})", file=sys.stderr)
+    if result.compression:
+        c = result.compression
+        print(
+            f"Compression ({c['method']}): map input {c['tokens_in']} -> {c['tokens_out']} tokens "
+            f"({c['reduction']:.0%} fewer), {c['sentences_out']}/{c['sentences_in']} sentences kept",
+            file=sys.stderr,
+        )
+
+    if result.loop:
+        loop = result.loop
+        spent = loop["spent"]
+        print(
+            f"Agent loop: {loop['answered']}/{loop['questions']} questions over {loop['themes']} themes "
+            f"(plan: {loop['plan_source']}), {loop['rounds']} critic rounds, flagged {loop['flagged']}, "
+            f"{loop['revised']} revised; stopped: {loop['stopped']}; "
+            f"{spent['calls']} calls, {spent['tokens']} tokens, {spent['seconds']:.1f}s",
+            file=sys.stderr,
+        )
+
+    if result.cache:
+        hits = sum(v for k, v in result.cache.items() if k.endswith("_hits"))
+        calls = hits + sum(v for k, v in result.cache.items() if k.endswith("_misses"))
+        detail = ", ".join(f"{k} {v}" for k, v in sorted(result.cache.items()))
+        print(f"Summary cache: {hits}/{calls} calls served from cache ({detail})", file=sys.stderr)
 
     if args.output_json:
         args.output_json.parent.mkdir(parents=True, exist_ok=True)
@@ -185,23 +360,19 @@ def main():
     if args.podcasts_json:
         chunks = load_chunks_for_episode(args.episode_id)
         source_path = (chunks[0].get("source_path") if chunks else None) or None
-        transcript = ""
         inferred_title = args.episode_id
         inferred_host = ""
         if source_path:
-            try:
-                p = Path(source_path)
-                inferred_title = p.stem.strip()
-                if inferred_title.lower().startswith("transcript for "):
-                    inferred_title = inferred_title[len("Transcript for ") :].strip()
-                transcript = p.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                transcript = ""
+            inferred_title = Path(source_path).stem.strip()
+            if inferred_title.lower().startswith("transcript for "):
+                inferred_title = inferred_title[len("Transcript for ") :].strip()
         if "lex fridman" in inferred_title.lower() or "lex-fridman" in args.episode_id.lower():
             inferred_host = "Lex Fridman"
 
         podcast_key = args.podcast_key or args.episode_id
-        summary_label = args.summary_label or ("Llama3-8B" if args.mode == "together" else "GPT-4o")
+        summary_label = args.summary_label or {"together": "Llama3-8B", "openai": "GPT-4o"}.get(
+            args.mode, summarizer.model
+        )
         existing = {}
         if args.podcasts_json.exists():
             existing = json.loads(args.podcasts_json.read_text(encoding="utf-8"))
@@ -222,7 +393,8 @@ def main():
             "outline": result.outline,
             "quotes": result.quotes,
             "q_and_a": result.q_and_a,
-            "transcript": transcript,
+            # The transcript is not embedded; it is served per chunk by the backend.
+            "episode_id": args.episode_id,
         }
         args.podcasts_json.parent.mkdir(parents=True, exist_ok=True)
         args.podcasts_json.write_text(json.dumps(existing, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Summarize many episodes from the ingest manifest in one process, sharing the
+summarizer (and its usage ledger) and retriever across a bounded worker pool.
+
+Failed episodes are recorded and the run continues. Re-running with the same
+--output-dir resumes, skipping episodes that already have an output JSON.
+Per-episode timings, tokens and failures are written to run_summary.json.
+
+Example:
+  python podagent/scripts/summarize_batch.py --match "*lex-fridman*" \
+    --hierarchical --structured --workers 4 --output-dir podagent/data/processed/summaries
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from podagent import config, tracing  # noqa: E402
+from podagent.models import LoopBudget, PodcastSummarizer  # noqa: E402
+from podagent.models.batch import load_manifest, summarize_batch  # noqa: E402
+from podagent.models.cache import SummaryCache  # noqa: E402
+from podagent.models.providers import available_providers, create_summarizer, parse_provider_options  # noqa: E402
+from podagent.models.usage import UsageLedger, load_price_table  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize episodes from the manifest in one batch run.")
+    parser.add_argument("--interim-dir", type=Path, default=config.INTERIM_DIR, help="Directory with manifest.jsonl and chunk files.")
+    parser.add_argument("--episodes", nargs="*", default=None, help="Episode ids to run (default: every manifest entry).")
+    parser.add_argument("--match", type=str, default=None, help='Only episode ids matching this glob (e.g. "*lex-fridman*").')
+    parser.add_argument("--limit", type=int, default=None, help="Run at most this many episodes.")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=config.PROCESSED_DIR / "summaries",
+        help="Where to write <episode_id>.json outputs and run_summary.json.",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Episodes summarized concurrently.")
+    parser.add_argument("--no-resume", action="store_true", help="Re-run episodes that already have an output JSON.")
+    parser.add_argument(
+        "--mode",
+        choices=available_providers(),
+        default="openai",
+        help="Summarizer provider (fake and replay run without network; see summarize.py).",
+    )
+    parser.add_argument("--cassette", type=Path, default=None, help="Captured responses for --mode record/replay.")
+    parser.add_argument(
+        "--provider-option",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra provider option, repeatable (e.g. latency_ms=400 error_rate=0.05 for --mode fake).",
+    )
+    parser.add_argument(
+        "--model-name",
+        type=str,
+        default=None,
+        help="Model name (defaults: openai=gpt-4o, together=meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo).",
+    )
+    parser.add_argument("--query", type=str, default=None, help="Optional focus question applied to every episode.")
+    parser.add_argument("--index", type=Path, default=None, help="Saved index; enables retrieval with --query.")
+    parser.add_argument("--retrieval", choices=["dense", "hybrid"], default="dense", help="Retrieval mode with --index.")
+    parser.add_argument("--rerank", action="store_true", help="With an int8/pq --index, re-score candidates in float32.")
+    parser.add_argument("--context-chunks", type=int, default=5, help="Context chunks when not running hierarchical mode.")
+    parser.add_argument("--mmr-lambda", type=float, default=0.7, help="Relevance vs. diversity of retrieved context.")
+    parser.add_argument("--auto", action="store_true", help="Let the planner choose the strategy per episode (see summarize.py).")
+    parser.add_argument(
+        "--planner-objective",
+        choices=["balanced", "latency", "cost"],
+        default="balanced",
+        help="What --auto optimizes for.",
+    )
+    parser.add_argument("--agentic", action="store_true", help="Planner/retriever/critic loop per episode (see summarize.py).")
+    parser.add_argument("--max-calls", type=int, default=24, help="Agentic mode: LLM calls allowed per episode.")
+    parser.add_argument("--max-tokens", type=int, default=120_000, help="Agentic mode: tokens allowed per episode.")
+    parser.add_argument("--max-seconds", type=float, default=180.0, help="Agentic mode: wall time allowed per episode.")
+    parser.add_argument("--critic-rounds", type=int, default=2, help="Agentic mode: critique/revise rounds.")
+    parser.add_argument("--loop-workers", type=int, default=4, help="Agentic mode: concurrent sub-question calls.")
+    parser.add_argument("--map-workers", type=int, default=1, help="Concurrent group-summary calls within an episode.")
+    parser.add_argument("--hierarchical", action="store_true", help="Summarize chunk groups, then the group summaries.")
+    parser.add_argument("--group-size", type=int, default=8, help="Chunks per group in hierarchical mode.")
+    parser.add_argument(
+        "--compress",
+        choices=["tfidf", "textrank", "embedding"],
+        default=None,
+        help="Extractively pre-compress each group before the map call (embedding needs --index).",
+    )
+    parser.add_argument("--compress-ratio", type=float, default=0.5, help="Share of each group's tokens kept by --compress.")
+    parser.add_argument(
+        "--summary-cache",
+        type=Path,
+        nargs="?",
+        const=config.SUMMARY_CACHE_DIR,
+        default=None,
+        help="Memoize group and final summaries here so re-runs after re-ingest only redo changed groups (see summarize.py).",
+    )
+    parser.add_argument("--structured", action="store_true", help="Ask the LLM for structured sections.")
+    parser.add_argument("--intermediate-min-words", type=int, default=180, help="Minimum words per group summary.")
+    parser.add_argument("--intermediate-max-words", type=int, default=300, help="Maximum words per group summary.")
+    parser.add_argument("--final-target-words", type=int, default=700, help="Target words for the final summary.")
+    parser.add_argument("--final-max-tokens", type=int, default=1800, help="Max tokens for the final structured summary.")
+    parser.add_argument("--no-verify-quotes", action="store_true", help="Skip checking quotes against the transcript index.")
+    parser.add_argument("--price-table", type=Path, default=None, help="JSON price table overriding config.MODEL_PRICES.")
+    parser.add_argument("--trace", type=Path, default=None, help="Write a Chrome trace-event JSON of the whole run.")
+    args = parser.parse_args()
+
+    entries = load_manifest(args.interim_dir, episode_ids=args.episodes, pattern=args.match, limit=args.limit)
+    if not entries:
+        raise SystemExit("No episodes selected.")
+
+    ledger = UsageLedger(prices=load_price_table(args.price_table))
+    provider_options = parse_provider_options(args.provider_option)
+    if args.cassette:
+        provider_options["cassette"] = str(args.cassette)
+    try:
+        summarizer = create_summarizer(args.mode, model=args.model_name, ledger=ledger, **provider_options)
+    except Exception as exc:
+        raise SystemExit(f"Failed to initialize summarizer: {exc}") from exc
+
+    retriever = None
+    if args.index:
+        from podagent.retriever import EmbeddingRetriever
+
+        retriever = EmbeddingRetriever.load(args.index, mode=args.retrieval, rerank=args.rerank)
+
+    agent = PodcastSummarizer(
+        summarizer=summarizer,
+        retriever=retriever,
+        max_context_chunks=args.context_chunks,
+        mmr_lambda=args.mmr_lambda,
+        map_workers=args.map_workers,
+        planner_objective=args.planner_objective,
+        summary_cache=SummaryCache(args.summary_cache) if args.summary_cache else None,
+        stable_groups=bool(args.summary_cache),
+    )
+
+    def report(run) -> None:
+        detail = run.error if run.status == "failed" else f"{(run.usage or {}).get('prompt_tokens', 0)} prompt tokens"
+        print(f"[{run.status}] {run.episode_id} {run.seconds:.1f}s {detail}", file=sys.stderr, flush=True)
+
+    if args.trace:
+        tracing.start_trace()
+    try:
+        summary = summarize_batch(
+            agent,
+            [e["episode_id"] for e in entries],
+            args.output_dir,
+            workers=args.workers,
+            resume=not args.no_resume,
+            interim_dir=args.interim_dir,
+            on_result=report,
+            query=args.query,
+            hierarchical=args.hierarchical,
+            group_size=args.group_size,
+            structured=args.structured,
+            intermediate_min_words=args.intermediate_min_words,
+            intermediate_max_words=args.intermediate_max_words,
+            final_target_words=args.final_target_words,
+            final_max_tokens=args.final_max_tokens,
+            verify_quotes=not args.no_verify_quotes,
+            compress=args.compress,
+            compress_ratio=args.compress_ratio,
+            auto=args.auto,
+            agentic=args.agentic,
+            budget=LoopBudget(args.max_calls, args.max_tokens, args.max_seconds, args.critic_rounds, args.loop_workers),
+        )
+    finally:
+        tracer = tracing.stop_trace()
+        if tracer and args.trace:
+            tracer.export(args.trace)
+            print(f"Wrote trace: {args.trace}", file=sys.stderr)
+
+    counts = summary["counts"]
+    usage = summary["usage"] or {}
+    cost = usage.get("cost_usd")
+    print(
+        f"{counts['ok']} ok, {counts['failed']} failed, {counts['skipped']} skipped in {summary['wall_s']:.1f}s; "
+        f"{usage.get('calls', 0)} calls, {usage.get('prompt_tokens', 0)} prompt + "
+        f"{usage.get('completion_tokens', 0)} completion tokens, cost "
+        f"{'n/a' if cost is None else f'${cost:.4f}'}"
+    )
+    print(f"Wrote run summary: {args.output_dir / 'run_summary.json'}")
+    if summary["failures"]:
+        print(json.dumps(summary["failures"], indent=2), file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
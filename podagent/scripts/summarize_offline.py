@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Summarize episodes through the provider's batch API (cheaper, higher quotas,
+no interactive latency) for nightly re-summarization of the archive.
+
+The job is kept in --job-dir: map requests (group summaries) go out as one
+batch JSONL job, then the reduce requests (final summaries) as a second one;
+results are stitched into <job-dir>/outputs/<episode_id>.json. Re-running the
+same command resumes the job; --no-wait takes a single step (submit, poll or
+ingest) and exits, for cron.
+
+Examples:
+  python podagent/scripts/summarize_offline.py --job-dir podagent/experiments/batch/nightly \
+    --match "*lex-fridman*" --hierarchical --structured
+  python podagent/scripts/summarize_offline.py --job-dir /tmp/job --limit 3 --hierarchical --local-server
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from podagent import config  # noqa: E402
+from podagent.models import OpenAISummarizer, PodcastSummarizer, TogetherSummarizer  # noqa: E402
+from podagent.models.batch import load_manifest  # noqa: E402
+from podagent.models.offline import BatchAPI, OfflineSummaryJob  # noqa: E402
+from podagent.models.providers import FakeChatClient  # noqa: E402
+from podagent.models.usage import UsageLedger, load_price_table  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize episodes with provider batch jobs.")
+    parser.add_argument("--job-dir", type=Path, required=True, help="Directory holding the job's state, requests and outputs.")
+    parser.add_argument("--interim-dir", type=Path, default=config.INTERIM_DIR, help="Directory with manifest.jsonl and chunk files.")
+    parser.add_argument("--episodes", nargs="*", default=None, help="Episode ids (default: every manifest entry).")
+    parser.add_argument("--match", type=str, default=None, help="Only episode ids matching this glob.")
+    parser.add_argument("--limit", type=int, default=None, help="At most this many episodes.")
+    parser.add_argument("--mode", choices=["openai", "together"], default="openai", help="Batch API provider.")
+    parser.add_argument("--model-name", type=str, default=None, help="Model name (defaults as in summarize.py).")
+    parser.add_argument("--batch-url", type=str, default=None, help="Base URL of an OpenAI-compatible batch API to use instead of the provider's.")
+    parser.add_argument(
+        "--local-server",
+        action="store_true",
+        help="Run against an in-process stand-in batch server (no network, no spend); the job must finish in this invocation.",
+    )
+    parser.add_argument("--no-wait", action="store_true", help="Advance the job by one step and exit.")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Seconds between status polls.")
+    parser.add_argument("--timeout", type=float, default=None, help="Give up waiting after this many seconds.")
+    parser.add_argument("--query", type=str, default=None, help="Optional focus question (non-hierarchical jobs).")
+    parser.add_argument("--speaker", type=str, default=None, help="With --query and --index, only retrieve chunks where this speaker talks.")
+    parser.add_argument("--index", type=Path, default=None, help="Saved index; enables retrieval with --query.")
+    parser.add_argument("--context-chunks", type=int, default=5, help="Context chunks when not running hierarchical mode.")
+    parser.add_argument("--hierarchical", action="store_true", help="Map (group summaries) then reduce; otherwise reduce only.")
+    parser.add_argument("--group-size", type=int, default=8, help="Chunks per group in hierarchical mode.")
+    parser.add_argument(
+        "--compress",
+        choices=["tfidf", "textrank", "embedding"],
+        default=None,
+        help="Extractively pre-compress each group before the map call (embedding needs --index).",
+    )
+    parser.add_argument("--compress-ratio", type=float, default=0.5, help="Share of each group's tokens kept by --compress.")
+    parser.add_argument("--structured", action="store_true", help="Ask for structured sections in the final summary.")
+    parser.add_argument("--intermediate-min-words", type=int, default=180, help="Minimum words per group summary.")
+    parser.add_argument("--intermediate-max-words", type=int, default=300, help="Maximum words per group summary.")
+    parser.add_argument("--final-target-words", type=int, default=700, help="Target words for the final summary.")
+    parser.add_argument("--final-max-tokens", type=int, default=1800, help="Max tokens for the final structured summary.")
+    parser.add_argument("--no-verify-quotes", action="store_true", help="Skip checking quotes against the transcript index.")
+    parser.add_argument("--price-table", type=Path, default=None, help="JSON price table overriding config.MODEL_PRICES.")
+    args = parser.parse_args()
+
+    ledger = UsageLedger(prices=load_price_table(args.price_table))
+    # Against the local server only the request builders are used, so no SDK or API key is needed.
+    client = FakeChatClient(sleep=False) if args.local_server else None
+    try:
+        if args.mode == "together":
+            summarizer = TogetherSummarizer(
+                model=args.model_name or "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
+                ledger=ledger,
+                client=client,
+            )
+        else:
+            summarizer = OpenAISummarizer(model=args.model_name or "gpt-4o", ledger=ledger, client=client)
+    except Exception as exc:
+        raise SystemExit(f"Failed to initialize summarizer: {exc}") from exc
+
+    retriever = None
+    if args.index:
+        from podagent.retriever import EmbeddingRetriever
+
+        retriever = EmbeddingRetriever.load(args.index)
+    agent = PodcastSummarizer(summarizer=summarizer, retriever=retriever, max_context_chunks=args.context_chunks)
+
+    server = None
+    batch_url = args.batch_url
+    if args.local_server:
+        from podagent.models.batch_server import LocalBatchServer
+
+        server = LocalBatchServer(complete_after_s=1.0).start()
+        batch_url = server.url
+    api = BatchAPI.for_summarizer(summarizer, batch_url)
+
+    try:
+        if (args.job_dir / "job.json").exists():
+            job = OfflineSummaryJob(args.job_dir, agent, api)
+        else:
+            entries = load_manifest(args.interim_dir, episode_ids=args.episodes, pattern=args.match, limit=args.limit)
+            if not entries:
+                raise SystemExit("No episodes selected.")
+            job = OfflineSummaryJob.create(
+                args.job_dir,
+                agent,
+                api,
+                [e["episode_id"] for e in entries],
+                interim_dir=args.interim_dir,
+                query=args.query,
+                speaker=args.speaker,
+                hierarchical=args.hierarchical,
+                group_size=args.group_size,
+                structured=args.structured,
+                intermediate_min_words=args.intermediate_min_words,
+                intermediate_max_words=args.intermediate_max_words,
+                final_target_words=args.final_target_words,
+                final_max_tokens=args.final_max_tokens,
+                verify_quotes=not args.no_verify_quotes,
+                compress=args.compress,
+                compress_ratio=args.compress_ratio,
+            )
+            print(f"Created batch job for {len(entries)} episodes in {args.job_dir}")
+
+        if args.no_wait:
+            print(job.advance())
+        else:
+            print(job.run(poll_interval=1.0 if server else args.poll_interval, timeout=args.timeout))
+    finally:
+        if server is not None:
+            server.stop()
+
+    if job.state["stage"] == "done":
+        usage = ledger.summary()["totals"]
+        cost = usage.get("cost_usd")
+        done = len(job.state["episodes"]) - len(job.state["failed"])
+        print(
+            f"{done} summaries in {args.job_dir / 'outputs'}; {usage.get('prompt_tokens', 0)} prompt + "
+            f"{usage.get('completion_tokens', 0)} completion tokens at batch prices, cost "
+            f"{'n/a' if cost is None else f'${cost:.4f}'}"
+        )
+        if job.state["failed"]:
+            print(json.dumps(job.state["failed"], indent=2), file=sys.stderr)
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,4 +7,5 @@ and web serving utilities for the PodAgent project.
 
 __all__ = [
     "config",
+    "tracing",
 ]
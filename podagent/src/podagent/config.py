@@ -9,6 +9,7 @@ RAW_DIR = DATA_DIR / "raw"
 TRANSCRIPTS_DIR = RAW_DIR / "transcripts"
 INTERIM_DIR = DATA_DIR / "interim"
 PROCESSED_DIR = DATA_DIR / "processed"
+SUMMARY_CACHE_DIR = PROCESSED_DIR / "summary_cache"
 
 # Experiment paths
 EXPERIMENTS_DIR = BASE_DIR / "experiments"
@@ -33,3 +34,38 @@ def ensure_directories() -> None:
         CHECKPOINTS_DIR,
     ]:
         path.mkdir(parents=True, exist_ok=True)
+
+
+# Show hosts recognised at ingest; a speaker on this list is tagged "host" and the
+# other speakers of that episode "guest". Extend per run with `ingest.py --host`.
+KNOWN_HOSTS = ["Lex Fridman"]
+
+# Per-model prices in USD per 1M tokens, used by the usage ledger. Override or extend
+# with a JSON file of the same shape via `PODAGENT_PRICE_TABLE` or `--price-table`.
+MODEL_PRICES = {
+    "gpt-5": {"prompt": 1.25, "completion": 10.00},
+    "gpt-4o": {"prompt": 2.50, "completion": 10.00},
+    "gpt-4o-mini": {"prompt": 0.15, "completion": 0.60},
+    "gpt-3.5-turbo": {"prompt": 0.50, "completion": 1.50},
+    "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo": {"prompt": 0.18, "completion": 0.18},
+    "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo": {"prompt": 0.88, "completion": 0.88},
+}
+
+# Provider batch APIs bill at this fraction of the listed per-token prices.
+BATCH_PRICE_FACTOR = 0.5
+
+# Context windows (tokens) used by the strategy planner; unknown models get
+# DEFAULT_CONTEXT_WINDOW.
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-5": 400_000,
+    "gpt-4o": 128_000,
+    "gpt-4o-mini": 128_000,
+    "gpt-3.5-turbo": 16_385,
+    "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo": 131_072,
+    "meta-llama/Meta-Llama-3.1-70B-Instruct-Turbo": 131_072,
+}
+DEFAULT_CONTEXT_WINDOW = 16_384
+
+# Per-call latency model for the strategy planner: fixed overhead plus prompt
+# processing and generation rates in tokens per second.
+PLANNER_LATENCY = {"overhead_s": 0.8, "prompt_tokens_per_s": 4000.0, "completion_tokens_per_s": 60.0}
@@ -3,5 +3,7 @@ Data pipeline utilities: ingest raw transcripts, clean, chunk, and prepare JSONL
 """
 
 from .prepare import process_all_transcripts, process_single_transcript
+from .speakers import SpeakerTurns
+from .transcript_index import TranscriptIndex
 
-__all__ = ["process_all_transcripts", "process_single_transcript"]
+__all__ = ["process_all_transcripts", "process_single_transcript", "SpeakerTurns", "TranscriptIndex"]
@@ -1,9 +1,13 @@
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from podagent import config
-from podagent.utils import clean_transcript_text, chunk_text, slugify, write_jsonl
+from podagent.utils import clean_transcript_text, chunk_text_with_spans, slugify, write_jsonl
+
+from .speakers import SpeakerTurns
+from .timeline import TimeMap
+from .transcript_index import TranscriptIndex, transcript_index_path
 
 
 def extract_title(path: Path) -> str:
@@ -17,34 +21,66 @@ def read_transcript(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="ignore")
 
 
+def _round_time(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds, 1)
+
+
 def process_single_transcript(
     path: Path,
     max_words: int = 400,
     overlap_words: int = 120,
-) -> Dict[str, List[dict]]:
+    content_defined: bool = True,
+    hosts: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
     """
-    Clean and chunk one transcript file into a list of chunk dicts.
+    Clean and chunk one transcript file into a list of chunk dicts (aligned to
+    speaker turns where possible), plus the episode's transcript substring index
+    for quote verification and its in-memory speaker-turn table. With `content_defined`
+    boundaries, chunks away from an edit keep their text on re-ingest, so
+    memoized group summaries stay valid. `hosts` names the show hosts used to
+    tag speaker roles (default `config.KNOWN_HOSTS`).
     """
     raw_text = read_transcript(path)
     cleaned = clean_transcript_text(raw_text)
-    chunks = chunk_text(cleaned, max_words=max_words, overlap_words=overlap_words)
-
     episode_id = slugify(extract_title(path))
+    turns = SpeakerTurns.parse(episode_id, raw_text, cleaned, hosts=hosts)
+    chunks = chunk_text_with_spans(
+        cleaned,
+        max_words=max_words,
+        overlap_words=overlap_words,
+        breaks=turns.char_starts,
+        content_defined=content_defined,
+    )
+
+    timeline = TimeMap.from_text(cleaned)
     chunk_rows: List[dict] = []
-    for idx, ctext in chunks:
+    for idx, ctext, char_start, char_end in chunks:
+        shares = turns.speaker_shares(char_start, char_end)
         chunk_rows.append(
             {
                 "episode_id": episode_id,
                 "chunk_id": idx,
                 "text": ctext,
-                "start_time": None,
-                "end_time": None,
-                "speakers": [],
+                "char_start": char_start,
+                "char_end": char_end,
+                "start_time": _round_time(timeline.time_at(char_start)),
+                "end_time": _round_time(timeline.time_at(char_end)),
+                "speakers": [name for name, _ in shares],
+                "speaker_roles": [turns.role_of(name) for name, _ in shares],
+                "speaker_shares": [round(share, 3) for _, share in shares],
                 "source_path": str(path),
             }
         )
 
-    return {"episode_id": episode_id, "chunks": chunk_rows}
+    transcript_index = TranscriptIndex(
+        episode_id, cleaned, [(idx, start, end) for idx, _, start, end in chunks]
+    )
+    return {
+        "episode_id": episode_id,
+        "chunks": chunk_rows,
+        "transcript_index": transcript_index,
+        "speaker_turns": turns,
+    }
 
 
 def process_all_transcripts(
@@ -52,6 +88,8 @@ def process_all_transcripts(
     output_dir: Optional[Path] = None,
     max_words: int = 400,
     overlap_words: int = 120,
+    content_defined: bool = True,
+    hosts: Optional[Sequence[str]] = None,
 ) -> Path:
     """
     Process every transcript under `transcripts_dir` into per-episode JSONL files and
@@ -68,12 +106,17 @@ def process_all_transcripts(
 
     for path in transcript_files:
         result = process_single_transcript(
-            path, max_words=max_words, overlap_words=overlap_words
+            path,
+            max_words=max_words,
+            overlap_words=overlap_words,
+            content_defined=content_defined,
+            hosts=hosts,
         )
         episode_id = result["episode_id"]
         chunks = result["chunks"]
         out_path = output_dir / f"{episode_id}.jsonl"
         write_jsonl(out_path, chunks)
+        result["transcript_index"].save(transcript_index_path(episode_id, output_dir))
         manifest.append(
             {
                 "episode_id": episode_id,
@@ -0,0 +1,159 @@
+"""
+Speaker-turn parsing for Lex-Fridman-style transcripts, where each turn starts with
+a speaker-name line followed by a "(HH:MM:SS)" marker line.
+
+Turns are kept in a compact per-episode table of parallel arrays (speaker id, char
+span, time span) over the cleaned transcript text. The table is built at ingest;
+chunks keep the per-speaker shares it yields, so it is not written to disk.
+"""
+import bisect
+import re
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from podagent import config
+
+from .timeline import TIMESTAMP_MARKER_RE, TimeMap
+
+_MARKER_LINE_RE = re.compile(r"^\(\d{1,2}:\d{2}(?::\d{2})?\)$")
+
+
+def find_speaker_labels(raw_text: str, max_words: int = 4, min_turns: int = 2) -> List[str]:
+    """
+    Speaker names in a raw transcript: short title-case lines immediately followed
+    by a timestamp-marker line, seen at least `min_turns` times (chapter headings
+    sometimes sit directly above a marker too, but only once). Returned in order
+    of first appearance.
+    """
+    lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
+    counts: Dict[str, int] = {}
+    for line, nxt in zip(lines, lines[1:]):
+        words = line.split()
+        if (
+            _MARKER_LINE_RE.match(nxt)
+            and len(words) <= max_words
+            and all(w[:1].isupper() or w[:1].isdigit() for w in words)
+            and line[-1].isalnum()
+        ):
+            counts[line] = counts.get(line, 0) + 1
+    return [name for name, n in counts.items() if n >= min_turns]
+
+
+class SpeakerTurns:
+    """
+    Turn table for one episode. Row i is speaker `speakers[speaker_ids[i]]`
+    talking over cleaned-text chars [char_starts[i], char_ends[i]) and seconds
+    [time_starts[i], time_ends[i]] (NaN where the transcript has no timestamps).
+    """
+
+    def __init__(
+        self,
+        episode_id: str,
+        speakers: Sequence[str],
+        roles: Sequence[str],
+        speaker_ids: Sequence[int] = (),
+        char_starts: Sequence[int] = (),
+        char_ends: Sequence[int] = (),
+        time_starts: Sequence[float] = (),
+        time_ends: Sequence[float] = (),
+    ):
+        self.episode_id = episode_id
+        self.speakers = list(speakers)
+        self.roles = list(roles)
+        self.speaker_ids = array("h", speaker_ids)
+        self.char_starts = array("q", char_starts)
+        self.char_ends = array("q", char_ends)
+        self.time_starts = array("d", time_starts)
+        self.time_ends = array("d", time_ends)
+
+    def __len__(self) -> int:
+        return len(self.speaker_ids)
+
+    @classmethod
+    def parse(
+        cls,
+        episode_id: str,
+        raw_text: str,
+        cleaned: str,
+        hosts: Optional[Sequence[str]] = None,
+    ) -> "SpeakerTurns":
+        """
+        Locate each "<speaker> (HH:MM:SS)" label in the cleaned text; a turn runs
+        from its label to the next label. Roles come from `hosts` (default
+        `config.KNOWN_HOSTS`), see `assign_roles`.
+        """
+        names = find_speaker_labels(raw_text)
+        roles = assign_roles(names, config.KNOWN_HOSTS if hosts is None else hosts)
+        if not names:
+            return cls(episode_id, [], [])
+
+        timeline = TimeMap.from_text(cleaned)
+        ids: List[int] = []
+        starts: List[int] = []
+        # Longest names first so "Adam Frank" wins over a bare "Frank".
+        by_length = sorted(range(len(names)), key=lambda i: -len(names[i]))
+        for m in TIMESTAMP_MARKER_RE.finditer(cleaned):
+            base = max(0, m.start() - 80)
+            head = cleaned[base : m.start()].rstrip()
+            for sid in by_length:
+                name = names[sid]
+                start = base + len(head) - len(name)
+                if head.endswith(name) and (start == 0 or not cleaned[start - 1].isalnum()):
+                    ids.append(sid)
+                    starts.append(start)
+                    break
+
+        ends = starts[1:] + [len(cleaned)]
+        return cls(
+            episode_id,
+            names,
+            roles,
+            speaker_ids=ids,
+            char_starts=starts,
+            char_ends=ends,
+            time_starts=[_seconds(timeline.time_at(s)) for s in starts],
+            time_ends=[_seconds(timeline.time_at(e)) for e in ends],
+        )
+
+    def turn_at(self, char_offset: int) -> Optional[int]:
+        i = bisect.bisect_right(self.char_starts, char_offset) - 1
+        return i if i >= 0 else None
+
+    def speaker_shares(self, char_start: int, char_end: int) -> List[Tuple[str, float]]:
+        """
+        (name, share of chars) for each speaker with a turn overlapping
+        [char_start, char_end), in order of first appearance.
+        """
+        first = self.turn_at(char_start)
+        i = 0 if first is None else first
+        shares: Dict[str, int] = {}
+        while i < len(self) and self.char_starts[i] < char_end:
+            overlap = min(self.char_ends[i], char_end) - max(self.char_starts[i], char_start)
+            if overlap > 0:
+                name = self.speakers[self.speaker_ids[i]]
+                shares[name] = shares.get(name, 0) + overlap
+            i += 1
+        total = max(1, char_end - char_start)
+        return [(name, n / total) for name, n in shares.items()]
+
+    def role_of(self, name: str) -> Optional[str]:
+        # None when the episode has no known host, so roles are unknown.
+        return self.roles[self.speakers.index(name)] if name in self.speakers else None
+
+
+
+def _seconds(value: Optional[float]) -> float:
+    return float("nan") if value is None else value
+
+
+def assign_roles(names: Sequence[str], hosts: Sequence[str]) -> List[Optional[str]]:
+    """
+    "host" for speakers named in `hosts` (case-insensitive) and "guest" for the
+    rest of the episode. When no speaker is a known host, every role is None
+    rather than a guess, so "host"/"guest" filters match nothing.
+    """
+    known = {h.strip().lower() for h in hosts}
+    is_host = [name.strip().lower() in known for name in names]
+    if not any(is_host):
+        return [None] * len(names)
+    return ["host" if h else "guest" for h in is_host]
@@ -0,0 +1,97 @@
+"""
+Time alignment for transcripts: map character offsets to seconds using the inline
+"(HH:MM:SS)" markers kept by `clean_transcript_text`, and index chunk time ranges
+for O(log n) "which chunks cover 1:02:00-1:10:00" lookups.
+"""
+import bisect
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from podagent.utils import parse_timestamp
+
+TIMESTAMP_MARKER_RE = re.compile(r"\((\d{1,2}:\d{2}(?::\d{2})?)\)")
+
+
+class TimeMap:
+    """
+    Piecewise-linear map from character offset to seconds.
+
+    Each marker pins its offset to its time; words between two markers are
+    interpolated by character position, and text after the last marker is
+    extrapolated at the episode's average characters-per-second rate.
+    """
+
+    def __init__(self, offsets: Sequence[int], seconds: Sequence[float]):
+        self.offsets: List[int] = []
+        self.seconds: List[float] = []
+        latest = float("-inf")
+        for off, sec in zip(offsets, seconds):
+            # Keep times monotonic so lookups can binary-search.
+            latest = max(latest, float(sec))
+            self.offsets.append(int(off))
+            self.seconds.append(latest)
+        span_chars = self.offsets[-1] - self.offsets[0] if self.offsets else 0
+        span_secs = self.seconds[-1] - self.seconds[0] if self.seconds else 0.0
+        self.chars_per_second = span_chars / span_secs if span_secs > 0 else 0.0
+
+    @classmethod
+    def from_text(cls, text: str) -> "TimeMap":
+        offsets: List[int] = []
+        seconds: List[float] = []
+        for m in TIMESTAMP_MARKER_RE.finditer(text):
+            offsets.append(m.start())
+            seconds.append(parse_timestamp(m.group(1)))
+        return cls(offsets, seconds)
+
+    def __bool__(self) -> bool:
+        return bool(self.offsets)
+
+    def time_at(self, char_offset: int) -> Optional[float]:
+        if not self.offsets:
+            return None
+        i = bisect.bisect_right(self.offsets, char_offset) - 1
+        if i < 0:
+            return self.seconds[0]
+        if i + 1 < len(self.offsets):
+            o0, o1 = self.offsets[i], self.offsets[i + 1]
+            t0, t1 = self.seconds[i], self.seconds[i + 1]
+            return t0 + (t1 - t0) * (char_offset - o0) / max(1, o1 - o0)
+        if self.chars_per_second > 0:
+            return self.seconds[i] + (char_offset - self.offsets[i]) / self.chars_per_second
+        return self.seconds[i]
+
+
+class ChunkTimeIndex:
+    """
+    Sorted interval index over one episode's chunks (`start_time`/`end_time`).
+
+    Chunks are consecutive windows, so both starts and ends are non-decreasing;
+    overlap queries are two binary searches.
+    """
+
+    def __init__(self, chunks: Sequence[dict]):
+        timed = [c for c in chunks if c.get("start_time") is not None and c.get("end_time") is not None]
+        timed.sort(key=lambda c: (c["start_time"], c["end_time"]))
+        self.chunks = timed
+        self.starts = [float(c["start_time"]) for c in timed]
+        self.ends: List[float] = []
+        latest = float("-inf")
+        for c in timed:
+            latest = max(latest, float(c["end_time"]))
+            self.ends.append(latest)
+        self.chunk_ids = [c.get("chunk_id") for c in timed]
+
+    def covering(self, start: float, end: Optional[float] = None) -> List[dict]:
+        """
+        Chunks whose time range overlaps [start, end] (or contains `start` when
+        `end` is omitted).
+        """
+        end = start if end is None else end
+        lo = bisect.bisect_left(self.ends, start)
+        hi = bisect.bisect_right(self.starts, end)
+        return [c for c in self.chunks[lo:hi] if c["end_time"] >= start]
+
+    def range(self) -> Tuple[Optional[float], Optional[float]]:
+        if not self.chunks:
+            return None, None
+        return self.starts[0], self.ends[-1]
@@ -0,0 +1,304 @@
+"""
+Per-episode substring index over the cleaned transcript, used to verify that
+quotes and evidence snippets returned by the LLM appear in the source and to
+resolve them to a chunk id, character offset, and timestamp.
+
+The index is a sorted table of 32-bit hashes of every word n-gram (n=4) in the
+normalized token stream, so looking up a snippet is a handful of binary searches
+rather than a scan of the transcript. Approximate matches are scored with a
+token-level edit distance against the best-voted candidate windows.
+"""
+import bisect
+import json
+import re
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .timeline import TIMESTAMP_MARKER_RE, TimeMap
+
+NGRAM = 4
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:['’][A-Za-z0-9]+)*")
+
+
+def _normalize(token: str) -> str:
+    return token.lower().replace("’", "'")
+
+
+def _ngram_hash(tokens: Sequence[str]) -> int:
+    return zlib.crc32(" ".join(tokens).encode("utf-8"))
+
+
+def _tokenize_with_offsets(text: str) -> Tuple[List[str], List[int], List[int]]:
+    """
+    Normalized word tokens and their char spans, skipping inline timestamp markers.
+    """
+    markers = [m.span() for m in TIMESTAMP_MARKER_RE.finditer(text)]
+    tokens: List[str] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    mi = 0
+    for m in _TOKEN_RE.finditer(text):
+        while mi < len(markers) and markers[mi][1] <= m.start():
+            mi += 1
+        if mi < len(markers) and markers[mi][0] <= m.start() < markers[mi][1]:
+            continue
+        tokens.append(_normalize(m.group()))
+        starts.append(m.start())
+        ends.append(m.end())
+    return tokens, starts, ends
+
+
+def _edit_distance_substring(query: Sequence[str], window: Sequence[str]) -> Tuple[int, int, int]:
+    """
+    Smallest token edit distance between `query` and any substring of `window`
+    (semi-global alignment). Returns (distance, start, end) in window token indices.
+    """
+    m = len(query)
+    prev = [0] * (len(window) + 1)
+    prev_start = list(range(len(window) + 1))
+    for i in range(1, m + 1):
+        cur = [i] + [0] * len(window)
+        cur_start = [0] * (len(window) + 1)
+        for j in range(1, len(window) + 1):
+            sub = prev[j - 1] + (query[i - 1] != window[j - 1])
+            dele = prev[j] + 1
+            ins = cur[j - 1] + 1
+            best = min(sub, dele, ins)
+            cur[j] = best
+            if best == sub:
+                cur_start[j] = prev_start[j - 1]
+            elif best == dele:
+                cur_start[j] = prev_start[j]
+            else:
+                cur_start[j] = cur_start[j - 1]
+        prev, prev_start = cur, cur_start
+    end = min(range(len(window) + 1), key=lambda j: prev[j])
+    return prev[end], prev_start[end], end
+
+
+@dataclass
+class QuoteMatch:
+    text: str
+    verified: bool
+    exact: bool
+    distance: float
+    char_start: Optional[int] = None
+    char_end: Optional[int] = None
+    chunk_id: Optional[int] = None
+    timestamp: Optional[str] = None
+    seconds: Optional[float] = None
+
+
+class TranscriptIndex:
+    """
+    N-gram hash index over one episode's cleaned transcript.
+    """
+
+    def __init__(
+        self,
+        episode_id: str,
+        text: str,
+        chunk_spans: Sequence[Tuple[int, int, int]] = (),
+    ):
+        self.episode_id = episode_id
+        self.text = text
+        # (chunk_id, char_start, char_end), sorted by start
+        self.chunk_spans = sorted((int(c), int(s), int(e)) for c, s, e in chunk_spans)
+        self._chunk_starts = [s for _, s, _ in self.chunk_spans]
+
+        self.tokens, self.token_starts, self.token_ends = _tokenize_with_offsets(text)
+        pairs = sorted(
+            (_ngram_hash(self.tokens[i : i + NGRAM]), i) for i in range(len(self.tokens) - NGRAM + 1)
+        )
+        self.hashes = [h for h, _ in pairs]
+        self.positions = [p for _, p in pairs]
+
+        self._index_markers()
+
+    def _index_markers(self) -> None:
+        self.marker_offsets: List[int] = []
+        self.marker_values: List[str] = []
+        for m in TIMESTAMP_MARKER_RE.finditer(self.text):
+            self.marker_offsets.append(m.start())
+            self.marker_values.append(m.group(1))
+        self.timeline = TimeMap.from_text(self.text)
+
+    # Lookups
+
+    def _postings(self, h: int) -> List[int]:
+        lo = bisect.bisect_left(self.hashes, h)
+        hi = bisect.bisect_right(self.hashes, h, lo)
+        return self.positions[lo:hi]
+
+    def _candidates(self, query: Sequence[str], limit: int = 3) -> List[int]:
+        """
+        Candidate token start positions for `query`, ranked by how many of its
+        n-grams vote for them.
+        """
+        votes: Dict[int, int] = {}
+        if len(query) >= NGRAM:
+            for j in range(len(query) - NGRAM + 1):
+                for p in self._postings(_ngram_hash(query[j : j + NGRAM])):
+                    votes[p - j] = votes.get(p - j, 0) + 1
+        else:
+            # Too short for an n-gram; these snippets are rare, so scan for the first token.
+            votes = {i: 1 for i, t in enumerate(self.tokens) if t == query[0]}
+        return sorted((p for p in votes if p >= 0), key=lambda p: (-votes[p], p))[:limit]
+
+    def chunk_for_span(self, char_start: int, char_end: int) -> Optional[int]:
+        """
+        Chunk id whose span contains [char_start, char_end). Chunks overlap, so
+        the latest chunk starting at or before the span that also covers its end
+        wins; otherwise the chunk containing char_start.
+        """
+        i = bisect.bisect_right(self._chunk_starts, char_start) - 1
+        containing = None
+        for j in range(i, max(-1, i - 3), -1):
+            chunk_id, _, end = self.chunk_spans[j]
+            if end >= char_end:
+                return chunk_id
+            if containing is None and end > char_start:
+                containing = chunk_id
+        return containing
+
+    def timestamp_at(self, char_offset: int) -> Optional[str]:
+        """
+        The last inline timestamp marker at or before `char_offset`.
+        """
+        i = bisect.bisect_right(self.marker_offsets, char_offset) - 1
+        return self.marker_values[i] if i >= 0 else None
+
+    def verify(self, snippet: str, max_distance: float = 0.2) -> QuoteMatch:
+        """
+        Locate `snippet` in the transcript. Exact token matches have distance 0;
+        otherwise the best candidate window is accepted when its token edit
+        distance divided by the snippet length is at most `max_distance`.
+        """
+        query, _, _ = _tokenize_with_offsets(snippet)
+        if not query or not self.tokens:
+            return QuoteMatch(text=snippet, verified=False, exact=False, distance=1.0)
+
+        best: Optional[Tuple[float, int, int]] = None
+        slack = max(2, int(len(query) * max_distance) + 1)
+        for start in self._candidates(query):
+            if self.tokens[start : start + len(query)] == list(query):
+                best = (0.0, start, start + len(query))
+                break
+            lo = max(0, start - slack)
+            window = self.tokens[lo : start + len(query) + slack]
+            dist, ws, we = _edit_distance_substring(query, window)
+            score = dist / len(query)
+            if best is None or score < best[0]:
+                best = (score, lo + ws, lo + we)
+
+        if best is None or best[0] > max_distance or best[2] <= best[1]:
+            return QuoteMatch(
+                text=snippet, verified=False, exact=False, distance=best[0] if best else 1.0
+            )
+
+        distance, tok_start, tok_end = best
+        char_start = self.token_starts[tok_start]
+        char_end = self.token_ends[tok_end - 1]
+        return QuoteMatch(
+            text=snippet,
+            verified=True,
+            exact=distance == 0.0,
+            distance=distance,
+            char_start=char_start,
+            char_end=char_end,
+            chunk_id=self.chunk_for_span(char_start, char_end),
+            timestamp=self.timestamp_at(char_start),
+            seconds=self.timeline.time_at(char_start),
+        )
+
+    # Persistence
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "episode_id": self.episode_id,
+            "text": self.text,
+            "chunk_spans": [list(c) for c in self.chunk_spans],
+            "ngram": NGRAM,
+            "hashes": self.hashes,
+            "positions": self.positions,
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "TranscriptIndex":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        index = cls.__new__(cls)
+        index.episode_id = data["episode_id"]
+        index.text = data["text"]
+        index.chunk_spans = [tuple(c) for c in data["chunk_spans"]]
+        index._chunk_starts = [s for _, s, _ in index.chunk_spans]
+        index.tokens, index.token_starts, index.token_ends = _tokenize_with_offsets(index.text)
+        if data.get("ngram") == NGRAM:
+            index.hashes = data["hashes"]
+            index.positions = data["positions"]
+        else:
+            pairs = sorted(
+                (_ngram_hash(index.tokens[i : i + NGRAM]), i)
+                for i in range(len(index.tokens) - NGRAM + 1)
+            )
+            index.hashes = [h for h, _ in pairs]
+            index.positions = [p for _, p in pairs]
+        index._index_markers()
+        return index
+
+
+def transcript_index_path(episode_id: str, interim_dir: Path) -> Path:
+    return interim_dir / f"{episode_id}.transcript.json"
+
+
+def annotate_summary(
+    summary: Dict[str, Any],
+    index: TranscriptIndex,
+    max_distance: float = 0.2,
+) -> Dict[str, int]:
+    """
+    Verify quotes and Q&A evidence in a structured summary in place. Dict items
+    gain `verified`, `chunk_id`, `char_start`, and `timestamp`: the resolved one
+    for verified snippets (a differing model-supplied value moves to
+    `model_timestamp`), otherwise the model's if it gave one. Plain-string
+    evidence becomes such a dict.
+    Returns counts of checked and verified snippets.
+    """
+    checked = 0
+    verified = 0
+
+    def _resolve(item: Any) -> Any:
+        nonlocal checked, verified
+        text = item.get("text") if isinstance(item, dict) else item
+        if not isinstance(text, str) or not text.strip():
+            return item
+        match = index.verify(text, max_distance=max_distance)
+        checked += 1
+        verified += int(match.verified)
+        out = dict(item) if isinstance(item, dict) else {"text": text}
+        out["verified"] = match.verified
+        out["chunk_id"] = match.chunk_id
+        out["char_start"] = match.char_start
+        claimed = out.get("timestamp")
+        if match.verified and match.timestamp:
+            if claimed and claimed != match.timestamp:
+                out["model_timestamp"] = claimed
+            out["timestamp"] = match.timestamp
+        elif not claimed:
+            out["timestamp"] = match.timestamp
+        return out
+
+    summary["quotes"] = [
+        _resolve(q) if isinstance(q, dict) else q for q in (summary.get("quotes") or [])
+    ]
+    for qa in summary.get("q_and_a") or []:
+        if isinstance(qa, dict) and qa.get("evidence"):
+            evidence = qa["evidence"] if isinstance(qa["evidence"], list) else [qa["evidence"]]
+            qa["evidence"] = [_resolve(ev) for ev in evidence]
+    return {"checked": checked, "verified": verified}
+
@@ -1,7 +1,42 @@
 """
 Evaluation utilities.
+
+Exports are imported from their submodules on first access; metric backends
+(rouge-score, bert-score, nltk) load on first use.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .batch import evaluate_pairs
+    from .faithfulness import FaithfulnessScorer
+    from .metrics import compute_bert_score, compute_bert_score_batch, compute_rouge_l
+
+_EXPORTS = {
+    "compute_rouge_l": ".metrics",
+    "compute_bert_score": ".metrics",
+    "compute_bert_score_batch": ".metrics",
+    "evaluate_pairs": ".batch",
+    "FaithfulnessScorer": ".faithfulness",
+}
+
+__all__ = [
+    "compute_rouge_l",
+    "compute_bert_score",
+    "compute_bert_score_batch",
+    "evaluate_pairs",
+    "FaithfulnessScorer",
+]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
-from .metrics import compute_rouge_l, compute_bert_score
 
-__all__ = ["compute_rouge_l", "compute_bert_score"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,144 @@
+"""
+Batch evaluation over many summaries: one scorer per process, batched BERTScore,
+and ROUGE-L fanned out across a process pool.
+"""
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import compute_bert_score_batch, compute_rouge_l
+
+
+@dataclass
+class EvalPair:
+    key: str
+    label: str
+    reference: str
+    prediction: str
+
+
+def _abstract_of(summary: Any) -> str:
+    if isinstance(summary, dict):
+        return str(summary.get("abstract") or "")
+    return str(summary or "")
+
+
+def load_predictions(path: Path) -> List[Tuple[str, str, str]]:
+    """
+    Load (key, label, abstract) triples from either a directory of output JSONs
+    written by scripts/summarize.py (label = file stem, key = episode_id) or a
+    merged podcasts.json (key = entry key, label = summary label).
+    """
+    rows: List[Tuple[str, str, str]] = []
+    if path.is_dir():
+        for p in sorted(path.glob("*.json")):
+            data = json.loads(p.read_text(encoding="utf-8"))
+            if not isinstance(data, dict) or "episode_id" not in data:
+                continue
+            rows.append((str(data["episode_id"]), p.stem, _abstract_of(data)))
+        return rows
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for key, entry in data.items():
+        summaries = entry.get("summaries") if isinstance(entry, dict) else None
+        if not isinstance(summaries, dict):
+            continue
+        for label, summary in summaries.items():
+            rows.append((str(key), str(label), _abstract_of(summary)))
+    return rows
+
+
+def load_references(path: Path) -> Dict[str, str]:
+    """
+    Load reference texts keyed by episode/entry key from a directory of
+    `<key>.txt` files or a JSON object mapping key -> text (or -> {"abstract": ...}).
+    """
+    if path.is_dir():
+        return {p.stem: p.read_text(encoding="utf-8", errors="ignore") for p in sorted(path.glob("*.txt"))}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {str(k): _abstract_of(v) for k, v in data.items()}
+
+
+def build_pairs(
+    predictions: Sequence[Tuple[str, str, str]],
+    references: Optional[Dict[str, str]] = None,
+    reference_label: Optional[str] = None,
+) -> List[EvalPair]:
+    """
+    Pair each prediction with its reference. With `reference_label`, the summary
+    carrying that label is the reference for every other label of the same key.
+    """
+    by_label: Dict[str, str] = {}
+    if reference_label:
+        by_label = {key: text for key, label, text in predictions if label == reference_label}
+
+    pairs: List[EvalPair] = []
+    for key, label, text in predictions:
+        if reference_label:
+            if label == reference_label or key not in by_label:
+                continue
+            ref = by_label[key]
+        else:
+            ref = (references or {}).get(key)
+            if ref is None:
+                continue
+        pairs.append(EvalPair(key=key, label=label, reference=ref, prediction=text))
+    return pairs
+
+
+def _rouge_pair(pair: Tuple[str, str]) -> Dict[str, float]:
+    return compute_rouge_l(pair[0], pair[1])
+
+
+def evaluate_pairs(
+    pairs: Sequence[EvalPair],
+    workers: Optional[int] = None,
+    use_bert: bool = True,
+    bert_batch_size: int = 32,
+) -> List[Dict[str, Any]]:
+    """
+    Score every pair with ROUGE-L (process pool, one scorer per worker) and,
+    optionally, BERTScore (one model, batched). Returns one row per pair.
+    """
+    texts = [(p.reference, p.prediction) for p in pairs]
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(texts) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(texts))) as pool:
+            chunksize = max(1, len(texts) // (workers * 4))
+            rouge = list(pool.map(_rouge_pair, texts, chunksize=chunksize))
+    else:
+        rouge = [_rouge_pair(t) for t in texts]
+
+    bert: List[Dict[str, float]] = [{} for _ in pairs]
+    if use_bert and pairs:
+        bert = compute_bert_score_batch(
+            [p.reference for p in pairs],
+            [p.prediction for p in pairs],
+            batch_size=bert_batch_size,
+        )
+
+    rows: List[Dict[str, Any]] = []
+    for p, r, b in zip(pairs, rouge, bert):
+        rows.append({"key": p.key, "label": p.label, **r, **b})
+    return rows
+
+
+def write_results(rows: Sequence[Dict[str, Any]], path: Path) -> None:
+    """
+    Write rows as CSV (default) or JSON when the path ends in .json.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".json":
+        path.write_text(json.dumps(list(rows), ensure_ascii=False, indent=2), encoding="utf-8")
+        return
+    fields: List[str] = []
+    for row in rows:
+        fields.extend(k for k in row if k not in fields)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
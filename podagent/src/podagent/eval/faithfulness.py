@@ -0,0 +1,154 @@
+"""
+Embedding-based faithfulness and coverage metrics.
+
+Every generated claim (abstract sentence, quote, Q&A answer) is embedded with the
+retriever's encoder and matched against the episode's chunk vectors already stored
+in the index, so scoring an episode only costs encoding the summary.
+"""
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from podagent.utils import clean_transcript_text, sentence_split
+
+
+@dataclass
+class ClaimSupport:
+    kind: str
+    text: str
+    score: float
+    chunk_id: Optional[int]
+    supported: bool
+
+
+@dataclass
+class FaithfulnessReport:
+    episode_id: str
+    claims: List[ClaimSupport]
+    mean_support: float
+    unsupported_rate: float
+    coverage: float
+    compression_ratio: float
+    summary_words: int
+    transcript_words: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _text_of(item: Any, key: str) -> str:
+    if isinstance(item, dict):
+        return str(item.get(key) or "").strip()
+    return str(item or "").strip()
+
+
+def extract_claims(summary: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Flatten a summary output into (kind, text) claims: abstract sentences, quote
+    texts, and Q&A answers. Plain-string Q&A items are used whole.
+    """
+    claims: List[Tuple[str, str]] = []
+    for sentence in sentence_split(str(summary.get("abstract") or "")):
+        if len(sentence.split()) >= 4:
+            claims.append(("abstract", sentence))
+    for quote in summary.get("quotes") or []:
+        text = _text_of(quote, "text")
+        if text:
+            claims.append(("quote", text))
+    for qa in summary.get("q_and_a") or []:
+        text = _text_of(qa, "answer")
+        if text:
+            claims.append(("answer", text))
+    return claims
+
+
+def _transcript_words(chunks: Sequence[dict]) -> int:
+    """
+    Word count of the cleaned source transcript; falls back to summed chunk words
+    (an overestimate because of chunk overlap) if the source file is unavailable.
+    """
+    source_path = chunks[0].get("source_path") if chunks else None
+    if source_path and Path(source_path).exists():
+        raw = Path(source_path).read_text(encoding="utf-8", errors="ignore")
+        return len(clean_transcript_text(raw).split())
+    return sum(len(c.get("text", "").split()) for c in chunks)
+
+
+class FaithfulnessScorer:
+    """
+    Score summaries against an episode's indexed chunks.
+
+    `support_threshold` is the minimum cosine similarity between a claim and its
+    best chunk for the claim to count as supported; `coverage_threshold` is the
+    similarity at which a chunk counts as covered by some claim. Both are
+    MiniLM-scale defaults and should be calibrated per encoder.
+    """
+
+    def __init__(
+        self,
+        retriever,
+        support_threshold: float = 0.45,
+        coverage_threshold: float = 0.45,
+    ):
+        self.retriever = retriever
+        self.support_threshold = support_threshold
+        self.coverage_threshold = coverage_threshold
+
+    def score(
+        self,
+        summary: Dict[str, Any],
+        episode_id: Optional[str] = None,
+        transcript_words: Optional[int] = None,
+    ) -> FaithfulnessReport:
+        episode_id = episode_id or str(summary.get("episode_id") or "")
+        chunks, chunk_vecs = self.retriever.episode_vectors(episode_id)
+        if not chunks:
+            raise FileNotFoundError(f"No indexed chunks for episode_id={episode_id}")
+
+        claims = extract_claims(summary)
+        summary_words = len(str(summary.get("abstract") or "").split())
+        if transcript_words is None:
+            transcript_words = _transcript_words(chunks)
+        compression = summary_words / transcript_words if transcript_words else 0.0
+
+        if not claims:
+            return FaithfulnessReport(
+                episode_id=episode_id,
+                claims=[],
+                mean_support=0.0,
+                unsupported_rate=0.0,
+                coverage=0.0,
+                compression_ratio=compression,
+                summary_words=summary_words,
+                transcript_words=transcript_words,
+            )
+
+        claim_vecs = self.retriever.encode([text for _, text in claims])
+        sims = claim_vecs @ chunk_vecs.T
+        best = sims.argmax(axis=1)
+        best_scores = sims[np.arange(len(claims)), best]
+        covered = sims.max(axis=0) >= self.coverage_threshold
+
+        supports = [
+            ClaimSupport(
+                kind=kind,
+                text=text,
+                score=float(score),
+                chunk_id=chunks[int(idx)].get("chunk_id"),
+                supported=bool(score >= self.support_threshold),
+            )
+            for (kind, text), idx, score in zip(claims, best, best_scores)
+        ]
+        unsupported = sum(1 for c in supports if not c.supported)
+        return FaithfulnessReport(
+            episode_id=episode_id,
+            claims=supports,
+            mean_support=float(best_scores.mean()),
+            unsupported_rate=unsupported / len(supports),
+            coverage=float(covered.mean()),
+            compression_ratio=compression,
+            summary_words=summary_words,
+            transcript_words=transcript_words,
+        )
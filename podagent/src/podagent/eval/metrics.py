@@ -1,16 +1,127 @@
-from typing import Dict, Tuple
+import re
+import warnings
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence
 
+# Tokenization mirrors rouge_score.tokenize so native scores match rouge-score exactly.
+_NON_ALPHANUM_RE = re.compile(r"[^a-z0-9]+")
+_SPACES_RE = re.compile(r"\s+")
+_VALID_TOKEN_RE = re.compile(r"^[a-z0-9]+$")
 
-def compute_rouge_l(reference: str, prediction: str) -> Dict[str, float]:
+
+@lru_cache(maxsize=None)
+def get_rouge_scorer(use_stemmer: bool = True):
     """
-    Compute ROUGE-L using rouge-score if available; otherwise return zeros.
+    Return a shared rouge-score RougeScorer, or None if the package is missing.
     """
     try:
         from rouge_score import rouge_scorer  # type: ignore
     except Exception:  # pragma: no cover - optional dependency
+        return None
+    return rouge_scorer.RougeScorer(["rougeL"], use_stemmer=use_stemmer)
+
+
+@lru_cache(maxsize=None)
+def get_bert_scorer(lang: str = "en"):
+    """
+    Return a shared BERTScorer (model loaded once per process), or None if the
+    package is missing.
+    """
+    try:
+        from bert_score import BERTScorer  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return BERTScorer(lang=lang)
+
+
+@lru_cache(maxsize=None)
+def _porter_stem() -> Optional[Callable[[str], str]]:
+    """
+    Memoized Porter stemmer (the same nltk stemmer rouge-score uses), or None if
+    nltk is missing.
+    """
+    try:
+        from nltk.stem import porter  # type: ignore
+    except Exception:  # pragma: no cover - optional dependency
+        warnings.warn("nltk is not installed; native ROUGE-L falls back to unstemmed tokens.")
+        return None
+    return lru_cache(maxsize=1 << 16)(porter.PorterStemmer().stem)
+
+
+def rouge_tokenize(text: str, use_stemmer: bool = True) -> List[str]:
+    """
+    Tokenize like rouge-score: lowercase, split on non-alphanumerics, and stem
+    tokens longer than three characters.
+    """
+    tokens = _SPACES_RE.split(_NON_ALPHANUM_RE.sub(" ", text.lower()))
+    stem = _porter_stem() if use_stemmer else None
+    if stem is not None:
+        tokens = [stem(t) if len(t) > 3 else t for t in tokens]
+    return [t for t in tokens if _VALID_TOKEN_RE.match(t)]
+
+
+def lcs_length(a: Sequence[str], b: Sequence[str]) -> int:
+    """
+    Length of the longest common subsequence of two token sequences.
+
+    Bit-parallel (Allison-Dix / Hyyrö): the longer sequence becomes a bitset per
+    distinct token and each token of the shorter one updates the whole DP row in a
+    few big-integer operations, i.e. O(len(b) * len(a) / wordsize).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+
+    positions: Dict[str, List[int]] = {}
+    for i, tok in enumerate(a):
+        positions.setdefault(tok, []).append(i)
+    masks: Dict[str, int] = {}
+    for tok, pos in positions.items():
+        m = 0
+        for i in pos:
+            m |= 1 << i
+        masks[tok] = m
+
+    full = (1 << len(a)) - 1
+    v = full
+    for tok in b:
+        m = masks.get(tok)
+        if m is None:
+            continue
+        u = v & m
+        v = ((v + u) | (v - u)) & full
+    return len(a) - v.bit_count()
+
+
+def rouge_l(reference: str, prediction: str, use_stemmer: bool = True) -> Dict[str, float]:
+    """
+    Native ROUGE-L (sentence-level LCS), score-for-score compatible with rouge-score.
+    """
+    ref_tokens = rouge_tokenize(reference, use_stemmer)
+    pred_tokens = rouge_tokenize(prediction, use_stemmer)
+    if not ref_tokens or not pred_tokens:
+        return {"rougeL_f": 0.0, "rougeL_p": 0.0, "rougeL_r": 0.0}
+
+    lcs = lcs_length(ref_tokens, pred_tokens)
+    precision = lcs / len(pred_tokens)
+    recall = lcs / len(ref_tokens)
+    fmeasure = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return {"rougeL_f": fmeasure, "rougeL_p": precision, "rougeL_r": recall}
+
+
+def compute_rouge_l(reference: str, prediction: str, backend: str = "native") -> Dict[str, float]:
+    """
+    Compute ROUGE-L with the built-in bit-parallel implementation, or with
+    rouge-score when `backend="rouge_score"` (zeros if that package is missing).
+    """
+    if backend == "native":
+        return rouge_l(reference, prediction, use_stemmer=True)
+
+    scorer = get_rouge_scorer(True)
+    if scorer is None:
         return {"rougeL_f": 0.0, "rougeL_p": 0.0, "rougeL_r": 0.0}
 
-    scorer = rouge_scorer.RougeScorer(["rougeL"], use_stemmer=True)
     scores = scorer.score(reference, prediction)["rougeL"]
     return {"rougeL_f": scores.fmeasure, "rougeL_p": scores.precision, "rougeL_r": scores.recall}
 
@@ -19,10 +130,26 @@ def compute_bert_score(reference: str, prediction: str) -> Dict[str, float]:
     """
     Compute BERTScore if the package is installed; otherwise return zeros.
     """
-    try:
-        from bert_score import score  # type: ignore
-    except Exception:  # pragma: no cover - optional dependency
-        return {"bert_p": 0.0, "bert_r": 0.0, "bert_f1": 0.0}
+    return compute_bert_score_batch([reference], [prediction])[0]
+
+
+def compute_bert_score_batch(
+    references: Sequence[str],
+    predictions: Sequence[str],
+    batch_size: int = 32,
+) -> List[Dict[str, float]]:
+    """
+    Score many (reference, prediction) pairs in batched forward passes through one
+    shared BERTScore model. Returns zeros per pair if the package is missing.
+    """
+    scorer = get_bert_scorer("en")
+    if scorer is None:
+        return [{"bert_p": 0.0, "bert_r": 0.0, "bert_f1": 0.0} for _ in predictions]
+    if not predictions:
+        return []
 
-    P, R, F1 = score([prediction], [reference], lang="en", verbose=False)
-    return {"bert_p": float(P.mean()), "bert_r": float(R.mean()), "bert_f1": float(F1.mean())}
+    P, R, F1 = scorer.score(list(predictions), list(references), batch_size=batch_size, verbose=False)
+    return [
+        {"bert_p": float(p), "bert_r": float(r), "bert_f1": float(f)}
+        for p, r, f in zip(P.tolist(), R.tolist(), F1.tolist())
+    ]
@@ -1,12 +1,48 @@
 """
 Model wrappers for summarization and agentic pipeline.
+
+Exports are imported from their submodules on first access; provider SDKs are
+imported only when a summarizer is constructed.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .agent import PodcastSummarizer
+    from .loop import LoopBudget
+    from .providers import available_providers, create_summarizer
+    from .summarizer import OpenAISummarizer, TogetherSummarizer
+    from .usage import UsageLedger
 
-from .summarizer import OpenAISummarizer, TogetherSummarizer
-from .agent import PodcastSummarizer
+_EXPORTS = {
+    "OpenAISummarizer": ".summarizer",
+    "TogetherSummarizer": ".summarizer",
+    "PodcastSummarizer": ".agent",
+    "LoopBudget": ".loop",
+    "UsageLedger": ".usage",
+    "create_summarizer": ".providers",
+    "available_providers": ".providers",
+}
 
 __all__ = [
     "OpenAISummarizer",
     "TogetherSummarizer",
     "PodcastSummarizer",
+    "LoopBudget",
+    "UsageLedger",
+    "create_summarizer",
+    "available_providers",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,18 +1,48 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
 from podagent import config
-from podagent.retriever import EmbeddingRetriever, RetrievalResult
-from podagent.utils import read_jsonl
+from podagent.data_pipeline.transcript_index import (
+    TranscriptIndex,
+    annotate_summary,
+    transcript_index_path,
+)
+from podagent.tracing import span
+from podagent.utils import anchor_hash, read_jsonl
 
+from .evidence import EvidenceRef, evidence_refs
 from .summarizer import BaseSummarizer, OpenAISummarizer
 
+if TYPE_CHECKING:  # pragma: no cover - the retriever loads numpy/faiss on import
+    import numpy as np
+
+    from podagent.retriever import EmbeddingRetriever
+
+    from .cache import SummaryCache
+    from .compression import CompressionStats
+    from .loop import LoopBudget
+    from .planner import StrategyPlan
+
 
 def load_chunks_for_episode(episode_id: str, interim_dir: Optional[Path] = None) -> List[dict]:
     interim_dir = interim_dir or config.INTERIM_DIR
     path = interim_dir / f"{episode_id}.jsonl"
-    return read_jsonl(path)
+    with span("load_chunks_for_episode", episode_id=episode_id) as sp:
+        chunks = read_jsonl(path)
+        sp.set(num_chunks=len(chunks))
+    return chunks
+
+
+def load_transcript_index(episode_id: str, interim_dir: Optional[Path] = None) -> Optional[TranscriptIndex]:
+    """
+    Load the substring index written at ingest time, or None if it is missing.
+    """
+    path = transcript_index_path(episode_id, interim_dir or config.INTERIM_DIR)
+    if not path.exists():
+        return None
+    with span("load_transcript_index", episode_id=episode_id):
+        return TranscriptIndex.load(path)
 
 
 @dataclass
@@ -23,7 +53,34 @@ class SummaryOutput:
     quotes: List[str]
     q_and_a: List[str]
     keywords: List[str]
-    evidence: List[RetrievalResult]
+    evidence: List[EvidenceRef]
+    usage: Optional[Dict[str, Any]] = None
+    verification: Optional[Dict[str, int]] = None
+    compression: Optional[Dict[str, Any]] = None  # map-phase pre-compression stats
+    plan: Optional[Dict[str, Any]] = None  # auto mode: chosen strategy, estimates and reason
+    cache: Optional[Dict[str, int]] = None  # summary cache hits/misses per call kind
+    loop: Optional[Dict[str, Any]] = None  # agentic mode: rounds, flags, budget spent and why it stopped
+
+
+def summary_to_dict(result: SummaryOutput) -> Dict[str, Any]:
+    """
+    JSON-ready form of a summary, as written by scripts/summarize.py --output-json.
+    """
+    return {
+        "episode_id": result.episode_id,
+        "abstract": result.abstract,
+        "outline": result.outline,
+        "quotes": result.quotes,
+        "q_and_a": result.q_and_a,
+        "keywords": result.keywords,
+        "evidence": [r.to_dict() for r in (result.evidence or [])],
+        "usage": result.usage,
+        "verification": result.verification,
+        "compression": result.compression,
+        "plan": result.plan,
+        "cache": result.cache,
+        "loop": result.loop,
+    }
 
 
 class PodcastSummarizer:
@@ -35,36 +92,85 @@ class PodcastSummarizer:
     def __init__(
         self,
         summarizer: Optional[BaseSummarizer] = None,
-        retriever: Optional[EmbeddingRetriever] = None,
+        retriever: Optional["EmbeddingRetriever"] = None,
         max_context_chunks: int = 5,
+        mmr_lambda: float = 0.7,
+        map_workers: int = 1,
+        planner_objective: str = "balanced",
+        summary_cache: Optional["SummaryCache"] = None,
+        stable_groups: bool = False,
     ):
         self.summarizer = summarizer or OpenAISummarizer()
         self.retriever = retriever
         self.max_context_chunks = max_context_chunks
+        # Relevance/diversity trade-off for retrieved context; 1.0 ranks by relevance only.
+        self.mmr_lambda = mmr_lambda
+        # Concurrent map-phase (and tree-reduce) calls per episode.
+        self.map_workers = max(1, map_workers)
+        # Auto mode: "balanced", "latency" or "cost" (see models/planner.py).
+        self.planner_objective = planner_objective
+        # Memo of map, merge and final calls (see models/cache.py); with
+        # `stable_groups`, group boundaries survive small transcript edits so
+        # re-summarizing a corrected episode mostly hits it.
+        self.summary_cache = summary_cache
+        self.stable_groups = stable_groups
 
     def _select_context(
         self,
         episode_chunks: Sequence[dict],
         episode_id: str,
         query: Optional[str],
+        speaker: Optional[str] = None,
     ) -> List[dict]:
         """
-        If a retriever is available, limit results to the current episode_id;
-        otherwise take evenly spaced chunks across the episode to avoid only
-        summarizing the intro.
+        If a retriever is available, limit results to the current episode_id
+        (diversified with MMR); otherwise take evenly spaced chunks across the
+        episode to avoid only summarizing the intro. Overlapping windows are
+        then collapsed into passages in transcript order, so no text repeats.
         """
+        from podagent.retriever.diversity import collapse_overlaps
+
+        with span("_select_context", episode_id=episode_id, k=self.max_context_chunks) as sp:
+            selected, strategy = self._select_context_inner(episode_chunks, episode_id, query, speaker)
+            passages = collapse_overlaps(selected)
+            if sp:
+                sp.set(
+                    strategy=strategy,
+                    chunk_ids=[c.get("chunk_id") for c in selected],
+                    passages=len(passages),
+                    context_words=sum(len(c["text"].split()) for c in passages),
+                )
+        return passages
+
+    def _select_context_inner(
+        self,
+        episode_chunks: Sequence[dict],
+        episode_id: str,
+        query: Optional[str],
+        speaker: Optional[str] = None,
+    ) -> Tuple[List[dict], str]:
         if self.retriever and query:
-            results = self.retriever.search(query, k=self.max_context_chunks * 3)
-            filtered = [r.chunk for r in results if r.chunk.get("episode_id") == episode_id]
-            if filtered:
-                return filtered[: self.max_context_chunks]
+            if self.mmr_lambda < 1.0:
+                results = self.retriever.search_mmr(
+                    query,
+                    k=self.max_context_chunks,
+                    lambda_mult=self.mmr_lambda,
+                    speaker=speaker,
+                    episode_id=episode_id,
+                )
+            else:
+                results = self.retriever.search(
+                    query, k=self.max_context_chunks, speaker=speaker, episode_id=episode_id
+                )
+            if results:
+                return [r.chunk for r in results], "retrieval"
 
         # No retriever or no matches: pick evenly spaced chunks across the episode
         if not episode_chunks:
-            return []
+            return [], "empty"
         k = max(1, self.max_context_chunks)
         if len(episode_chunks) <= k:
-            return list(episode_chunks)
+            return list(episode_chunks), "all"
 
         idxs = []
         for i in range(k):
@@ -73,7 +179,7 @@ class PodcastSummarizer:
             idxs.append(int(idx))
         # ensure unique and sorted
         idxs = sorted(set(idxs))
-        return [episode_chunks[i] for i in idxs]
+        return [episode_chunks[i] for i in idxs], "evenly_spaced"
 
     def summarize_episode(
         self,
@@ -87,75 +193,450 @@ class PodcastSummarizer:
         intermediate_max_words: int = 300,
         final_target_words: int = 700,
         final_max_tokens: int = 1800,
+        verify_quotes: bool = True,
+        speaker: Optional[str] = None,
+        compress: Optional[str] = None,
+        compress_ratio: float = 0.5,
+        auto: bool = False,
+        agentic: bool = False,
+        budget: Optional["LoopBudget"] = None,
+    ) -> SummaryOutput:
+        """
+        `speaker` (a name, or "host"/"guest") restricts query retrieval to chunks
+        where that speaker talks. `usage` covers only the calls made for this
+        episode, also while other episodes share the summarizer concurrently.
+        In hierarchical mode, `compress` ("tfidf", "textrank" or "embedding")
+        keeps only the most central `compress_ratio` of each group's tokens
+        before the map call; see models/compression.py.
+
+        With `auto`, `hierarchical`, `group_size` and the context size are not
+        used: the planner measures the episode and picks a single long-context
+        call, flat map-reduce or tree reduce (see `plan_strategy`), and its
+        choice and reasoning are returned in `plan`.
+
+        With a `summary_cache`, calls whose request was already answered are
+        served from it (counts in `cache`): after a transcript is corrected
+        and re-ingested, only groups whose chunks changed are re-summarized,
+        and the final call re-runs only if some group summary changed.
+
+        With `agentic`, the planner/retriever/critic loop in models/loop.py
+        replaces all of the above, within `budget` (calls, tokens, seconds);
+        its rounds and spend are returned in `loop`. If it answers none of its
+        sub-questions, the episode is summarized as without `agentic` and
+        `loop["fallback"]` says so.
+        """
+        args = (
+            episode_id,
+            interim_dir,
+            query,
+            hierarchical,
+            group_size,
+            structured,
+            intermediate_min_words,
+            intermediate_max_words,
+            final_target_words,
+            final_max_tokens,
+            verify_quotes,
+            speaker,
+            compress,
+            compress_ratio,
+            auto,
+            agentic,
+            budget,
+        )
+        ledger = getattr(self.summarizer, "ledger", None)
+        if ledger is None:
+            return self._summarize_episode_inner(*args)
+        with ledger.scope() as episode_ledger:
+            result = self._summarize_episode_inner(*args)
+        result.usage = episode_ledger.summary()
+        return result
+
+    def _summarize_episode_inner(
+        self,
+        episode_id: str,
+        interim_dir: Optional[Path],
+        query: Optional[str],
+        hierarchical: bool,
+        group_size: int,
+        structured: bool,
+        intermediate_min_words: int,
+        intermediate_max_words: int,
+        final_target_words: int,
+        final_max_tokens: int,
+        verify_quotes: bool,
+        speaker: Optional[str],
+        compress: Optional[str],
+        compress_ratio: float,
+        auto: bool,
+        agentic: bool,
+        budget: Optional["LoopBudget"],
     ) -> SummaryOutput:
         chunks = load_chunks_for_episode(episode_id, interim_dir=interim_dir)
         if not chunks:
             raise FileNotFoundError(f"No chunks found for episode_id={episode_id}")
 
+        loop_stats: Optional[Dict[str, Any]] = None
+        if agentic:
+            from .loop import AgentLoop
+
+            looped = AgentLoop(self, budget).run(
+                episode_id,
+                chunks,
+                query=query,
+                speaker=speaker,
+                interim_dir=interim_dir,
+                target_words=final_target_words,
+                verify_quotes=verify_quotes,
+            )
+            if looped.loop["answered"]:
+                return looped
+            # Nothing answered (unusable plan, failed calls or no budget left):
+            # summarize the standard way rather than return an empty summary.
+            loop_stats = dict(looped.loop, fallback="standard")
+
+        plan: Optional["StrategyPlan"] = None
+        if auto:
+            plan = self.plan_strategy(
+                chunks,
+                structured=structured,
+                intermediate_max_words=intermediate_max_words,
+                final_target_words=final_target_words,
+                final_max_tokens=final_max_tokens,
+                compress_ratio=compress_ratio if compress else 1.0,
+            )
+            hierarchical = plan.strategy != "single_pass"
+            group_size = plan.group_size or group_size
+
+        group_summaries: Optional[List[str]] = None
+        compression: Optional["CompressionStats"] = None
+        cache_stats: Optional[Dict[str, int]] = {} if self.summary_cache is not None else None
         if hierarchical:
             # Two-pass: summarize groups of chunks, then summarize the summaries.
-            group_size = max(1, group_size)
-            group_summaries: List[str] = []
-            for i in range(0, len(chunks), group_size):
-                group_text = "\n\n".join(c["text"] for c in chunks[i : i + group_size])
-                summary = self.summarizer.summarize(
-                    group_text,
-                    max_length=intermediate_max_words,
-                    min_length=intermediate_min_words,
-                )
-                if summary:
-                    group_summaries.append(summary)
-            combined_text = "\n\n".join(group_summaries)
-            if structured and hasattr(self.summarizer, "summarize_structured"):
-                out = self.summarizer.summarize_structured(
-                    combined_text,
-                    target_words=final_target_words,
-                    max_tokens=final_max_tokens,
-                )
-                abstract = out.get("abstract", "")
-                outline = out.get("outline", []) or []
-                quotes = out.get("quotes", []) or []
-                q_and_a = out.get("q_and_a", []) or []
-                keywords = out.get("keywords", []) or []
-            else:
-                abstract = self.summarizer.summarize(
-                    combined_text, max_length=final_target_words, min_length=final_target_words // 2
+            group_texts, compression = self.map_inputs(episode_id, chunks, group_size, compress, compress_ratio)
+            group_summaries = self.map_summaries(
+                group_texts, intermediate_min_words, intermediate_max_words, cache_stats=cache_stats
+            )
+            reduced = group_summaries
+            if plan is not None and plan.strategy == "tree_reduce":
+                reduced = self.tree_reduce(
+                    group_summaries, plan.fan_in, intermediate_min_words, intermediate_max_words, cache_stats
                 )
-                outline = group_summaries[:6]
-                quotes = self._extract_quotes(chunks[: self.max_context_chunks])
-                q_and_a = [f"Block {i+1}: {s}" for i, s in enumerate(group_summaries[:3])]
-                keywords = self._extract_keywords("\n\n".join(group_summaries))
-            evidence: List[RetrievalResult] = []
+            context_chunks = list(chunks[: self.max_context_chunks])
+            final_input = "\n\n".join(reduced)
+        elif plan is not None:
+            # The planner only picks a single pass when the whole episode fits.
+            from podagent.retriever.diversity import collapse_overlaps
+
+            context_chunks = collapse_overlaps(chunks)
+            final_input = "\n\n".join(c["text"] for c in context_chunks)
         else:
-            context_chunks = self._select_context(chunks, episode_id=episode_id, query=query)
-            context_text = "\n\n".join(c["text"] for c in context_chunks)
+            context_chunks = self._select_context(
+                chunks, episode_id=episode_id, query=query, speaker=speaker
+            )
+            final_input = "\n\n".join(c["text"] for c in context_chunks)
 
-            # Generate pieces of the structured summary.
-            if structured and hasattr(self.summarizer, "summarize_structured"):
-                out = self.summarizer.summarize_structured(
-                    context_text, target_words=final_target_words, max_tokens=final_max_tokens
-                )
-                abstract = out.get("abstract", "")
-                outline = out.get("outline", []) or []
-                quotes = out.get("quotes", []) or []
-                q_and_a = out.get("q_and_a", []) or []
-                keywords = out.get("keywords", []) or []
-            else:
-                abstract = self.summarizer.summarize(
-                    context_text, max_length=final_target_words, min_length=final_target_words // 2
+        # Generate pieces of the structured summary.
+        final = self.final_summary(final_input, structured, final_target_words, final_max_tokens, cache_stats)
+        result = self.compose(
+            episode_id, final, context_chunks, final_input, group_summaries, interim_dir, verify_quotes
+        )
+        if not hierarchical and self.retriever and query:
+            result.evidence = evidence_refs(
+                self.retriever.search(query, k=self.max_context_chunks, speaker=speaker, episode_id=episode_id)
+            )
+        if compression is not None:
+            result.compression = compression.to_dict()
+        if plan is not None:
+            result.plan = plan.to_dict()
+        result.cache = cache_stats
+        result.loop = loop_stats
+        return result
+
+    def final_summary(
+        self,
+        final_input: str,
+        structured: bool,
+        target_words: int,
+        max_tokens: int,
+        cache_stats: Optional[Dict[str, int]] = None,
+    ) -> Any:
+        """
+        The final call: a structured dict when `structured` is honoured,
+        otherwise abstract text. Memoized like the map calls.
+        """
+        if self.wants_structured(structured):
+            builder = getattr(self.summarizer, "structured_request", None)
+            request = (
+                builder(final_input, target_words=target_words, max_tokens=max_tokens)
+                if builder
+                else {"text": final_input, "target_words": target_words, "max_tokens": max_tokens}
+            )
+            key = self._cache_key("structured", request)
+            final = self._cache_get(key, "final", cache_stats)
+            if final is None:
+                final = self.summarizer.summarize_structured(
+                    final_input, target_words=target_words, max_tokens=max_tokens
                 )
-                outline = self._generate_outline(context_chunks)
-                quotes = self._extract_quotes(context_chunks)
-                q_and_a = self._generate_q_and_a(context_chunks)
-                keywords = self._extract_keywords(context_text)
-
-            evidence: List[RetrievalResult] = []
-            if self.retriever and query:
-                evidence = [
-                    r
-                    for r in self.retriever.search(query, k=self.max_context_chunks * 3)
-                    if r.chunk.get("episode_id") == episode_id
-                ][: self.max_context_chunks]
+                self._cache_put(key, "structured", final)
+            return final
+        key = self._cache_key("summarize", self._summarize_request(final_input, target_words, target_words // 2))
+        final = self._cache_get(key, "final", cache_stats)
+        if final is None:
+            final = self.summarizer.summarize(final_input, max_length=target_words, min_length=target_words // 2)
+            self._cache_put(key, "summarize", final)
+        return final
+
+    def _summarize_request(self, text: str, max_words: int, min_words: int) -> Dict[str, Any]:
+        builder = getattr(self.summarizer, "summarize_request", None)
+        if builder is None:
+            return {"text": text, "max_length": max_words, "min_length": min_words}
+        return builder(text, max_length=max_words, min_length=min_words)
+
+    def _cache_key(self, kind: str, request: Dict[str, Any]) -> Optional[str]:
+        if self.summary_cache is None:
+            return None
+        return self.summary_cache.key(kind, getattr(self.summarizer, "model", None), request)
+
+    def _cache_get(self, key: Optional[str], stage: str, cache_stats: Optional[Dict[str, int]]) -> Any:
+        if key is None:
+            return None
+        value = self.summary_cache.get(key)
+        if cache_stats is not None:
+            name = f"{stage}_hits" if value is not None else f"{stage}_misses"
+            cache_stats[name] = cache_stats.get(name, 0) + 1
+        return value
+
+    def _cache_put(self, key: Optional[str], kind: str, value: Any) -> None:
+        # Empty responses are not memoized, so a failed call is retried next run.
+        if key is not None and value:
+            self.summary_cache.put(key, value, kind=kind, model=getattr(self.summarizer, "model", None))
+
+    def plan_strategy(
+        self,
+        chunks: Sequence[dict],
+        structured: bool = False,
+        intermediate_max_words: int = 300,
+        final_target_words: int = 700,
+        final_max_tokens: int = 1800,
+        compress_ratio: float = 1.0,
+    ) -> "StrategyPlan":
+        """
+        Choose single-pass, map-reduce or tree reduce for `chunks` from their
+        token count, the summarizer model's context window and the planner's
+        latency/cost model. Prompt overheads are measured from the
+        summarizer's own request builders when it has them.
+        """
+        from podagent.retriever.diversity import collapse_overlaps
+
+        from .planner import WORDS_TO_TOKENS, StrategyPlanner
+        from .usage import estimate_tokens
+
+        def overhead(request: Optional[Dict[str, Any]]) -> int:
+            if not request:
+                return 200
+            return sum(estimate_tokens(m.get("content") or "") for m in request.get("messages", []))
+
+        builder = getattr(self.summarizer, "summarize_request", None)
+        map_overhead = overhead(builder("") if builder else None)
+        if self.wants_structured(structured) and hasattr(self.summarizer, "structured_request"):
+            final_overhead = overhead(self.summarizer.structured_request("", target_words=final_target_words))
+            # Outline, quotes, Q&A and keywords come on top of the abstract.
+            final_output = min(final_max_tokens, int(final_target_words * WORDS_TO_TOKENS * 1.5))
+        else:
+            final_overhead = map_overhead
+            final_output = int(final_target_words * WORDS_TO_TOKENS)
+
+        ledger = getattr(self.summarizer, "ledger", None)
+        planner = StrategyPlanner(
+            model=getattr(self.summarizer, "model", None),
+            prices=ledger.prices if ledger is not None else None,
+            map_workers=self.map_workers,
+            objective=self.planner_objective,
+        )
+        with span("plan_strategy", chunks=len(chunks)) as sp:
+            plan = planner.plan(
+                [int(estimate_tokens(c["text"]) * compress_ratio) for c in chunks],
+                sum(estimate_tokens(c["text"]) for c in collapse_overlaps(chunks)),
+                map_overhead=map_overhead,
+                map_output=int(intermediate_max_words * WORDS_TO_TOKENS),
+                final_overhead=final_overhead,
+                final_output=final_output,
+            )
+            sp.set(strategy=plan.strategy, group_size=plan.group_size, reason=plan.reason)
+        return plan
+
+    def map_summaries(
+        self,
+        texts: Sequence[str],
+        min_words: int,
+        max_words: int,
+        stage: str = "map",
+        cache_stats: Optional[Dict[str, int]] = None,
+    ) -> List[str]:
+        """
+        Summaries of `texts` in order (empty ones dropped), `map_workers` calls
+        at a time. Each call runs in a copy of this context, so usage scopes
+        and tracing see it. Texts already in the summary cache are not sent;
+        hits and misses are counted under `stage` in `cache_stats`.
+        """
+        def one(text: str) -> str:
+            return self.summarizer.summarize(text, max_length=max_words, min_length=min_words)
+
+        keys = [
+            self._cache_key("summarize", self._summarize_request(text, max_words, min_words)) for text in texts
+        ]
+        summaries = [self._cache_get(key, stage, cache_stats) for key in keys]
+        misses = [i for i, s in enumerate(summaries) if s is None]
+        if self.map_workers <= 1 or len(misses) <= 1:
+            fresh = [one(texts[i]) for i in misses]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            from contextvars import copy_context
+
+            with ThreadPoolExecutor(max_workers=min(self.map_workers, len(misses))) as pool:
+                futures = [pool.submit(copy_context().run, one, texts[i]) for i in misses]
+                fresh = [f.result() for f in futures]
+        for i, summary in zip(misses, fresh):
+            summaries[i] = summary
+            self._cache_put(keys[i], "summarize", summary)
+        return [s for s in summaries if s]
+
+    def tree_reduce(
+        self,
+        summaries: List[str],
+        fan_in: int,
+        min_words: int,
+        max_words: int,
+        cache_stats: Optional[Dict[str, int]] = None,
+    ) -> List[str]:
+        """
+        Merge group summaries `fan_in` at a time, level by level, until one
+        level's worth fits the final call (at most `fan_in` summaries remain).
+        """
+        fan_in = max(2, fan_in)
+        level = 0
+        while len(summaries) > fan_in:
+            level += 1
+            with span("tree_reduce_level", level=level, inputs=len(summaries), fan_in=fan_in):
+                batches = ["\n\n".join(summaries[i : i + fan_in]) for i in range(0, len(summaries), fan_in)]
+                summaries = self.map_summaries(batches, min_words, max_words, "merge", cache_stats)
+        return summaries
+
+    @staticmethod
+    def chunk_groups(chunks: Sequence[dict], group_size: int, stable: bool = False) -> List[List[dict]]:
+        """
+        Consecutive groups of `group_size` chunks. With `stable`, a group
+        instead ends after a chunk whose closing words hash to 0 mod a divisor
+        chosen so groups average `group_size` chunks (between half and twice
+        that). Inserting or removing a chunk then only regroups its
+        neighbourhood instead of shifting every later group.
+        """
+        group_size = max(1, group_size)
+        if not stable or group_size == 1:
+            return [list(chunks[i : i + group_size]) for i in range(0, len(chunks), group_size)]
+        min_size = (group_size + 1) // 2
+        divisor = group_size - min_size + 1
+        groups: List[List[dict]] = []
+        group: List[dict] = []
+        for chunk in chunks:
+            group.append(chunk)
+            closing = chunk["text"].split()[-8:]
+            if len(group) >= 2 * group_size or (len(group) >= min_size and anchor_hash(closing) % divisor == 0):
+                groups.append(group)
+                group = []
+        if group:
+            groups.append(group)
+        return groups
+
+    @staticmethod
+    def group_texts(chunks: Sequence[dict], group_size: int, stable: bool = False) -> List[str]:
+        """
+        Map-phase inputs for hierarchical mode: the texts of the chunk groups.
+        """
+        groups = PodcastSummarizer.chunk_groups(chunks, group_size, stable)
+        return ["\n\n".join(c["text"] for c in group) for group in groups]
+
+    def map_inputs(
+        self,
+        episode_id: str,
+        chunks: Sequence[dict],
+        group_size: int,
+        compress: Optional[str] = None,
+        compress_ratio: float = 0.5,
+    ) -> Tuple[List[str], Optional["CompressionStats"]]:
+        """
+        Map-phase inputs, extractively pre-compressed when `compress` names a
+        scoring method, with the token reduction achieved (None uncompressed).
+        """
+        if not compress:
+            return self.group_texts(chunks, group_size, self.stable_groups), None
+        import numpy as np
+
+        from .compression import CompressionStats, ExtractiveCompressor
+
+        compressor = ExtractiveCompressor(compress, keep_ratio=compress_ratio)
+        vectors = self._stored_chunk_vectors(episode_id) if compress == "embedding" else {}
+        stats = CompressionStats(compress, compress_ratio)
+        texts: List[str] = []
+        with span("compress_groups", episode_id=episode_id, method=compress, keep_ratio=compress_ratio) as sp:
+            for group in self.chunk_groups(chunks, group_size, self.stable_groups):
+                rows = [vectors.get(c.get("chunk_id")) for c in group]
+                group_vectors = np.stack(rows) if rows and all(r is not None for r in rows) else None
+                text, group_stats = compressor.compress(group, group_vectors)
+                texts.append(text)
+                stats.add(group_stats)
+            sp.set(**stats.to_dict())
+        return texts, stats
+
+    def _stored_chunk_vectors(self, episode_id: str) -> Dict[Any, "np.ndarray"]:
+        """
+        The episode's chunk embeddings from the retriever index, by chunk id.
+        """
+        if self.retriever is None:
+            raise ValueError("Embedding compression needs a retriever index (--index).")
+        episode_chunks, vecs = self.retriever.episode_vectors(episode_id)
+        return {c.get("chunk_id"): v for c, v in zip(episode_chunks, vecs)}
+
+    def wants_structured(self, structured: bool) -> bool:
+        return structured and hasattr(self.summarizer, "summarize_structured")
+
+    def compose(
+        self,
+        episode_id: str,
+        final: Any,
+        context_chunks: Sequence[dict],
+        final_input: str,
+        group_summaries: Optional[List[str]] = None,
+        interim_dir: Optional[Path] = None,
+        verify_quotes: bool = True,
+    ) -> SummaryOutput:
+        """
+        Assemble a `SummaryOutput` from the final LLM response: the sections of
+        a structured response (checked against the transcript), or a plain
+        abstract with locally derived outline, quotes, Q&A and keywords.
+        `group_summaries` is set in hierarchical mode.
+        """
+        verification: Optional[Dict[str, int]] = None
+        if isinstance(final, dict):
+            verification = self._verify_snippets(final, episode_id, interim_dir, verify_quotes)
+            abstract = final.get("abstract", "")
+            outline = final.get("outline", []) or []
+            quotes = final.get("quotes", []) or []
+            q_and_a = final.get("q_and_a", []) or []
+            keywords = final.get("keywords", []) or []
+        elif group_summaries is not None:
+            abstract = final
+            outline = group_summaries[:6]
+            quotes = self._extract_quotes(context_chunks)
+            q_and_a = [f"Block {i+1}: {s}" for i, s in enumerate(group_summaries[:3])]
+            keywords = self._extract_keywords("\n\n".join(group_summaries))
+        else:
+            abstract = final
+            outline = self._generate_outline(context_chunks)
+            quotes = self._extract_quotes(context_chunks)
+            q_and_a = self._generate_q_and_a(context_chunks)
+            keywords = self._extract_keywords(final_input)
 
         return SummaryOutput(
             episode_id=episode_id,
@@ -164,9 +645,31 @@ class PodcastSummarizer:
             quotes=quotes,
             q_and_a=q_and_a,
             keywords=keywords,
-            evidence=evidence,
+            evidence=[],
+            verification=verification,
         )
 
+    def _verify_snippets(
+        self,
+        out: Dict[str, Any],
+        episode_id: str,
+        interim_dir: Optional[Path],
+        enabled: bool,
+    ) -> Optional[Dict[str, int]]:
+        """
+        Local critic: check structured quotes and Q&A evidence against the
+        transcript substring index and attach chunk ids, offsets and timestamps.
+        """
+        if not enabled:
+            return None
+        index = load_transcript_index(episode_id, interim_dir)
+        if index is None:
+            return None
+        with span("verify_snippets", episode_id=episode_id) as sp:
+            counts = annotate_summary(out, index)
+            sp.set(**counts)
+        return counts
+
     def _generate_outline(self, context_chunks: Sequence[dict], max_items: int = 6) -> List[str]:
         outline: List[str] = []
         for chunk in context_chunks[:max_items]:
@@ -0,0 +1,166 @@
+"""
+Batch summarization over the ingest manifest: one shared summarizer and
+retriever, a bounded thread pool across episodes, per-episode failure
+isolation, resume from completed outputs, and a run summary.
+"""
+import fnmatch
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from contextvars import copy_context
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from podagent import config
+from podagent.tracing import span
+from podagent.utils import read_jsonl
+
+from .agent import PodcastSummarizer, summary_to_dict
+
+
+@dataclass
+class EpisodeRun:
+    episode_id: str
+    status: str  # "ok", "failed" or "skipped" (already completed)
+    seconds: float = 0.0
+    output_path: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None  # usage totals for this episode
+    error: Optional[str] = None
+
+
+def load_manifest(
+    interim_dir: Optional[Path] = None,
+    episode_ids: Optional[Sequence[str]] = None,
+    pattern: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[dict]:
+    """
+    Manifest entries written at ingest, optionally restricted to `episode_ids`
+    (kept in the given order) and/or an fnmatch `pattern` on the episode id.
+    """
+    interim_dir = interim_dir or config.INTERIM_DIR
+    manifest_path = interim_dir / "manifest.jsonl"
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No manifest at {manifest_path}; run scripts/ingest.py first.")
+    entries = read_jsonl(manifest_path)
+    if episode_ids:
+        by_id = {e["episode_id"]: e for e in entries}
+        missing = [e for e in episode_ids if e not in by_id]
+        if missing:
+            raise ValueError(f"Episodes not in manifest: {', '.join(missing)}")
+        entries = [by_id[e] for e in episode_ids]
+    if pattern:
+        entries = [e for e in entries if fnmatch.fnmatch(e["episode_id"], pattern)]
+    return entries[:limit] if limit is not None else entries
+
+
+def output_path(output_dir: Path, episode_id: str) -> Path:
+    return output_dir / f"{episode_id}.json"
+
+
+def completed_episodes(output_dir: Path) -> Set[str]:
+    """
+    Episode ids with a readable output JSON in `output_dir`. Outputs are written
+    atomically, so a partial file from an interrupted run never counts.
+    """
+    done: Set[str] = set()
+    if not output_dir.is_dir():
+        return done
+    for path in output_dir.glob("*.json"):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and data.get("episode_id") == path.stem:
+            done.add(path.stem)
+    return done
+
+
+def _write_json(path: Path, data: Any) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def summarize_batch(
+    agent: PodcastSummarizer,
+    episode_ids: Sequence[str],
+    output_dir: Path,
+    workers: int = 4,
+    resume: bool = True,
+    interim_dir: Optional[Path] = None,
+    on_result: Optional[Callable[[EpisodeRun], None]] = None,
+    **summarize_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Summarize `episode_ids` with `agent`, at most `workers` episodes in flight,
+    writing `<output_dir>/<episode_id>.json` for each success. An episode that
+    raises is recorded as failed and the rest carry on; with `resume`, episodes
+    that already have an output are skipped. `summarize_kwargs` go to
+    `PodcastSummarizer.summarize_episode`; `on_result` is called (from worker
+    threads) as each episode finishes.
+
+    Returns the run summary (also written to `<output_dir>/run_summary.json`):
+    per-episode status, timings and token totals, plus totals for the run.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    done = completed_episodes(output_dir) if resume else set()
+    ledger = getattr(agent.summarizer, "ledger", None)
+    started = time.time()
+    runs: Dict[str, EpisodeRun] = {}
+
+    def run_one(episode_id: str) -> EpisodeRun:
+        t0 = time.perf_counter()
+        # Scoped here too, so a failed episode still reports the calls it spent.
+        with ledger.scope() if ledger is not None else nullcontext() as episode_ledger:
+            try:
+                with span("summarize_episode", episode_id=episode_id):
+                    result = agent.summarize_episode(episode_id, interim_dir=interim_dir, **summarize_kwargs)
+                path = output_path(output_dir, episode_id)
+                _write_json(path, summary_to_dict(result))
+                run = EpisodeRun(episode_id, "ok", output_path=str(path))
+            except Exception as exc:
+                run = EpisodeRun(
+                    episode_id,
+                    "failed",
+                    error="".join(traceback.format_exception_only(type(exc), exc)).strip(),
+                )
+        run.seconds = round(time.perf_counter() - t0, 3)
+        run.usage = episode_ledger.summary()["totals"] if episode_ledger is not None else None
+        if on_result is not None:
+            on_result(run)
+        return run
+
+    pending = [e for e in episode_ids if e not in done]
+    for episode_id in episode_ids:
+        if episode_id in done:
+            runs[episode_id] = EpisodeRun(
+                episode_id, "skipped", output_path=str(output_path(output_dir, episode_id))
+            )
+
+    with ledger.scope() if ledger is not None else nullcontext() as run_ledger:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            # Each task runs in a copy of this context so the run's usage scope sees its calls.
+            futures = {pool.submit(copy_context().run, run_one, e): e for e in pending}
+            for future in as_completed(futures):
+                run = future.result()
+                runs[run.episode_id] = run
+
+    ordered = [asdict(runs[e]) for e in episode_ids]
+    counts = {status: sum(1 for r in ordered if r["status"] == status) for status in ("ok", "failed", "skipped")}
+    summary = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "wall_s": round(time.time() - started, 3),
+        "workers": workers,
+        "counts": counts,
+        "usage": run_ledger.summary()["totals"] if run_ledger is not None else None,
+        "failures": {r["episode_id"]: r["error"] for r in ordered if r["status"] == "failed"},
+        "episodes": ordered,
+    }
+    _write_json(output_dir / "run_summary.json", summary)
+    return summary
@@ -0,0 +1,279 @@
+"""
+Local stand-in for an OpenAI-compatible batch API, for tests and dry runs of
+`models/offline.py` without network access or spend.
+
+Implements the subset the offline job uses: file upload and download, batch
+creation and retrieval. A batch completes `complete_after_s` seconds after it
+is created; each request is answered by `responder` (by default a
+deterministic echo that also returns valid JSON for structured requests).
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+_EXCERPT_RE = re.compile(r"^\[(\d+)\] ", re.MULTILINE)
+
+
+def _numbered(text: str) -> List[Tuple[int, str]]:
+    """
+    (n, text) of each "[n] text" block of an agent-loop prompt, in order.
+    """
+    marks = list(_EXCERPT_RE.finditer(text))
+    ends = [m.start() for m in marks[1:]] + [len(text)]
+    return [(int(m.group(1)), text[m.end() : end].strip()) for m, end in zip(marks, ends)]
+
+
+def _agent_loop_json(system: str, text: str) -> Optional[Dict[str, Any]]:
+    """
+    Plan, answer and critic responses for models/loop.py, recognised by the
+    JSON keys their system prompts ask for. Plans have one theme per excerpt;
+    answers quote the first excerpt verbatim; the critic flags "unknown"
+    answers only.
+    """
+    if '"themes"' in system:
+        themes = []
+        for _, excerpt in _numbered(text):
+            words = excerpt.split()
+            if len(words) >= 8:
+                topic = " ".join(words[:8])
+                themes.append({"title": " ".join(words[:6]), "questions": [f"What is said about: {topic}?"]})
+        return {"themes": themes}
+    if '"answer"' in system:
+        excerpts = _numbered(text.split("\n\nA reviewer flagged", 1)[0])
+        words = excerpts[0][1].split() if excerpts else []
+        if not words:
+            return {"answer": "unknown", "evidence": []}
+        return {"answer": " ".join(words[:40]), "evidence": [" ".join(words[:12])]}
+    if '"flags"' in system:
+        flags = [
+            {"section": n, "issue": "the evidence answers this question"}
+            for n, block in _numbered(text)
+            if "\nA: unknown" in block
+        ]
+        return {"flags": flags}
+    return None
+
+
+def echo_responder(body: Dict[str, Any]) -> str:
+    """
+    Deterministic completion content: the first words of the last message, or
+    a JSON object of summary sections when JSON output was requested (plan,
+    answer and critic objects for the agent loop's prompts).
+    """
+    messages = body.get("messages") or [{}]
+    text = messages[-1].get("content") or ""
+    words = text.split()
+    limit = min(int(body.get("max_tokens") or 200), 200)
+    summary = " ".join(words[:limit])
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        system = (messages[0].get("content") or "") if len(messages) > 1 else ""
+        loop_response = _agent_loop_json(system, text)
+        if loop_response is not None:
+            return json.dumps(loop_response)
+        sentences = [s.strip() for s in text.replace("\n", " ").split(". ") if len(s.split()) > 3]
+        return json.dumps(
+            {
+                "abstract": summary,
+                "outline": [s[:80] for s in sentences[:5]],
+                "quotes": [{"text": " ".join(s.split()[:20]), "timestamp": None} for s in sentences[:3]],
+                "q_and_a": [],
+                "keywords": sorted({w.lower() for w in words if len(w) > 7})[:8],
+            }
+        )
+    return summary
+
+
+class LocalBatchServer:
+    """
+    In-process HTTP server; `url` is the base URL to hand to `BatchAPI`.
+    `error_rate` deterministically fails that share of requests (by custom_id).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        complete_after_s: float = 0.5,
+        responder: Callable[[Dict[str, Any]], str] = echo_responder,
+        error_rate: float = 0.0,
+    ):
+        self.complete_after_s = complete_after_s
+        self.responder = responder
+        self.error_rate = error_rate
+        self.files: Dict[str, Tuple[str, bytes]] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "LocalBatchServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "LocalBatchServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- batch processing -----------------------------------------------------
+
+    def _fails(self, custom_id: str) -> bool:
+        if self.error_rate <= 0:
+            return False
+        digest = hashlib.sha1(custom_id.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2**32 < self.error_rate
+
+    def _answer(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        custom_id = item["custom_id"]
+        if self._fails(custom_id):
+            return {
+                "id": f"req_{uuid.uuid4().hex[:12]}",
+                "custom_id": custom_id,
+                "response": None,
+                "error": {"code": "server_error", "message": "simulated failure"},
+            }
+        body = item["body"]
+        content = self.responder(body)
+        prompt_tokens = sum(len((m.get("content") or "").split()) for m in body.get("messages", []))
+        completion = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content.split()),
+                "total_tokens": prompt_tokens + len(content.split()),
+            },
+        }
+        return {
+            "id": f"req_{uuid.uuid4().hex[:12]}",
+            "custom_id": custom_id,
+            "response": {"status_code": 200, "body": completion},
+            "error": None,
+        }
+
+    def _complete(self, batch_id: str) -> None:
+        time.sleep(self.complete_after_s)
+        with self._lock:
+            batch = self.batches[batch_id]
+            _, raw = self.files[batch["input_file_id"]]
+        items = [json.loads(line) for line in raw.decode("utf-8").splitlines() if line.strip()]
+        answers = [self._answer(item) for item in items]
+        ok = [a for a in answers if a["error"] is None]
+        failed = [a for a in answers if a["error"] is not None]
+        with self._lock:
+            for key, rows in (("output_file_id", ok), ("error_file_id", failed)):
+                if rows:
+                    file_id = f"file-{uuid.uuid4().hex[:24]}"
+                    data = "".join(json.dumps(r) + "\n" for r in rows).encode("utf-8")
+                    self.files[file_id] = ("batch_output", data)
+                    batch[key] = file_id
+            batch.update(
+                status="completed",
+                completed_at=int(time.time()),
+                request_counts={"total": len(items), "completed": len(ok), "failed": len(failed)},
+            )
+
+    def _create_batch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        batch = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": payload.get("endpoint"),
+            "input_file_id": payload["input_file_id"],
+            "completion_window": payload.get("completion_window", "24h"),
+            "status": "in_progress",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "metadata": payload.get("metadata"),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self._lock:
+            if payload["input_file_id"] not in self.files:
+                raise KeyError(payload["input_file_id"])
+            self.batches[batch_id] = batch
+        threading.Thread(target=self._complete, args=(batch_id,), daemon=True).start()
+        return dict(batch)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+                pass
+
+            def _send(self, status: int, payload: Any, raw: bool = False) -> None:
+                data = payload if raw else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_POST(self) -> None:
+                if self.path == "/v1/files":
+                    message = BytesParser(policy=HTTP).parsebytes(
+                        f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + self._body()
+                    )
+                    fields = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+                    data = fields["file"].get_payload(decode=True)
+                    purpose = fields["purpose"].get_content().strip()
+                    file_id = f"file-{uuid.uuid4().hex[:24]}"
+                    with server._lock:
+                        server.files[file_id] = (purpose, data)
+                    self._send(
+                        200,
+                        {
+                            "id": file_id,
+                            "object": "file",
+                            "bytes": len(data),
+                            "purpose": purpose,
+                            "filename": fields["file"].get_filename(),
+                        },
+                    )
+                elif self.path == "/v1/batches":
+                    try:
+                        self._send(200, server._create_batch(json.loads(self._body())))
+                    except KeyError as exc:
+                        self._send(404, {"error": {"message": f"No such file: {exc}"}})
+                else:
+                    self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+            def do_GET(self) -> None:
+                parts = self.path.strip("/").split("/")
+                with server._lock:
+                    if parts[:2] == ["v1", "batches"] and len(parts) == 3 and parts[2] in server.batches:
+                        self._send(200, dict(server.batches[parts[2]]))
+                    elif parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content" and parts[2] in server.files:
+                        self._send(200, server.files[parts[2]][1], raw=True)
+                    else:
+                        self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+        return Handler
@@ -0,0 +1,45 @@
+"""
+Content-addressed memo of summarizer calls, for incremental re-summarization.
+
+An entry is keyed by a hash of the summarizer model and the exact request the
+call would send (prompt, input text and generation parameters), so a group
+whose chunk texts are unchanged after re-ingest is served from the cache, and
+the final (reduce) call is too when none of its group summaries changed.
+Entries are small JSON files under `root`, written atomically; the cache is
+safe to share between processes and threads.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class SummaryCache:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    @staticmethod
+    def key(kind: str, model: Optional[str], request: Dict[str, Any]) -> str:
+        payload = json.dumps({"kind": kind, "model": model, "request": request}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry.get("value")
+
+    def put(self, key: str, value: Any, kind: str = "", model: Optional[str] = None) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        entry = {"kind": kind, "model": model, "created_at": int(time.time()), "value": value}
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
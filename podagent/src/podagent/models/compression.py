@@ -0,0 +1,206 @@
+"""
+Extractive pre-compression of map-phase inputs.
+
+Before a group of chunks is sent to the LLM in hierarchical mode, its
+sentences are scored locally and only the most central ones are kept, in
+transcript order, up to `keep_ratio` of the group's tokens. Filler, ads and
+crosstalk are short or off-topic and score low. Scoring methods:
+
+- "tfidf": mean TF-IDF cosine similarity of a sentence to the rest of the group.
+- "textrank": PageRank over the TF-IDF sentence-similarity graph.
+- "embedding": centrality of each sentence's chunk among the group's stored
+  chunk vectors (read back from the retriever index, not re-encoded), blended
+  with TF-IDF centrality to rank the sentences within a chunk.
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from podagent.retriever.bm25 import bm25_tokenize
+from podagent.utils import sentence_split
+
+from .usage import estimate_tokens
+
+METHODS = ("tfidf", "textrank", "embedding")
+
+
+@dataclass
+class CompressionStats:
+    method: str
+    keep_ratio: float
+    groups: int = 0
+    sentences_in: int = 0
+    sentences_out: int = 0
+    tokens_in: int = 0  # estimated tokens of the uncompressed group texts
+    tokens_out: int = 0
+    fallbacks: int = 0  # "embedding" groups scored lexically for lack of stored vectors
+
+    @property
+    def reduction(self) -> float:
+        return 1.0 - self.tokens_out / self.tokens_in if self.tokens_in else 0.0
+
+    def add(self, other: "CompressionStats") -> None:
+        self.groups += other.groups
+        self.sentences_in += other.sentences_in
+        self.sentences_out += other.sentences_out
+        self.tokens_in += other.tokens_in
+        self.tokens_out += other.tokens_out
+        self.fallbacks += other.fallbacks
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["reduction"] = round(self.reduction, 4)
+        return data
+
+
+def tfidf_matrix(sentences: Sequence[str]) -> np.ndarray:
+    """
+    L2-normalized TF-IDF rows (log-scaled term counts, smoothed IDF) with the
+    sentences themselves as the document collection.
+    """
+    vocab: Dict[str, int] = {}
+    docs = [[vocab.setdefault(t, len(vocab)) for t in bm25_tokenize(s)] for s in sentences]
+    counts = np.zeros((len(sentences), max(1, len(vocab))), dtype=np.float32)
+    for row, terms in enumerate(docs):
+        np.add.at(counts[row], terms, 1.0)
+    df = (counts > 0).sum(axis=0)
+    idf = np.log((1.0 + len(sentences)) / (1.0 + df)) + 1.0
+    weights = np.log1p(counts) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights / np.maximum(norms, 1e-12)
+
+
+def _similarity(x: np.ndarray) -> np.ndarray:
+    sim = x @ x.T
+    np.fill_diagonal(sim, 0.0)
+    return sim
+
+
+def tfidf_centrality(x: np.ndarray) -> np.ndarray:
+    n = x.shape[0]
+    if n < 2:
+        return np.ones(n, dtype=np.float32)
+    return _similarity(x).sum(axis=1) / (n - 1)
+
+
+def textrank(x: np.ndarray, damping: float = 0.85, max_iter: int = 100, tol: float = 1e-6) -> np.ndarray:
+    """
+    PageRank scores of the sentence graph weighted by TF-IDF cosine similarity.
+    """
+    n = x.shape[0]
+    if n < 2:
+        return np.ones(n, dtype=np.float32)
+    sim = _similarity(x)
+    out = sim.sum(axis=1, keepdims=True)
+    # Sentences with no similar neighbour link to every sentence equally.
+    transition = np.where(out > 0, sim / np.maximum(out, 1e-12), 1.0 / n)
+    ranks = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = (1.0 - damping) / n + damping * (transition.T @ ranks)
+        if np.abs(updated - ranks).sum() < tol:
+            return updated
+        ranks = updated
+    return ranks
+
+
+def _minmax(values: np.ndarray) -> np.ndarray:
+    spread = values.max() - values.min() if values.size else 0.0
+    return (values - values.min()) / spread if spread > 0 else np.ones_like(values)
+
+
+class ExtractiveCompressor:
+    """
+    Keeps the highest-scoring sentences of a chunk group within a token budget
+    of `keep_ratio` times the group's tokens. Sentences under
+    `min_sentence_words` words ("Yeah.", "Right, right.") are dropped, and
+    sentences repeated by overlapping chunk windows are kept once.
+    """
+
+    def __init__(
+        self,
+        method: str = "tfidf",
+        keep_ratio: float = 0.5,
+        min_sentence_words: int = 4,
+        damping: float = 0.85,
+    ):
+        if method not in METHODS:
+            raise ValueError(f"Unknown compression method {method!r}; expected one of: {', '.join(METHODS)}")
+        if not 0.0 < keep_ratio <= 1.0:
+            raise ValueError("keep_ratio must be in (0, 1].")
+        self.method = method
+        self.keep_ratio = keep_ratio
+        self.min_sentence_words = min_sentence_words
+        self.damping = damping
+
+    def score(
+        self,
+        sentences: Sequence[str],
+        owners: Sequence[int],
+        chunk_vectors: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Centrality of each sentence; `owners[i]` is the index of the chunk
+        sentence `i` came from (rows of `chunk_vectors`).
+        """
+        x = tfidf_matrix(sentences)
+        if self.method == "textrank":
+            return textrank(x, damping=self.damping)
+        lexical = tfidf_centrality(x)
+        if self.method == "embedding" and chunk_vectors is not None:
+            vecs = chunk_vectors / np.maximum(np.linalg.norm(chunk_vectors, axis=1, keepdims=True), 1e-12)
+            centroid = vecs.mean(axis=0)
+            chunk_scores = vecs @ (centroid / max(float(np.linalg.norm(centroid)), 1e-12))
+            return 0.5 * _minmax(chunk_scores)[np.asarray(owners)] + 0.5 * _minmax(lexical)
+        return lexical
+
+    def compress(
+        self,
+        chunks: Sequence[dict],
+        chunk_vectors: Optional[np.ndarray] = None,
+    ) -> Tuple[str, CompressionStats]:
+        """
+        Compressed text of one group (kept sentences in transcript order, one
+        paragraph per chunk) and its stats. `chunk_vectors` (one row per chunk)
+        is used by the "embedding" method; without it that method falls back
+        to TF-IDF centrality.
+        """
+        original = "\n\n".join(c["text"] for c in chunks)
+        stats = CompressionStats(self.method, self.keep_ratio, groups=1, tokens_in=estimate_tokens(original))
+        if self.method == "embedding" and chunk_vectors is None:
+            stats.fallbacks = 1
+
+        sentences: List[str] = []
+        owners: List[int] = []
+        seen = set()
+        for owner, chunk in enumerate(chunks):
+            for sentence in sentence_split(chunk["text"]):
+                stats.sentences_in += 1
+                key = " ".join(sentence.lower().split())
+                if key in seen or len(sentence.split()) < self.min_sentence_words:
+                    continue
+                seen.add(key)
+                sentences.append(sentence)
+                owners.append(owner)
+        if not sentences:
+            stats.tokens_out = stats.tokens_in
+            return original, stats
+
+        scores = self.score(sentences, owners, chunk_vectors)
+        budget = self.keep_ratio * stats.tokens_in
+        kept: List[int] = []
+        used = 0
+        for i in np.argsort(-scores, kind="stable"):
+            tokens = estimate_tokens(sentences[i])
+            if kept and used + tokens > budget:
+                continue
+            kept.append(int(i))
+            used += tokens
+
+        paragraphs: Dict[int, List[str]] = {}
+        for i in sorted(kept):
+            paragraphs.setdefault(owners[i], []).append(sentences[i])
+        text = "\n\n".join(" ".join(paragraphs[owner]) for owner in sorted(paragraphs))
+        stats.sentences_out = len(kept)
+        stats.tokens_out = estimate_tokens(text)
+        return text, stats
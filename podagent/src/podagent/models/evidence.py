@@ -0,0 +1,38 @@
+"""
+Compact references to the transcript chunks a summary is grounded in.
+
+Outputs carry (episode_id, chunk_id, span, score) instead of whole chunk dicts;
+the text is resolved on demand from the chunk files (the backend serves it at
+`/chunks/{episode_id}/{chunk_id}`).
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from podagent.retriever import RetrievalResult
+
+
+@dataclass(frozen=True, slots=True)
+class EvidenceRef:
+    episode_id: str
+    chunk_id: int
+    span: Optional[Tuple[int, int]]  # character offsets of the chunk in the cleaned transcript
+    score: float
+
+    @classmethod
+    def from_chunk(cls, chunk: Dict[str, Any], score: float) -> "EvidenceRef":
+        start, end = chunk.get("char_start"), chunk.get("char_end")
+        span = (int(start), int(end)) if start is not None and end is not None else None
+        return cls(chunk.get("episode_id"), chunk.get("chunk_id"), span, float(score))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "episode_id": self.episode_id,
+            "chunk_id": self.chunk_id,
+            "span": list(self.span) if self.span else None,
+            "score": round(self.score, 4),
+        }
+
+
+def evidence_refs(results: Iterable["RetrievalResult"]) -> List[EvidenceRef]:
+    return [EvidenceRef.from_chunk(r.chunk, r.score) for r in results]
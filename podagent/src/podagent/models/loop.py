@@ -0,0 +1,496 @@
+"""
+Planner, retriever and critic loop for `PodcastSummarizer` (agentic mode).
+
+1. Plan: one call over an evenly spaced sample of the episode returns themes,
+   each with a few sub-questions.
+2. Retrieve: all sub-questions are retrieved in one batch (a single encoder
+   batch with an index, BM25 over the episode's chunks without one).
+3. Answer: one call per sub-question over its evidence, `LoopBudget.workers` at a time.
+4. Critique: one call checks every answer against its evidence; snippets not
+   found in the transcript index are flagged as well. Only flagged sections
+   are re-retrieved and re-answered, then critiqued again, until the critic
+   passes or `critic_rounds` is reached.
+5. Synthesize: one call writes the abstract from the final answers.
+
+A `LoopBudget` caps calls, tokens and wall time for the whole run. Calls are
+reserved before they are sent (prompt estimate plus `max_tokens`), so a step
+that would overrun is trimmed or skipped rather than started, and the abstract
+call is always kept in reserve.
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from podagent.tracing import span
+
+from .evidence import evidence_refs
+from .usage import estimate_tokens
+
+if TYPE_CHECKING:  # pragma: no cover
+    from podagent.data_pipeline.transcript_index import TranscriptIndex
+    from podagent.retriever import RetrievalResult
+
+    from .agent import PodcastSummarizer, SummaryOutput
+
+
+@dataclass
+class LoopBudget:
+    max_calls: int = 24
+    max_tokens: int = 120_000  # prompt + completion tokens over the whole run
+    max_seconds: float = 180.0
+    critic_rounds: int = 2
+    workers: int = 4  # concurrent sub-question calls; independent of PodcastSummarizer.map_workers
+
+
+@dataclass
+class Section:
+    theme: str
+    question: str
+    evidence: List["RetrievalResult"] = field(default_factory=list)
+    answer: str = ""
+    snippets: List[str] = field(default_factory=list)
+    revisions: int = 0
+
+
+class _Spend:
+    """
+    Thread-safe running total against a `LoopBudget`. `reserve` books a call
+    at its worst-case token cost; `settle` replaces that with the actual cost.
+    """
+
+    def __init__(self, budget: LoopBudget):
+        self.budget = budget
+        self.started = time.monotonic()
+        self.calls = 0
+        self.tokens = 0
+        self.failed = 0
+        self.exhausted: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def seconds(self) -> float:
+        return time.monotonic() - self.started
+
+    def reserve(self, tokens: int, keep_calls: int = 0, keep_tokens: int = 0) -> bool:
+        """
+        Book one call of up to `tokens` if it fits while leaving `keep_calls`
+        calls and `keep_tokens` tokens for later steps.
+        """
+        with self._lock:
+            if self.seconds >= self.budget.max_seconds:
+                self.exhausted = self.exhausted or "max_seconds"
+            elif self.calls + 1 + keep_calls > self.budget.max_calls:
+                self.exhausted = self.exhausted or "max_calls"
+            elif self.tokens + tokens + keep_tokens > self.budget.max_tokens:
+                self.exhausted = self.exhausted or "max_tokens"
+            else:
+                self.calls += 1
+                self.tokens += tokens
+                return True
+            return False
+
+    def settle(self, reserved: int, actual: int) -> None:
+        with self._lock:
+            self.tokens += actual - reserved
+
+    def fail(self) -> None:
+        with self._lock:
+            self.failed += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "failed": self.failed, "tokens": self.tokens, "seconds": round(self.seconds, 2)}
+
+
+def _excerpt(text: str, max_words: int) -> str:
+    words = text.split()
+    return " ".join(words[:max_words]) + (" ..." if len(words) > max_words else "")
+
+
+def _strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, list):
+        return [v.strip() for v in value if isinstance(v, str) and v.strip()]
+    return []
+
+
+class AgentLoop:
+    """
+    One agentic run over an episode with `agent`'s summarizer (which must
+    provide `chat`/`chat_json`) and retriever, within `budget`.
+    """
+
+    def __init__(
+        self,
+        agent: "PodcastSummarizer",
+        budget: Optional[LoopBudget] = None,
+        max_themes: int = 5,
+        questions_per_theme: int = 2,
+        evidence_k: int = 3,
+        plan_sample_chunks: int = 16,
+        answer_max_tokens: int = 400,
+        critic_max_tokens: int = 600,
+    ):
+        if not hasattr(agent.summarizer, "chat_json"):
+            raise ValueError("Agentic mode needs a summarizer with chat/chat_json (an LLM provider).")
+        self.agent = agent
+        self.summarizer = agent.summarizer
+        self.budget = budget or LoopBudget()
+        self.max_themes = max_themes
+        self.questions_per_theme = questions_per_theme
+        self.evidence_k = evidence_k
+        self.plan_sample_chunks = plan_sample_chunks
+        self.answer_max_tokens = answer_max_tokens
+        self.critic_max_tokens = critic_max_tokens
+
+    def run(
+        self,
+        episode_id: str,
+        chunks: Sequence[dict],
+        query: Optional[str] = None,
+        speaker: Optional[str] = None,
+        interim_dir: Optional[Path] = None,
+        target_words: int = 700,
+        verify_quotes: bool = True,
+    ) -> "SummaryOutput":
+        from .agent import load_transcript_index
+
+        spend = _Spend(self.budget)
+        index = load_transcript_index(episode_id, interim_dir) if verify_quotes else None
+        synthesis_tokens = self._synthesis_reserve(target_words)
+        stats: Dict[str, Any] = {"rounds": 0, "flagged": [], "revised": 0, "stopped": "max_rounds"}
+
+        with span("agent_loop", episode_id=episode_id) as sp:
+            sections, stats["plan_source"] = self.plan(chunks, query, spend, synthesis_tokens)
+            results = self.retrieve([s.question for s in sections], episode_id, chunks, speaker, self.evidence_k)
+            for section, evidence in zip(sections, results):
+                section.evidence = evidence
+            self.answer(sections, spend, synthesis_tokens)
+
+            for round_no in range(1, self.budget.critic_rounds + 1):
+                answered = [i for i, s in enumerate(sections) if s.answer]
+                if not answered:
+                    stats["stopped"] = "no_answers"
+                    break
+                flags = self.critique(sections, answered, index, spend, synthesis_tokens)
+                if flags is None:
+                    stats["stopped"] = "critic_skipped"
+                    break
+                stats["rounds"] = round_no
+                stats["flagged"].append(len(flags))
+                if not flags:
+                    stats["stopped"] = "critic_passed"
+                    break
+                flagged = [sections[i] for i in sorted(flags)]
+                # Widen retrieval for flagged sections, again as a single batch.
+                results = self.retrieve(
+                    [s.question for s in flagged], episode_id, chunks, speaker, 2 * self.evidence_k
+                )
+                for section, evidence in zip(flagged, results):
+                    section.evidence = evidence
+                stats["revised"] += self.answer(
+                    flagged, spend, synthesis_tokens, issues=[flags[i] for i in sorted(flags)]
+                )
+            if spend.exhausted and stats["stopped"] != "critic_passed":
+                stats["stopped"] = f"budget:{spend.exhausted}"
+
+            abstract = self.synthesize(sections, spend, target_words)
+            stats.update(
+                themes=len({s.theme for s in sections}),
+                questions=len(sections),
+                answered=sum(1 for s in sections if s.answer),
+                spent=spend.to_dict(),
+                budget=asdict(self.budget),
+            )
+            sp.set(**{k: v for k, v in stats.items() if k not in ("budget", "spent", "flagged")}, **spend.to_dict())
+        return self.compose(episode_id, sections, abstract, stats, interim_dir, verify_quotes)
+
+    def _call(
+        self,
+        spend: _Spend,
+        kind: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        json_object: bool,
+        keep_calls: int = 0,
+        keep_tokens: int = 0,
+    ) -> Tuple[bool, Any]:
+        """
+        Reserve and make one call. Returns (sent, response); a call that does
+        not fit the budget is not sent, and a failed one returns None.
+        """
+        reserved = sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+        if not spend.reserve(reserved, keep_calls, keep_tokens):
+            return False, None
+        return True, self._send(spend, reserved, kind, messages, max_tokens, json_object)
+
+    def _send(
+        self,
+        spend: _Spend,
+        reserved: int,
+        kind: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        json_object: bool,
+    ) -> Any:
+        ledger = getattr(self.summarizer, "ledger", None)
+        response: Any = None
+        actual = reserved
+        with span(f"agent_loop.{kind}") as sp:
+            try:
+                if ledger is not None:
+                    with ledger.scope() as call_ledger:
+                        response = self._request(kind, messages, max_tokens, json_object)
+                    totals = call_ledger.summary()["totals"]
+                    actual = totals["prompt_tokens"] + totals["completion_tokens"]
+                else:
+                    response = self._request(kind, messages, max_tokens, json_object)
+                    actual = reserved - max_tokens + estimate_tokens(str(response))
+            except Exception as exc:
+                # A failed step degrades the summary (fallback plan, missing answer) instead of failing the run.
+                sp.set(error=str(exc))
+                spend.fail()
+        spend.settle(reserved, actual)
+        return response
+
+    def _request(self, kind: str, messages: List[Dict[str, str]], max_tokens: int, json_object: bool) -> Any:
+        if json_object:
+            return self.summarizer.chat_json(messages, kind=kind, max_tokens=max_tokens)
+        return self.summarizer.chat(messages, kind=kind, max_tokens=max_tokens)
+
+    def _synthesis_reserve(self, target_words: int) -> int:
+        # Notes for the abstract: about one short answer per planned question.
+        notes = self.max_themes * self.questions_per_theme * 80
+        return notes + 200 + int(target_words * 1.5)
+
+    def plan(
+        self,
+        chunks: Sequence[dict],
+        query: Optional[str],
+        spend: _Spend,
+        keep_tokens: int,
+    ) -> Tuple[List[Section], str]:
+        """
+        Themes and sub-questions from the planner call, or from the sampled
+        chunks' opening sentences if the call is skipped or unusable.
+        """
+        step = max(1, len(chunks) // self.plan_sample_chunks)
+        sample = list(chunks[::step])[: self.plan_sample_chunks]
+        excerpts = "\n\n".join(f"[{i + 1}] {_excerpt(c['text'], 150)}" for i, c in enumerate(sample))
+        system = (
+            "You plan a study summary of a podcast episode from evenly spaced transcript excerpts. "
+            f"Return ONLY JSON: {{\"themes\": [{{\"title\": str, \"questions\": [str, ...]}}, ...]}} with up to "
+            f"{self.max_themes} themes in episode order and up to {self.questions_per_theme} specific questions per "
+            "theme that the transcript itself answers. Titles are at most 8 words."
+        )
+        focus = f"Focus of the summary: {query}\n\n" if query else ""
+        messages = [{"role": "system", "content": system}, {"role": "user", "content": f"{focus}Excerpts:\n{excerpts}"}]
+        _, data = self._call(spend, "plan", messages, 600, True, keep_calls=1, keep_tokens=keep_tokens)
+
+        sections: List[Section] = []
+        for theme in (data or {}).get("themes") or []:
+            if not isinstance(theme, dict) or not str(theme.get("title") or "").strip():
+                continue
+            for question in _strings(theme.get("questions"))[: self.questions_per_theme]:
+                sections.append(Section(str(theme["title"]).strip(), question))
+            if len({s.theme for s in sections}) >= self.max_themes:
+                break
+        if sections:
+            return sections, "llm"
+        titles = self.agent._generate_outline(sample[:: max(1, len(sample) // self.max_themes)], self.max_themes)
+        fallback = [Section(_excerpt(t, 8), f"What is discussed about: {_excerpt(t, 20)}") for t in titles if t]
+        return fallback, "fallback"
+
+    def retrieve(
+        self,
+        questions: Sequence[str],
+        episode_id: str,
+        chunks: Sequence[dict],
+        speaker: Optional[str],
+        k: int,
+    ) -> List[List["RetrievalResult"]]:
+        """
+        Evidence for every question in one batch: through the agent's
+        retriever when it has one, else BM25 over this episode's chunks.
+        """
+        if not questions:
+            return []
+        from podagent.retriever import RetrievalResult
+
+        with span("agent_loop.retrieve", questions=len(questions), k=k):
+            retriever = self.agent.retriever
+            if retriever is not None:
+                return retriever.search_many(questions, k=k, speaker=speaker, episode_id=episode_id)
+            from podagent.retriever.bm25 import BM25Index
+
+            bm25 = BM25Index.build([c["text"] for c in chunks])
+            return [[RetrievalResult(chunk=chunks[i], score=s) for i, s in bm25.top_k(q, k)] for q in questions]
+
+    def answer(
+        self,
+        sections: Sequence[Section],
+        spend: _Spend,
+        keep_tokens: int,
+        issues: Optional[Sequence[str]] = None,
+    ) -> int:
+        """
+        Answer (or, with `issues`, revise) `sections` concurrently; returns
+        how many were answered. Sections that do not fit the budget keep
+        their previous answer.
+        """
+        system = (
+            "Answer the question using only the transcript excerpts. Return ONLY JSON: "
+            '{"answer": "2-4 sentences", "evidence": ["verbatim transcript snippet of at most 20 words", ...]} '
+            "with 1-3 evidence snippets copied exactly. If the excerpts do not answer it, answer \"unknown\"."
+        )
+        jobs = []
+        for i, section in enumerate(sections):
+            excerpts = "\n\n".join(f"[{j + 1}] {r.chunk['text']}" for j, r in enumerate(section.evidence))
+            user = f"Question: {section.question}\n\nExcerpts:\n{excerpts}"
+            if issues is not None:
+                user += f"\n\nA reviewer flagged the previous answer: {issues[i]}\nPrevious answer: {section.answer}"
+            messages = [{"role": "system", "content": system}, {"role": "user", "content": user}]
+            reserved = sum(estimate_tokens(m["content"]) for m in messages) + self.answer_max_tokens
+            # Book every call before any is sent so the batch cannot overrun together.
+            if spend.reserve(reserved, keep_calls=1, keep_tokens=keep_tokens):
+                jobs.append((section, messages, reserved))
+
+        def one(job: Tuple[Section, List[Dict[str, str]], int]) -> Any:
+            _, messages, reserved = job
+            return self._send(spend, reserved, "answer", messages, self.answer_max_tokens, True)
+
+        workers = min(max(1, self.budget.workers), len(jobs))
+        if workers <= 1:
+            responses = [one(job) for job in jobs]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            from contextvars import copy_context
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(copy_context().run, one, job) for job in jobs]
+                responses = [f.result() for f in futures]
+
+        answered = 0
+        for (section, _, _), data in zip(jobs, responses):
+            text = str((data or {}).get("answer") or "").strip()
+            if not text:
+                continue
+            section.answer = text
+            section.snippets = _strings((data or {}).get("evidence"))[:3]
+            section.revisions += issues is not None
+            answered += 1
+        return answered
+
+    def critique(
+        self,
+        sections: Sequence[Section],
+        answered: Sequence[int],
+        index: Optional["TranscriptIndex"],
+        spend: _Spend,
+        keep_tokens: int,
+    ) -> Optional[Dict[int, str]]:
+        """
+        Issues by section index: evidence snippets the transcript index cannot
+        find, plus what the critic call flags. When the critic call does not
+        fit the budget or fails, only the local flags; None if there are none
+        either (the loop then stops revising).
+        """
+        flags: Dict[int, str] = {}
+        if index is not None:
+            for i in answered:
+                missing = [s for s in sections[i].snippets if not index.verify(s).verified]
+                if missing:
+                    flags[i] = f"evidence not found in the transcript: {missing[0]!r}"
+
+        blocks = []
+        for i in answered:
+            section = sections[i]
+            evidence = " | ".join(_excerpt(r.chunk["text"], 120) for r in section.evidence)
+            blocks.append(f"[{i}] Q: {section.question}\nA: {section.answer}\nEvidence: {evidence}")
+        system = (
+            "You review answers about a podcast transcript against the evidence given with each. Flag an answer "
+            "only if it states something the evidence does not support, misses the question, or says 'unknown' "
+            "although the evidence answers it. Return ONLY JSON: "
+            '{"flags": [{"section": <number in brackets>, "issue": "what to fix"}]}, '
+            "with an empty list when every answer is supported."
+        )
+        messages = [{"role": "system", "content": system}, {"role": "user", "content": "\n\n".join(blocks)}]
+        sent, data = self._call(
+            spend, "critic", messages, self.critic_max_tokens, True, keep_calls=1, keep_tokens=keep_tokens
+        )
+        if not sent or data is None:
+            return flags or None
+        for flag in data.get("flags") or []:
+            if not isinstance(flag, dict):
+                continue
+            try:
+                i = int(flag.get("section"))
+            except (TypeError, ValueError):
+                continue
+            if i in answered and i not in flags:
+                flags[i] = str(flag.get("issue") or "unsupported by the evidence")
+        return flags
+
+    def synthesize(self, sections: Sequence[Section], spend: _Spend, target_words: int) -> str:
+        """
+        Abstract written from the answered sections; their answers joined by
+        theme when the call is over budget or fails.
+        """
+        notes: Dict[str, List[str]] = {}
+        for section in sections:
+            if section.answer and section.answer.lower() != "unknown":
+                notes.setdefault(section.theme, []).append(f"- {section.question} {section.answer}")
+        if not notes:
+            return ""
+        text = "\n\n".join(f"{theme}\n" + "\n".join(lines) for theme, lines in notes.items())
+        system = (
+            f"Write an abstract of about {target_words} words of a podcast episode from these research notes, "
+            "theme by theme in separate paragraphs. Use only facts in the notes."
+        )
+        messages = [{"role": "system", "content": system}, {"role": "user", "content": text}]
+        _, abstract = self._call(spend, "synthesize", messages, int(target_words * 1.5), False)
+        if abstract:
+            return abstract
+        return "\n\n".join(" ".join(line[2:] for line in lines) for lines in notes.values())
+
+    def compose(
+        self,
+        episode_id: str,
+        sections: Sequence[Section],
+        abstract: str,
+        stats: Dict[str, Any],
+        interim_dir: Optional[Path],
+        verify_quotes: bool,
+    ) -> "SummaryOutput":
+        from .agent import SummaryOutput
+
+        outline = list(dict.fromkeys(s.theme for s in sections if s.answer)) or list(
+            dict.fromkeys(s.theme for s in sections)
+        )
+        q_and_a = [
+            {"question": s.question, "answer": s.answer, "evidence": list(s.snippets)} for s in sections if s.answer
+        ]
+        quotes = [{"text": snippet, "timestamp": None} for s in sections for snippet in s.snippets[:1]][:6]
+        out = {"abstract": abstract, "outline": outline, "quotes": quotes, "q_and_a": q_and_a}
+        verification = self.agent._verify_snippets(out, episode_id, interim_dir, verify_quotes)
+
+        evidence: Dict[Any, "RetrievalResult"] = {}
+        for section in sections:
+            for result in section.evidence:
+                key = (result.chunk.get("episode_id"), result.chunk.get("chunk_id"))
+                if key not in evidence or result.score > evidence[key].score:
+                    evidence[key] = result
+        answers = "\n\n".join(s.answer for s in sections if s.answer)
+        return SummaryOutput(
+            episode_id=episode_id,
+            abstract=abstract,
+            outline=outline,
+            quotes=out["quotes"],
+            q_and_a=out["q_and_a"],
+            keywords=self.agent._extract_keywords(answers or abstract),
+            evidence=evidence_refs(sorted(evidence.values(), key=lambda r: -r.score)),
+            verification=verification,
+            loop=stats,
+        )
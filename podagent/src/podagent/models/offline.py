@@ -0,0 +1,460 @@
+"""
+Offline summarization through provider batch APIs.
+
+`OfflineSummaryJob` writes every map (group summary) request for a set of
+episodes as one batch JSONL job, submits it, polls until the provider is done,
+ingests the results, then does the same for the reduce (final summary)
+requests and stitches the responses into `SummaryOutput`s with the agent's
+usual post-processing. Batch endpoints are slower but cheaper and have higher
+quotas, which suits nightly re-summarization of the archive.
+
+Job state lives in a directory (job.json plus the request/result JSONL of each
+stage), so a job can be advanced step by step from cron and survives restarts.
+`BatchAPI` speaks the OpenAI-compatible REST batch API that OpenAI and
+Together expose, and that `LocalBatchServer` stands in for in tests.
+"""
+import json
+import os
+import time
+import uuid
+import urllib.error
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from podagent import config
+from podagent.tracing import span
+from podagent.utils import read_jsonl, write_jsonl
+
+from .agent import PodcastSummarizer, SummaryOutput, load_chunks_for_episode, summary_to_dict
+from .evidence import evidence_refs
+from .usage import UsageLedger
+
+ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchAPI:
+    """
+    Minimal client for the OpenAI-compatible files + batches REST API.
+    """
+
+    def __init__(self, base_url: str, api_key: str, file_purpose: str = "batch", timeout: float = 60.0):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.file_purpose = file_purpose
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: Optional[bytes] = None, content_type: Optional[str] = None) -> bytes:
+        req = urllib.request.Request(f"{self.base_url}{path}", data=body, method=method)
+        req.add_header("Authorization", f"Bearer {self.api_key}")
+        if content_type:
+            req.add_header("Content-Type", content_type)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return resp.read()
+        except urllib.error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", errors="replace")[:500]
+            raise RuntimeError(f"{method} {path} failed with HTTP {exc.code}: {detail}") from exc
+
+    def _json(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        return json.loads(self._request(method, path, body, "application/json" if body else None))
+
+    def upload(self, path: Path) -> str:
+        boundary = uuid.uuid4().hex
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="purpose"\r\n\r\n{self.file_purpose}\r\n'.encode(),
+            (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{path.name}"\r\n'
+                "Content-Type: application/jsonl\r\n\r\n"
+            ).encode(),
+            path.read_bytes(),
+            f"\r\n--{boundary}--\r\n".encode(),
+        ]
+        reply = self._request("POST", "/files", b"".join(parts), f"multipart/form-data; boundary={boundary}")
+        return json.loads(reply)["id"]
+
+    def create(self, input_file_id: str, metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        payload = {"input_file_id": input_file_id, "endpoint": ENDPOINT, "completion_window": "24h"}
+        if metadata:
+            payload["metadata"] = metadata
+        return self._json("POST", "/batches", payload)
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        return self._json("GET", f"/batches/{batch_id}")
+
+    def content(self, file_id: str) -> bytes:
+        return self._request("GET", f"/files/{file_id}/content")
+
+    @classmethod
+    def for_summarizer(cls, summarizer, base_url: Optional[str] = None) -> "BatchAPI":
+        """
+        Batch client for the summarizer's provider, or for `base_url` (e.g. a
+        `LocalBatchServer`) when given.
+        """
+        env = getattr(summarizer, "api_key_env", None)
+        api_key = os.getenv(env) if env else None
+        if base_url is None:
+            base_url = getattr(summarizer, "batch_base_url", None)
+            if base_url is None:
+                raise ValueError(f"{type(summarizer).__name__} has no batch API.")
+            if not api_key:
+                raise RuntimeError(f"{env} environment variable is not set.")
+        return cls(base_url, api_key or "local", getattr(summarizer, "batch_file_purpose", "batch"))
+
+
+def _status(batch: Dict[str, Any]) -> str:
+    # Together reports upper-case states.
+    return str(batch.get("status", "")).lower()
+
+
+def parse_results(raw: bytes) -> Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    custom_id -> (chat-completion body, error) from a batch output or error file.
+    """
+    results: Dict[str, Tuple[Optional[Dict[str, Any]], Optional[str]]] = {}
+    for line in raw.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        response = item.get("response") or {}
+        body = response.get("body") if isinstance(response, dict) else None
+        error = item.get("error")
+        status = response.get("status_code", 200) if isinstance(response, dict) else 200
+        if error or body is None or status >= 400:
+            message = (error or {}).get("message") if isinstance(error, dict) else error
+            results[item["custom_id"]] = (None, str(message or f"HTTP {status}: {json.dumps(body)[:300]}"))
+        else:
+            results[item["custom_id"]] = (body, None)
+    return results
+
+
+def _content(body: Dict[str, Any]) -> str:
+    return ((body.get("choices") or [{}])[0].get("message") or {}).get("content") or ""
+
+
+def _usage(body: Dict[str, Any]) -> SimpleNamespace:
+    usage = body.get("usage") or {}
+    return SimpleNamespace(
+        usage=SimpleNamespace(
+            prompt_tokens=usage.get("prompt_tokens", 0), completion_tokens=usage.get("completion_tokens", 0)
+        )
+    )
+
+
+class OfflineSummaryJob:
+    """
+    A two-stage (map, reduce) batch job over a set of episodes, persisted in
+    `job_dir`. Non-hierarchical jobs skip the map stage. `advance` moves the job
+    one step (prepare + submit, poll, or ingest); `run` loops until done.
+    """
+
+    def __init__(self, job_dir: Path, agent: PodcastSummarizer, api: BatchAPI):
+        self.job_dir = job_dir
+        self.agent = agent
+        self.api = api
+        self.state = json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    @property
+    def state_path(self) -> Path:
+        return self.job_dir / "job.json"
+
+    @classmethod
+    def create(
+        cls,
+        job_dir: Path,
+        agent: PodcastSummarizer,
+        api: BatchAPI,
+        episode_ids: Sequence[str],
+        interim_dir: Optional[Path] = None,
+        query: Optional[str] = None,
+        speaker: Optional[str] = None,
+        hierarchical: bool = True,
+        group_size: int = 8,
+        structured: bool = False,
+        intermediate_min_words: int = 180,
+        intermediate_max_words: int = 300,
+        final_target_words: int = 700,
+        final_max_tokens: int = 1800,
+        verify_quotes: bool = True,
+        compress: Optional[str] = None,
+        compress_ratio: float = 0.5,
+    ) -> "OfflineSummaryJob":
+        job_dir.mkdir(parents=True, exist_ok=True)
+        state = {
+            "model": getattr(agent.summarizer, "model", None),
+            "episodes": list(episode_ids),
+            "options": {
+                "interim_dir": str(interim_dir) if interim_dir else None,
+                "query": query,
+                "speaker": speaker,
+                "hierarchical": hierarchical,
+                "group_size": group_size,
+                "structured": structured,
+                "intermediate_min_words": intermediate_min_words,
+                "intermediate_max_words": intermediate_max_words,
+                "final_target_words": final_target_words,
+                "final_max_tokens": final_max_tokens,
+                "verify_quotes": verify_quotes,
+                "compress": compress,
+                "compress_ratio": compress_ratio,
+            },
+            "stage": "map" if hierarchical else "reduce",
+            "batches": {},
+            "failed": {},
+            "compression": {},
+        }
+        (job_dir / "job.json").write_text(json.dumps(state, indent=2), encoding="utf-8")
+        return cls(job_dir, agent, api)
+
+    def _save(self) -> None:
+        tmp = self.state_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    def _path(self, stage: str, kind: str) -> Path:
+        return self.job_dir / f"{stage}.{kind}.jsonl"
+
+    @property
+    def interim_dir(self) -> Optional[Path]:
+        value = self.state["options"]["interim_dir"]
+        return Path(value) if value else None
+
+    def _live_episodes(self) -> List[str]:
+        return [e for e in self.state["episodes"] if e not in self.state["failed"]]
+
+    # -- request preparation --------------------------------------------------
+
+    def _map_requests(self) -> List[Dict[str, Any]]:
+        opts = self.state["options"]
+        summarizer = self.agent.summarizer
+        requests = []
+        for episode_id in self._live_episodes():
+            chunks = load_chunks_for_episode(episode_id, interim_dir=self.interim_dir)
+            if not chunks:
+                self.state["failed"][episode_id] = f"No chunks found for episode_id={episode_id}"
+                continue
+            texts, compression = self.agent.map_inputs(
+                episode_id, chunks, opts["group_size"], opts.get("compress"), opts.get("compress_ratio", 0.5)
+            )
+            if compression is not None:
+                self.state.setdefault("compression", {})[episode_id] = compression.to_dict()
+            for i, text in enumerate(texts):
+                body = summarizer.summarize_request(
+                    text, max_length=opts["intermediate_max_words"], min_length=opts["intermediate_min_words"]
+                )
+                requests.append({"custom_id": f"{episode_id}|map|{i}", "body": body})
+        return requests
+
+    def _reduce_requests(self) -> List[Dict[str, Any]]:
+        opts = self.state["options"]
+        summarizer = self.agent.summarizer
+        structured = self.agent.wants_structured(opts["structured"])
+        group_summaries = self._group_summaries() if opts["hierarchical"] else {}
+        contexts: Dict[str, Dict[str, Any]] = {}
+        requests = []
+        for episode_id in self._live_episodes():
+            chunks = load_chunks_for_episode(episode_id, interim_dir=self.interim_dir)
+            if not chunks:
+                self.state["failed"][episode_id] = f"No chunks found for episode_id={episode_id}"
+                continue
+            if opts["hierarchical"]:
+                summaries = group_summaries.get(episode_id, [])
+                context = list(chunks[: self.agent.max_context_chunks])
+                final_input = "\n\n".join(summaries)
+            else:
+                summaries = None
+                context = self.agent._select_context(
+                    chunks, episode_id=episode_id, query=opts["query"], speaker=opts["speaker"]
+                )
+                final_input = "\n\n".join(c["text"] for c in context)
+            contexts[episode_id] = {"context": context, "final_input": final_input, "group_summaries": summaries}
+            if structured:
+                body = summarizer.structured_request(
+                    final_input, target_words=opts["final_target_words"], max_tokens=opts["final_max_tokens"]
+                )
+                body["response_format"] = {"type": "json_object"}
+            else:
+                target = opts["final_target_words"]
+                body = summarizer.summarize_request(final_input, max_length=target, min_length=target // 2)
+            requests.append({"custom_id": f"{episode_id}|reduce", "body": body})
+        (self.job_dir / "reduce.context.json").write_text(json.dumps(contexts, ensure_ascii=False), encoding="utf-8")
+        return requests
+
+    def _group_summaries(self) -> Dict[str, List[str]]:
+        """
+        Map results per episode, in group order; episodes with a failed group
+        are marked failed.
+        """
+        results = parse_results(self._path("map", "results").read_bytes())
+        by_episode: Dict[str, List[Tuple[int, str]]] = {}
+        for custom_id, (body, error) in results.items():
+            episode_id, _, index = custom_id.split("|")
+            if error is not None:
+                self.state["failed"].setdefault(episode_id, f"map group {index}: {error}")
+                continue
+            by_episode.setdefault(episode_id, []).append((int(index), _content(body).strip()))
+        expected: Dict[str, int] = {}
+        for item in read_jsonl(self._path("map", "requests")):
+            episode_id = item["custom_id"].split("|")[0]
+            expected[episode_id] = expected.get(episode_id, 0) + 1
+        for episode_id, count in expected.items():
+            if len(by_episode.get(episode_id, [])) != count and episode_id not in self.state["failed"]:
+                self.state["failed"][episode_id] = "missing map results"
+        return {
+            e: [text for _, text in sorted(groups) if text]
+            for e, groups in by_episode.items()
+            if e not in self.state["failed"]
+        }
+
+    # -- stage steps ----------------------------------------------------------
+
+    def submit(self) -> Optional[Dict[str, Any]]:
+        """
+        Write the current stage's request JSONL and submit it as a batch. Returns
+        None (and moves on) when the stage has nothing to send.
+        """
+        stage = self.state["stage"]
+        requests = self._map_requests() if stage == "map" else self._reduce_requests()
+        path = self._path(stage, "requests")
+        write_jsonl(path, [{"custom_id": r["custom_id"], "method": "POST", "url": ENDPOINT, "body": r["body"]} for r in requests])
+        if not requests:
+            self.state["stage"] = "reduce" if stage == "map" else "done"
+            self._save()
+            return None
+        with span("offline.submit", stage=stage, requests=len(requests)):
+            file_id = self.api.upload(path)
+            batch = self.api.create(file_id, metadata={"job": self.job_dir.name, "stage": stage})
+        self.state["batches"][stage] = batch
+        self._save()
+        return batch
+
+    def poll(self) -> str:
+        stage = self.state["stage"]
+        batch = self.api.retrieve(self.state["batches"][stage]["id"])
+        self.state["batches"][stage] = batch
+        self._save()
+        return _status(batch)
+
+    def ingest(self) -> Optional[List[SummaryOutput]]:
+        """
+        Download the finished stage's results. After the map stage this moves
+        on to reduce; after reduce it writes and returns the summaries.
+        """
+        stage = self.state["stage"]
+        batch = self.state["batches"][stage]
+        if _status(batch) != "completed":
+            raise RuntimeError(f"{stage} batch {batch.get('id')} ended as {batch.get('status')}: {batch.get('errors')}")
+        raw = b""
+        for key in ("output_file_id", "error_file_id"):
+            if batch.get(key):
+                raw += self.api.content(batch[key])
+                if not raw.endswith(b"\n"):
+                    raw += b"\n"
+        self._path(stage, "results").write_bytes(raw)
+        if stage == "map":
+            self.state["stage"] = "reduce"
+            self._save()
+            return None
+        outputs = self._stitch()
+        self.state["stage"] = "done"
+        self._save()
+        return outputs
+
+    def _stitch(self) -> List[SummaryOutput]:
+        opts = self.state["options"]
+        structured = self.agent.wants_structured(opts["structured"])
+        summarizer = self.agent.summarizer
+        ledger = getattr(summarizer, "ledger", None)
+        model = self.state["model"] or "unknown"
+        contexts = json.loads((self.job_dir / "reduce.context.json").read_text(encoding="utf-8"))
+        results = parse_results(self._path("reduce", "results").read_bytes())
+        if self._path("map", "results").exists():
+            map_results = parse_results(self._path("map", "results").read_bytes())
+        else:
+            map_results = {}
+
+        out_dir = self.job_dir / "outputs"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        outputs: List[SummaryOutput] = []
+        for episode_id in self._live_episodes():
+            body, error = results.get(f"{episode_id}|reduce", (None, "missing reduce result"))
+            if error is not None:
+                self.state["failed"][episode_id] = f"reduce: {error}"
+                continue
+            try:
+                content = _content(body)
+                final = summarizer.parse_structured(content) if structured else content.strip()
+            except Exception as exc:
+                self.state["failed"][episode_id] = f"reduce: {exc}"
+                continue
+            ctx = contexts[episode_id]
+            result = self.agent.compose(
+                episode_id,
+                final,
+                ctx["context"],
+                ctx["final_input"],
+                ctx["group_summaries"],
+                self.interim_dir,
+                opts["verify_quotes"],
+            )
+            if not opts["hierarchical"] and self.agent.retriever and opts["query"]:
+                result.evidence = evidence_refs(
+                    self.agent.retriever.search(
+                        opts["query"], k=self.agent.max_context_chunks, speaker=opts["speaker"], episode_id=episode_id
+                    )
+                )
+            # Batch calls are billed at the discounted rate; latency is not per call.
+            episode_ledger = UsageLedger(prices=ledger.prices if ledger is not None else None)
+            calls = [(cid, b) for cid, (b, _) in map_results.items() if cid.startswith(f"{episode_id}|") and b]
+            calls.append((f"{episode_id}|reduce", body))
+            for custom_id, call_body in calls:
+                kind = "summarize_structured" if custom_id.endswith("|reduce") and structured else "summarize"
+                episode_ledger.record(
+                    model, f"batch_{kind}", _usage(call_body), 0.0, price_factor=config.BATCH_PRICE_FACTOR
+                )
+            if ledger is not None:
+                ledger.extend(episode_ledger.calls)
+            result.usage = episode_ledger.summary()
+            result.compression = self.state.get("compression", {}).get(episode_id)
+            (out_dir / f"{episode_id}.json").write_text(
+                json.dumps(summary_to_dict(result), ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            outputs.append(result)
+        return outputs
+
+    def advance(self) -> str:
+        """
+        Take one step without waiting: submit the current stage if it has no
+        batch yet, else poll it and ingest it once it has finished. Returns
+        a short description of the job's state afterwards.
+        """
+        stage = self.state["stage"]
+        if stage == "done":
+            return "done"
+        if stage not in self.state["batches"]:
+            batch = self.submit()
+            return f"{stage}: nothing to submit" if batch is None else f"{stage}: submitted {batch['id']}"
+        status = self.poll()
+        if status in TERMINAL_STATES:
+            self.ingest()
+            return f"{stage}: ingested ({status})"
+        counts = self.state["batches"][stage].get("request_counts") or {}
+        return f"{stage}: {status} {counts}"
+
+    def run(self, poll_interval: float = 30.0, timeout: Optional[float] = None) -> str:
+        """
+        Advance until the job is done, sleeping `poll_interval` between polls.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            message = self.advance()
+            if self.state["stage"] == "done":
+                return message
+            if "submitted" in message or "ingested" in message or "nothing" in message:
+                continue
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Batch job {self.job_dir} not done after {timeout}s ({message})")
+            time.sleep(poll_interval)
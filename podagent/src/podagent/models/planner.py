@@ -0,0 +1,247 @@
+"""
+Strategy planner for `PodcastSummarizer` auto mode.
+
+Given an episode's token count, the model's context window and a simple
+latency/cost model, choose between:
+
+- "single_pass": the whole (de-overlapped) transcript in one long-context call;
+- "map_reduce": N group summaries (run `map_workers` at a time), then one
+  final call over all of them;
+- "tree_reduce": as map_reduce, but the group summaries are merged `fan_in`
+  at a time over several levels until they fit one final call.
+
+Every feasible candidate is estimated (calls, tokens, latency, cost) and the
+best under the chosen objective wins; `reason` says why in one line.
+"""
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from podagent import config
+
+STRATEGIES = ("single_pass", "map_reduce", "tree_reduce")
+
+# Chunks per group tried for map_reduce / tree_reduce.
+GROUP_SIZES = (1, 2, 3, 4, 6, 8, 12, 16, 24, 32, 48, 64)
+
+# (latency weight, cost weight); each is relative to the best candidate on that axis.
+OBJECTIVES = {"balanced": (1.0, 1.0), "latency": (1.0, 0.25), "cost": (0.25, 1.0)}
+
+WORDS_TO_TOKENS = 1.35
+
+
+@dataclass
+class StrategyPlan:
+    strategy: str
+    group_size: int = 0
+    num_groups: int = 0
+    fan_in: int = 0  # tree_reduce: summaries merged per intermediate reduce call
+    levels: int = 1  # reduce levels after the map phase
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_s: float = 0.0
+    cost_usd: Optional[float] = None
+    reason: str = ""
+    alternatives: List[Dict[str, Any]] = field(default_factory=list)
+
+    def describe(self) -> str:
+        shape = "" if self.strategy == "single_pass" else f" ({self.num_groups} groups of {self.group_size} chunks"
+        if self.strategy == "tree_reduce":
+            shape += f", fan-in {self.fan_in}, {self.levels} reduce levels"
+        shape += ")" if shape else ""
+        cost = "" if self.cost_usd is None else f", ${self.cost_usd:.4f}"
+        return f"{self.strategy}{shape}: {self.calls} calls, ~{self.latency_s:.0f}s{cost}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class StrategyPlanner:
+    """
+    `max_single_pass_tokens` caps the one-call strategy below the context
+    window (recall over very long prompts degrades); `max_group_tokens` and
+    `max_reduce_tokens` cap map and reduce inputs the same way. Only
+    `headroom` of the window is planned for, leaving room for estimate error.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        context_window: Optional[int] = None,
+        prices: Optional[Dict[str, Dict[str, float]]] = None,
+        latency: Optional[Dict[str, float]] = None,
+        map_workers: int = 1,
+        objective: str = "balanced",
+        max_single_pass_tokens: int = 32_000,
+        max_group_tokens: int = 6_000,
+        max_reduce_tokens: int = 12_000,
+        headroom: float = 0.9,
+    ):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {objective!r}; expected one of: {', '.join(OBJECTIVES)}")
+        self.model = model
+        self.context_window = context_window or config.MODEL_CONTEXT_WINDOWS.get(model or "", config.DEFAULT_CONTEXT_WINDOW)
+        self.prices = prices if prices is not None else config.MODEL_PRICES
+        self.latency = dict(config.PLANNER_LATENCY, **(latency or {}))
+        self.map_workers = max(1, map_workers)
+        self.objective = objective
+        self.max_single_pass_tokens = max_single_pass_tokens
+        self.max_group_tokens = max_group_tokens
+        self.max_reduce_tokens = max_reduce_tokens
+        self.headroom = headroom
+
+    def call_latency(self, prompt_tokens: float, completion_tokens: float) -> float:
+        lat = self.latency
+        return (
+            lat["overhead_s"]
+            + prompt_tokens / lat["prompt_tokens_per_s"]
+            + completion_tokens / lat["completion_tokens_per_s"]
+        )
+
+    def cost(self, prompt_tokens: float, completion_tokens: float) -> Optional[float]:
+        price = self.prices.get(self.model or "")
+        if price is None:
+            return None
+        return (prompt_tokens * price["prompt"] + completion_tokens * price["completion"]) / 1_000_000
+
+    def prompt_limit(self, completion_tokens: int) -> int:
+        return int(self.headroom * self.context_window) - completion_tokens
+
+    def _finish(self, plan: StrategyPlan) -> StrategyPlan:
+        plan.cost_usd = self.cost(plan.prompt_tokens, plan.completion_tokens)
+        plan.latency_s = round(plan.latency_s, 2)
+        return plan
+
+    def _single_pass(self, episode_tokens: int, final_overhead: int, final_output: int) -> Optional[StrategyPlan]:
+        prompt = episode_tokens + final_overhead
+        if prompt > min(self.prompt_limit(final_output), self.max_single_pass_tokens + final_overhead):
+            return None
+        return self._finish(
+            StrategyPlan(
+                "single_pass",
+                calls=1,
+                prompt_tokens=prompt,
+                completion_tokens=final_output,
+                latency_s=self.call_latency(prompt, final_output),
+            )
+        )
+
+    def _grouped(
+        self,
+        chunk_tokens: Sequence[int],
+        group_size: int,
+        map_overhead: int,
+        map_output: int,
+        final_overhead: int,
+        final_output: int,
+    ) -> Optional[StrategyPlan]:
+        groups = [sum(chunk_tokens[i : i + group_size]) for i in range(0, len(chunk_tokens), group_size)]
+        largest = max(groups)
+        if group_size > 1 and largest > min(self.max_group_tokens, self.prompt_limit(map_output) - map_overhead):
+            return None
+        n = len(groups)
+        if n < 2:
+            return None
+        calls = n
+        prompt = sum(groups) + n * map_overhead
+        completion = n * map_output
+        latency = math.ceil(n / self.map_workers) * self.call_latency(largest + map_overhead, map_output)
+
+        reduce_cap = min(self.max_reduce_tokens, self.prompt_limit(final_output) - final_overhead)
+        fan_in = max(2, reduce_cap // max(map_output, 1))
+        levels = 1
+        remaining = n
+        while remaining * map_output > reduce_cap:
+            merged = math.ceil(remaining / fan_in)
+            batch_in = min(fan_in, remaining) * map_output + map_overhead
+            calls += merged
+            prompt += remaining * map_output + merged * map_overhead
+            completion += merged * map_output
+            latency += math.ceil(merged / self.map_workers) * self.call_latency(batch_in, map_output)
+            remaining = merged
+            levels += 1
+
+        final_prompt = remaining * map_output + final_overhead
+        calls += 1
+        prompt += final_prompt
+        completion += final_output
+        latency += self.call_latency(final_prompt, final_output)
+        return self._finish(
+            StrategyPlan(
+                "tree_reduce" if levels > 1 else "map_reduce",
+                group_size=group_size,
+                num_groups=n,
+                fan_in=fan_in if levels > 1 else 0,
+                levels=levels,
+                calls=calls,
+                prompt_tokens=prompt,
+                completion_tokens=completion,
+                latency_s=latency,
+            )
+        )
+
+    def plan(
+        self,
+        chunk_tokens: Sequence[int],
+        episode_tokens: int,
+        map_overhead: int,
+        map_output: int,
+        final_overhead: int,
+        final_output: int,
+    ) -> StrategyPlan:
+        """
+        Best plan for an episode whose chunks have `chunk_tokens` tokens each
+        (overlapping windows counted in full, as the map phase sends them) and
+        whose de-overlapped transcript is `episode_tokens`. Overheads are the
+        prompt tokens a map/final request adds around its input; outputs are
+        the expected completion tokens of each.
+        """
+        if not chunk_tokens:
+            raise ValueError("Cannot plan a strategy for an episode without chunks.")
+        candidates: List[StrategyPlan] = []
+        single = self._single_pass(episode_tokens, final_overhead, final_output)
+        if single is not None:
+            candidates.append(single)
+        for group_size in GROUP_SIZES:
+            if group_size > 1 and group_size >= len(chunk_tokens):
+                break
+            plan = self._grouped(chunk_tokens, group_size, map_overhead, map_output, final_overhead, final_output)
+            if plan is not None:
+                candidates.append(plan)
+        if not candidates:
+            # A single chunk exceeds every limit; nothing smaller can be planned.
+            return self._finish(
+                StrategyPlan(
+                    "single_pass",
+                    calls=1,
+                    prompt_tokens=episode_tokens + final_overhead,
+                    completion_tokens=final_output,
+                    latency_s=self.call_latency(episode_tokens + final_overhead, final_output),
+                    reason=f"~{episode_tokens} tokens and no strategy fits the limits; sending it in one call",
+                )
+            )
+
+        best_latency = min(c.latency_s for c in candidates) or 1e-9
+        priced = all(c.cost_usd is not None for c in candidates)
+        cost_of = (lambda c: c.cost_usd) if priced else (lambda c: c.prompt_tokens + c.completion_tokens)
+        best_cost = min(cost_of(c) for c in candidates) or 1e-9
+        latency_weight, cost_weight = OBJECTIVES[self.objective]
+        ranked = sorted(
+            candidates,
+            key=lambda c: latency_weight * c.latency_s / best_latency + cost_weight * cost_of(c) / best_cost,
+        )
+        best = ranked[0]
+
+        why = [f"~{episode_tokens} tokens in {len(chunk_tokens)} chunks, {self.context_window}-token window"]
+        if single is None:
+            limit = min(self.prompt_limit(final_output) - final_overhead, self.max_single_pass_tokens)
+            why.append(f"too long for one call (limit ~{limit} tokens)")
+        why.append(f"{self.objective} objective picks {best.describe()}")
+        if len(ranked) > 1:
+            why.append(f"next best {ranked[1].describe()}")
+        best.reason = "; ".join(why)
+        best.alternatives = [
+            {k: v for k, v in c.to_dict().items() if k not in ("reason", "alternatives")} for c in ranked[1:4]
+        ]
+        return best
@@ -0,0 +1,318 @@
+"""
+Registry of summarizer providers, selected by name from the scripts
+(`--mode`) and the backend (`provider`).
+
+Besides the real APIs ("openai", "together") there are three providers for
+running the pipeline without spending money or network time:
+
+- "fake": a deterministic local chat client with a configurable latency
+  distribution, token rate and error rate, for load tests and benchmarks.
+- "record": a real provider whose responses are also appended to a cassette
+  (JSONL) file.
+- "replay": serves the responses captured in a cassette, keyed by request.
+
+Fake, record and replay plug a different client into the existing summarizer
+classes, so prompts, usage accounting and tracing are exactly those of a real
+run.
+"""
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .summarizer import BaseSummarizer, OpenAISummarizer, TogetherSummarizer
+from .usage import UsageLedger, estimate_tokens
+
+
+ProviderFactory = Callable[..., BaseSummarizer]
+
+_PROVIDERS: Dict[str, ProviderFactory] = {}
+
+# Summarizer classes whose prompts the local providers reuse (`prompts=`).
+PROMPT_STYLES = {"openai": OpenAISummarizer, "together": TogetherSummarizer}
+
+
+def register_provider(name: str) -> Callable[[ProviderFactory], ProviderFactory]:
+    """
+    Decorator registering `factory(model, ledger, **options)` under `name`.
+    `model` is None when the caller did not choose one.
+    """
+
+    def decorator(factory: ProviderFactory) -> ProviderFactory:
+        _PROVIDERS[name] = factory
+        return factory
+
+    return decorator
+
+
+def available_providers() -> List[str]:
+    return list(_PROVIDERS)
+
+
+def create_summarizer(
+    name: str,
+    model: Optional[str] = None,
+    ledger: Optional[UsageLedger] = None,
+    **options: Any,
+) -> BaseSummarizer:
+    factory = _PROVIDERS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown provider {name!r}; expected one of: {', '.join(_PROVIDERS)}")
+    return factory(model, ledger, **options)
+
+
+def parse_provider_options(pairs: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """
+    `KEY=VALUE` strings (from `--provider-option`) to keyword options; values
+    are parsed as JSON when possible (numbers, booleans), else kept as strings.
+    """
+    options: Dict[str, Any] = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Provider options must look like KEY=VALUE, got {pair!r}")
+        try:
+            options[key.replace("-", "_")] = json.loads(value)
+        except ValueError:
+            options[key.replace("-", "_")] = value
+    return options
+
+
+def _prompt_class(prompts: str):
+    cls = PROMPT_STYLES.get(prompts)
+    if cls is None:
+        raise ValueError(f"Unknown prompt style {prompts!r}; expected one of: {', '.join(PROMPT_STYLES)}")
+    return cls
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """
+    Stable key of a chat-completions request. The model name is left out so a
+    cassette can be replayed under any model name.
+    """
+    payload = {k: v for k, v in request.items() if k != "model"}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _response(content: str, prompt_tokens: int, completion_tokens: int, model: Optional[str]) -> SimpleNamespace:
+    """
+    Chat-completions response shaped like the SDKs' objects.
+    """
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(index=0, message=SimpleNamespace(role="assistant", content=content), finish_reason="stop")],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        ),
+    )
+
+
+class _ChatClient:
+    """
+    Minimal stand-in for an SDK client: `client.chat.completions.create(**request)`.
+    """
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request: Any) -> Any:
+        raise NotImplementedError
+
+
+class FakeProviderError(RuntimeError):
+    pass
+
+
+class FakeChatClient(_ChatClient):
+    """
+    Deterministic local chat client. Each call takes a lognormal time-to-first-
+    token (median `latency_ms`, shape `latency_jitter`) plus the completion
+    tokens at `tokens_per_s`, and fails with probability `error_rate`. Draws
+    are seeded by `seed`, the request and how often that request has been
+    seen, so a run is reproducible and a retried request can succeed. With
+    `sleep=False` the latency is only reported, not waited out.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 800.0,
+        latency_jitter: float = 0.4,
+        tokens_per_s: float = 80.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        sleep: bool = True,
+        responder: Optional[Callable[[Dict[str, Any]], str]] = None,
+    ):
+        super().__init__()
+        if responder is None:
+            from .batch_server import echo_responder
+
+            responder = echo_responder
+        self.latency_ms = latency_ms
+        self.latency_jitter = latency_jitter
+        self.tokens_per_s = tokens_per_s
+        self.error_rate = error_rate
+        self.seed = seed
+        self.sleep = sleep
+        self.responder = responder
+        self.simulated_s = 0.0
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def create(self, **request: Any) -> SimpleNamespace:
+        key = request_key(request)
+        with self._lock:
+            attempt = self._seen.get(key, 0)
+            self._seen[key] = attempt + 1
+        rng = random.Random(f"{self.seed}:{key}:{attempt}")
+
+        first_token_s = rng.lognormvariate(math.log(max(self.latency_ms, 1e-3) / 1000.0), self.latency_jitter)
+        if rng.random() < self.error_rate:
+            self._wait(first_token_s)
+            raise FakeProviderError(f"Simulated provider error (request {key[:12]}, attempt {attempt + 1})")
+
+        content = self.responder(request)
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in request.get("messages", []))
+        completion_tokens = estimate_tokens(content)
+        self._wait(first_token_s + completion_tokens / max(self.tokens_per_s, 1e-6))
+        return _response(content, prompt_tokens, completion_tokens, request.get("model"))
+
+    def _wait(self, seconds: float) -> None:
+        with self._lock:
+            self.simulated_s += seconds
+        if self.sleep:
+            time.sleep(seconds)
+
+
+class RecordingChatClient(_ChatClient):
+    """
+    Passes calls to `inner` and appends each request's key, response content,
+    usage and latency to the cassette at `path`. `prompts` names the prompt
+    style of the recorded requests, which replay needs to rebuild them.
+    """
+
+    def __init__(self, inner: Any, path: Path, prompts: Optional[str] = None):
+        super().__init__()
+        self.inner = inner
+        self.path = Path(path)
+        self.prompts = prompts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def create(self, **request: Any) -> Any:
+        started = time.perf_counter()
+        resp = self.inner.chat.completions.create(**request)
+        usage = getattr(resp, "usage", None)
+        entry = {
+            "key": request_key(request),
+            "model": request.get("model"),
+            "prompts": self.prompts,
+            "request": request,
+            "content": resp.choices[0].message.content or "",
+            "prompt_tokens": int(getattr(usage, "prompt_tokens", 0) or 0),
+            "completion_tokens": int(getattr(usage, "completion_tokens", 0) or 0),
+            "latency_s": round(time.perf_counter() - started, 3),
+        }
+        with self._lock, self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return resp
+
+
+class ReplayChatClient(_ChatClient):
+    """
+    Serves responses from a cassette written by `RecordingChatClient`. A
+    request that was never recorded raises; with `realtime` the recorded
+    latency is slept to reproduce the original timing.
+    """
+
+    def __init__(self, path: Path, realtime: bool = False):
+        super().__init__()
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"No cassette at {self.path}; record one with --mode record.")
+        self.realtime = realtime
+        self.entries: Dict[str, dict] = {}
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.entries[entry["key"]] = entry
+
+    def _first(self, field: str) -> Optional[str]:
+        return next((e[field] for e in self.entries.values() if e.get(field)), None)
+
+    @property
+    def model(self) -> Optional[str]:
+        return self._first("model")
+
+    @property
+    def prompts(self) -> Optional[str]:
+        return self._first("prompts")
+
+    def create(self, **request: Any) -> SimpleNamespace:
+        key = request_key(request)
+        entry = self.entries.get(key)
+        if entry is None:
+            raise RuntimeError(
+                f"No recorded response for request {key[:12]} in {self.path}; "
+                "prompts or options changed since it was recorded."
+            )
+        if self.realtime:
+            time.sleep(entry.get("latency_s") or 0.0)
+        return _response(entry["content"], entry["prompt_tokens"], entry["completion_tokens"], request.get("model"))
+
+
+@register_provider("openai")
+def _openai(model: Optional[str], ledger: Optional[UsageLedger]) -> BaseSummarizer:
+    return OpenAISummarizer(model=model or "gpt-4o", ledger=ledger)
+
+
+@register_provider("together")
+def _together(model: Optional[str], ledger: Optional[UsageLedger]) -> BaseSummarizer:
+    return TogetherSummarizer(model=model or "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo", ledger=ledger)
+
+
+@register_provider("fake")
+def _fake(model: Optional[str], ledger: Optional[UsageLedger], prompts: str = "openai", **options: Any) -> BaseSummarizer:
+    return _prompt_class(prompts)(model=model or "fake", ledger=ledger, client=FakeChatClient(**options))
+
+
+@register_provider("record")
+def _record(
+    model: Optional[str],
+    ledger: Optional[UsageLedger],
+    cassette: Optional[str] = None,
+    provider: str = "openai",
+    **options: Any,
+) -> BaseSummarizer:
+    if not cassette:
+        raise ValueError("The record provider needs a cassette path (--cassette).")
+    if provider in ("record", "replay"):
+        raise ValueError("The record provider must wrap a real or fake provider.")
+    summarizer = create_summarizer(provider, model=model, ledger=ledger, **options)
+    prompts = next((name for name, cls in PROMPT_STYLES.items() if isinstance(summarizer, cls)), None)
+    summarizer.client = RecordingChatClient(summarizer.client, Path(cassette), prompts=prompts)
+    return summarizer
+
+
+@register_provider("replay")
+def _replay(
+    model: Optional[str],
+    ledger: Optional[UsageLedger],
+    cassette: Optional[str] = None,
+    prompts: Optional[str] = None,
+    realtime: bool = False,
+) -> BaseSummarizer:
+    if not cassette:
+        raise ValueError("The replay provider needs a cassette path (--cassette).")
+    client = ReplayChatClient(Path(cassette), realtime=realtime)
+    # Default to the recorded model and prompts so requests match and usage is priced as recorded.
+    cls = _prompt_class(prompts or client.prompts or "openai")
+    return cls(model=model or client.model or "replay", ledger=ledger, client=client)
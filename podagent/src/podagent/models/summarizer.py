@@ -1,10 +1,17 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 import json
 import os
 import sys
+import time
+
+from podagent.tracing import span
+
+from .usage import UsageLedger
 
 
 class BaseSummarizer:
+    ledger: Optional[UsageLedger] = None
+
     def summarize(self, text: str, max_length: int = 256, min_length: int = 64) -> str:
         raise NotImplementedError
 
@@ -15,22 +22,42 @@ class TogetherSummarizer(BaseSummarizer):
     Requires TOGETHER_API_KEY in the environment.
     """
 
-    def __init__(self, model: str = "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo"):
-        try:
-            from together import Together
-        except Exception as exc:  # pragma: no cover - optional dependency
-            raise ImportError(
-                "together is required for TogetherSummarizer. Install with `pip install together`."
-            ) from exc
+    # OpenAI-compatible batch API used by models/offline.py.
+    batch_base_url = "https://api.together.xyz/v1"
+    batch_file_purpose = "batch-api"
+    api_key_env = "TOGETHER_API_KEY"
 
-        api_key = os.getenv("TOGETHER_API_KEY")
-        if not api_key:
-            raise RuntimeError("TOGETHER_API_KEY environment variable is not set.")
+    def __init__(
+        self,
+        model: str = "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo",
+        ledger: Optional[UsageLedger] = None,
+        client: Optional[Any] = None,
+    ):
+        """
+        `client` replaces the Together SDK client (anything with
+        `chat.completions.create`); see models/providers.py.
+        """
+        if client is None:
+            try:
+                from together import Together
+            except Exception as exc:  # pragma: no cover - optional dependency
+                raise ImportError(
+                    "together is required for TogetherSummarizer. Install with `pip install together`."
+                ) from exc
+
+            api_key = os.getenv("TOGETHER_API_KEY")
+            if not api_key:
+                raise RuntimeError("TOGETHER_API_KEY environment variable is not set.")
+            client = Together(api_key=api_key)
 
         self.model = model
-        self.client = Together(api_key=api_key)
+        self.client = client
+        self.ledger = ledger or UsageLedger()
 
-    def summarize(self, text: str, max_length: int = 220, min_length: int = 80) -> str:
+    def summarize_request(self, text: str, max_length: int = 220, min_length: int = 80) -> Dict[str, Any]:
+        """
+        Chat-completions request body for `summarize`.
+        """
         prompt = (
             "You are summarizing a podcast transcript snippet. "
             "Write a detailed summary in roughly three paragraphs, totaling about 500 words. "
@@ -38,33 +65,77 @@ class TogetherSummarizer(BaseSummarizer):
             "Transcript:\n"
             f"{text}"
         )
-        resp = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=1200,
-        )
-        return (resp.choices[0].message.content or "").strip()
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3,
+            "max_tokens": 1200,
+        }
 
-    def _parse_json_object(self, content: str) -> Dict[str, Any]:
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            start = content.find("{")
-            end = content.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                return json.loads(content[start : end + 1])
-            raise
+    def summarize(self, text: str, max_length: int = 220, min_length: int = 80) -> str:
+        request = self.summarize_request(text, max_length=max_length, min_length=min_length)
+        with span("summarize", model=self.model, input_chars=len(text)) as sp:
+            started = time.perf_counter()
+            resp = self.client.chat.completions.create(**request)
+            rec = self.ledger.record(self.model, "summarize", resp, time.perf_counter() - started)
+            sp.set(prompt_tokens=rec.prompt_tokens, completion_tokens=rec.completion_tokens)
+        return (resp.choices[0].message.content or "").strip()
 
-    def summarize_structured(
+    def chat(
         self,
-        text: str,
-        target_words: int = 500,
-        max_tokens: int = 3000,
-    ) -> Dict[str, Any]:
-        if not text.strip():
-            return {"abstract": "", "outline": [], "quotes": [], "q_and_a": [], "keywords": []}
+        messages: List[Dict[str, str]],
+        kind: str = "chat",
+        max_tokens: int = 800,
+        json_object: bool = False,
+    ) -> str:
+        """
+        One free-form chat call (the agent loop's plan, answer and critic
+        steps), recorded in the ledger under `kind`.
+        """
+        request = {"model": self.model, "messages": messages, "temperature": 0.3, "max_tokens": max_tokens}
+        with span(kind, model=self.model) as sp:
+            started = time.perf_counter()
+            if json_object:
+                try:
+                    resp = self.client.chat.completions.create(**request, response_format={"type": "json_object"})
+                except TypeError:
+                    resp = self.client.chat.completions.create(**request)
+            else:
+                resp = self.client.chat.completions.create(**request)
+            rec = self.ledger.record(self.model, kind, resp, time.perf_counter() - started)
+            sp.set(prompt_tokens=rec.prompt_tokens, completion_tokens=rec.completion_tokens)
+        return (resp.choices[0].message.content or "").strip()
+
+    def chat_json(self, messages: List[Dict[str, str]], kind: str = "chat", max_tokens: int = 800) -> Dict[str, Any]:
+        """
+        `chat` asking for a JSON object; raises ValueError if none can be parsed.
+        """
+        content = self.chat(messages, kind=kind, max_tokens=max_tokens, json_object=True)
+        try:
+            data = self._parse_json_object(content)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{kind} response is not JSON: {exc}") from exc
+        if not isinstance(data, dict):
+            raise ValueError(f"{kind} response is not a JSON object.")
+        return data
 
+    def _parse_json_object(self, content: str) -> Dict[str, Any]:
+        with span("parse_json", chars=len(content)) as sp:
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError:
+                sp.set(fallback=True)
+                start = content.find("{")
+                end = content.rfind("}")
+                if start != -1 and end != -1 and end > start:
+                    return json.loads(content[start : end + 1])
+                raise
+
+    def structured_request(self, text: str, target_words: int = 500, max_tokens: int = 3000) -> Dict[str, Any]:
+        """
+        Chat-completions request body for `summarize_structured` (without
+        `response_format`, which is sent when the client supports it).
+        """
         system = (
         "You are a rigorous podcast summarizer. You MUST stay grounded in the transcript. "
         "Do not invent facts, numbers, names, or claims. If something is not explicitly in the transcript, "
@@ -93,8 +164,7 @@ class TogetherSummarizer(BaseSummarizer):
         "- Output ONLY JSON. No markdown, no extra text.\n"
         "- Use straight quotes in JSON strings. Ensure valid escaping.\n"
         )
-        print(f"system: {system}")
-        request = {
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": system},
@@ -104,20 +174,43 @@ class TogetherSummarizer(BaseSummarizer):
             "max_tokens": max_tokens,
         }
 
-        try:
-            resp = self.client.chat.completions.create(
-                **request,
-                response_format={"type": "json_object"},
-            )
+    def summarize_structured(
+        self,
+        text: str,
+        target_words: int = 500,
+        max_tokens: int = 3000,
+    ) -> Dict[str, Any]:
+        if not text.strip():
+            return {"abstract": "", "outline": [], "quotes": [], "q_and_a": [], "keywords": []}
 
+        request = self.structured_request(text, target_words=target_words, max_tokens=max_tokens)
+        print(f"system: {request['messages'][0]['content']}")
+
+        with span("summarize_structured", model=self.model, input_chars=len(text)) as sp:
+            started = time.perf_counter()
+            try:
+                resp = self.client.chat.completions.create(
+                    **request,
+                    response_format={"type": "json_object"},
+                )
 
-        except TypeError:
-            resp = self.client.chat.completions.create(**request)
+
+            except TypeError:
+                resp = self.client.chat.completions.create(**request)
+            rec = self.ledger.record(self.model, "summarize_structured", resp, time.perf_counter() - started)
+            sp.set(prompt_tokens=rec.prompt_tokens, completion_tokens=rec.completion_tokens)
 
         content = (resp.choices[0].message.content or "").strip()
         print(f"response: {content}")
         if os.getenv("PODAGENT_DEBUG_TOGETHER_RESPONSE") == "1":
             print(f"[podagent] Together response:\n{content}", file=sys.stderr)
+        return self.parse_structured(content)
+
+    def parse_structured(self, content: str) -> Dict[str, Any]:
+        """
+        Sections of a structured-summary response.
+        """
+        content = content.strip()
         if not content:
             raise RuntimeError("Together returned empty content for structured summary.")
 
@@ -143,17 +236,32 @@ class OpenAISummarizer(BaseSummarizer):
     Requires OPENAI_API_KEY in the environment.
     """
 
-    def __init__(self, model: str = "gpt-5"):
-        try:
-            from openai import OpenAI
-        except Exception as exc:  # pragma: no cover - optional dependency
-            raise ImportError(
-                "openai package is required for OpenAISummarizer. Install with `pip install openai`."
-            ) from exc
+    # Batch API used by models/offline.py.
+    batch_base_url = "https://api.openai.com/v1"
+    batch_file_purpose = "batch"
+    api_key_env = "OPENAI_API_KEY"
+
+    def __init__(self, model: str = "gpt-5", ledger: Optional[UsageLedger] = None, client: Optional[Any] = None):
+        """
+        `client` replaces the OpenAI SDK client (anything with
+        `chat.completions.create`); see models/providers.py.
+        """
+        if client is None:
+            try:
+                from openai import OpenAI
+            except Exception as exc:  # pragma: no cover - optional dependency
+                raise ImportError(
+                    "openai package is required for OpenAISummarizer. Install with `pip install openai`."
+                ) from exc
+            client = OpenAI()
         self.model = model
-        self.client = OpenAI()
+        self.client = client
+        self.ledger = ledger or UsageLedger()
 
-    def summarize(self, text: str, max_length: int = 220, min_length: int = 80) -> str:
+    def summarize_request(self, text: str, max_length: int = 220, min_length: int = 80) -> Dict[str, Any]:
+        """
+        Chat-completions request body for `summarize`.
+        """
         prompt = (
             "You are summarizing a podcast transcript snippet. "
             "Write a detailed summary in roughly three paragraphs, totaling about 500 words. "
@@ -161,37 +269,78 @@ class OpenAISummarizer(BaseSummarizer):
             "Transcript:\n"
             f"{text}"
         )
-        resp = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=1200,
-        )
-        return (resp.choices[0].message.content or "").strip()
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3,
+            "max_tokens": 1200,
+        }
 
-    def _parse_json_object(self, content: str) -> Dict[str, Any]:
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            # Common failure mode: JSON wrapped in markdown fences or extra text.
-            start = content.find("{")
-            end = content.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                return json.loads(content[start : end + 1])
-            raise
+    def summarize(self, text: str, max_length: int = 220, min_length: int = 80) -> str:
+        request = self.summarize_request(text, max_length=max_length, min_length=min_length)
+        with span("summarize", model=self.model, input_chars=len(text)) as sp:
+            started = time.perf_counter()
+            resp = self.client.chat.completions.create(**request)
+            rec = self.ledger.record(self.model, "summarize", resp, time.perf_counter() - started)
+            sp.set(prompt_tokens=rec.prompt_tokens, completion_tokens=rec.completion_tokens)
+        return (resp.choices[0].message.content or "").strip()
 
-    def summarize_structured(
+    def chat(
         self,
-        text: str,
-        target_words: int = 1000,
-        max_tokens: int = 10000,
-    ) -> Dict[str, Any]:
+        messages: List[Dict[str, str]],
+        kind: str = "chat",
+        max_tokens: int = 800,
+        json_object: bool = False,
+    ) -> str:
         """
-        Ask the model to return a structured JSON with abstract, outline, quotes, q_and_a, and keywords.
+        One free-form chat call (the agent loop's plan, answer and critic
+        steps), recorded in the ledger under `kind`.
         """
-        if not text.strip():
-            return {"abstract": "", "outline": [], "quotes": [], "q_and_a": [], "keywords": []}
+        request = {"model": self.model, "messages": messages, "temperature": 0.3, "max_tokens": max_tokens}
+        with span(kind, model=self.model) as sp:
+            started = time.perf_counter()
+            if json_object:
+                try:
+                    resp = self.client.chat.completions.create(**request, response_format={"type": "json_object"})
+                except TypeError:
+                    resp = self.client.chat.completions.create(**request)
+            else:
+                resp = self.client.chat.completions.create(**request)
+            rec = self.ledger.record(self.model, kind, resp, time.perf_counter() - started)
+            sp.set(prompt_tokens=rec.prompt_tokens, completion_tokens=rec.completion_tokens)
+        return (resp.choices[0].message.content or "").strip()
 
+    def chat_json(self, messages: List[Dict[str, str]], kind: str = "chat", max_tokens: int = 800) -> Dict[str, Any]:
+        """
+        `chat` asking for a JSON object; raises ValueError if none can be parsed.
+        """
+        content = self.chat(messages, kind=kind, max_tokens=max_tokens, json_object=True)
+        try:
+            data = self._parse_json_object(content)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{kind} response is not JSON: {exc}") from exc
+        if not isinstance(data, dict):
+            raise ValueError(f"{kind} response is not a JSON object.")
+        return data
+
+    def _parse_json_object(self, content: str) -> Dict[str, Any]:
+        with span("parse_json", chars=len(content)) as sp:
+            try:
+                return json.loads(content)
+            except json.JSONDecodeError:
+                # Common failure mode: JSON wrapped in markdown fences or extra text.
+                sp.set(fallback=True)
+                start = content.find("{")
+                end = content.rfind("}")
+                if start != -1 and end != -1 and end > start:
+                    return json.loads(content[start : end + 1])
+                raise
+
+    def structured_request(self, text: str, target_words: int = 1000, max_tokens: int = 10000) -> Dict[str, Any]:
+        """
+        Chat-completions request body for `summarize_structured` (without
+        `response_format`, which is sent when the client supports it).
+        """
         system = (
         "You are a rigorous podcast summarizer. You MUST stay grounded in the transcript. "
         "Do not invent facts, numbers, names, or claims. If something is not explicitly in the transcript, "
@@ -221,7 +370,7 @@ class OpenAISummarizer(BaseSummarizer):
         "- Use straight quotes in JSON strings. Ensure valid escaping.\n"
         )
 
-        request = {
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": system},
@@ -231,17 +380,42 @@ class OpenAISummarizer(BaseSummarizer):
             "max_tokens": max_tokens,
         }
 
-        try:
-            resp = self.client.chat.completions.create(
-                **request,
-                response_format={"type": "json_object"},
-            )
-        except TypeError:
-            # Older OpenAI client versions may not support response_format in chat.completions.
-            resp = self.client.chat.completions.create(**request)
+    def summarize_structured(
+        self,
+        text: str,
+        target_words: int = 1000,
+        max_tokens: int = 10000,
+    ) -> Dict[str, Any]:
+        """
+        Ask the model to return a structured JSON with abstract, outline, quotes, q_and_a, and keywords.
+        """
+        if not text.strip():
+            return {"abstract": "", "outline": [], "quotes": [], "q_and_a": [], "keywords": []}
+
+        request = self.structured_request(text, target_words=target_words, max_tokens=max_tokens)
+
+        with span("summarize_structured", model=self.model, input_chars=len(text)) as sp:
+            started = time.perf_counter()
+            try:
+                resp = self.client.chat.completions.create(
+                    **request,
+                    response_format={"type": "json_object"},
+                )
+            except TypeError:
+                # Older OpenAI client versions may not support response_format in chat.completions.
+                resp = self.client.chat.completions.create(**request)
+            rec = self.ledger.record(self.model, "summarize_structured", resp, time.perf_counter() - started)
+            sp.set(prompt_tokens=rec.prompt_tokens, completion_tokens=rec.completion_tokens)
 
         content = (resp.choices[0].message.content or "").strip()
         print(f"response: {content}")
+        return self.parse_structured(content)
+
+    def parse_structured(self, content: str) -> Dict[str, Any]:
+        """
+        Sections of a structured-summary response.
+        """
+        content = content.strip()
         if not content:
             raise RuntimeError("OpenAI returned empty content for structured summary.")
 
@@ -0,0 +1,197 @@
+"""
+Token usage, latency, and cost accounting for summarizer calls.
+"""
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from podagent import config
+
+
+def load_price_table(path: Optional[Path] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Return the default price table, updated with entries from `path` (or the
+    `PODAGENT_PRICE_TABLE` env var) when given. Prices are USD per 1M tokens.
+    """
+    prices = {model: dict(p) for model, p in config.MODEL_PRICES.items()}
+    path = path or (Path(os.environ["PODAGENT_PRICE_TABLE"]) if os.getenv("PODAGENT_PRICE_TABLE") else None)
+    if path:
+        overrides = json.loads(Path(path).read_text(encoding="utf-8"))
+        for model, p in overrides.items():
+            prices[model] = {"prompt": float(p.get("prompt", 0.0)), "completion": float(p.get("completion", 0.0))}
+    return prices
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (about four characters per token for English text), for
+    budgeting and simulation where no tokenizer response is available.
+    """
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+@dataclass
+class CallRecord:
+    model: str
+    kind: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_s: float
+    cost_usd: Optional[float]
+
+
+class UsageLedger:
+    """
+    Append-only record of every LLM call made during a run.
+
+    Summarizers call `record()` after each request; callers take a `mark()` before a
+    run and read `summary(since=mark)` afterwards to get that run's totals. When
+    runs share a ledger concurrently, each wraps its work in `scope()` instead,
+    which also collects the calls made in that context into a child ledger.
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Dict[str, float]]] = None):
+        self.prices = prices if prices is not None else load_price_table()
+        self.calls: List[CallRecord] = []
+        self._lock = threading.Lock()
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        price = self.prices.get(model)
+        if price is None:
+            return None
+        return (prompt_tokens * price["prompt"] + completion_tokens * price["completion"]) / 1_000_000
+
+    def record(self, model: str, kind: str, resp: Any, latency_s: float, price_factor: float = 1.0) -> CallRecord:
+        """
+        Record one chat-completions response. Missing `usage` counts as zero tokens.
+        `price_factor` scales the listed price (e.g. batch-API discounts).
+        """
+        usage = getattr(resp, "usage", None)
+        prompt_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
+        completion_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+        rec = CallRecord(
+            model=model,
+            kind=kind,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_s=latency_s,
+            cost_usd=self.cost(model, prompt_tokens, completion_tokens),
+        )
+        if rec.cost_usd is not None and price_factor != 1.0:
+            rec.cost_usd *= price_factor
+        with self._lock:
+            self.calls.append(rec)
+        for child in _scopes.get():
+            if child is not self:
+                with child._lock:
+                    child.calls.append(rec)
+        return rec
+
+    def extend(self, calls: List[CallRecord]) -> None:
+        with self._lock:
+            self.calls.extend(calls)
+
+    @contextmanager
+    def scope(self) -> Iterator["UsageLedger"]:
+        """
+        Child ledger that also receives every call recorded in the current
+        context (thread or task) until the block exits. Work handed to other
+        threads inside the block must run in a copy of this context
+        (`contextvars.copy_context().run`) to be counted.
+        """
+        child = UsageLedger(prices=self.prices)
+        token = _scopes.set(_scopes.get() + (child,))
+        try:
+            yield child
+        finally:
+            _scopes.reset(token)
+
+    def mark(self) -> int:
+        with self._lock:
+            return len(self.calls)
+
+    def summary(self, since: int = 0) -> Dict[str, Any]:
+        """
+        Aggregate calls recorded after position `since` into totals plus a per-kind
+        breakdown. `cost_usd` is None if any call used a model without a price.
+        """
+        with self._lock:
+            calls = list(self.calls[since:])
+        return {
+            "totals": _aggregate(calls),
+            "by_kind": {kind: _aggregate([c for c in calls if c.kind == kind]) for kind in sorted({c.kind for c in calls})},
+            "calls": [asdict(c) for c in calls],
+        }
+
+
+class UsageTotals:
+    """
+    Running per-kind totals for long-lived processes (e.g. the web backend).
+
+    Unlike `UsageLedger`, individual calls are folded into counters and dropped, so
+    memory stays constant however many requests are served. `summary()` has the
+    same `totals` / `by_kind` shape as `UsageLedger.summary()`, without `calls`.
+    """
+
+    def __init__(self):
+        self._by_kind: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, calls: List[CallRecord]) -> None:
+        with self._lock:
+            for c in calls:
+                agg = self._by_kind.setdefault(
+                    c.kind,
+                    {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_s": 0.0, "cost_usd": 0.0, "unpriced": 0},
+                )
+                agg["calls"] += 1
+                agg["prompt_tokens"] += c.prompt_tokens
+                agg["completion_tokens"] += c.completion_tokens
+                agg["latency_s"] += c.latency_s
+                if c.cost_usd is None:
+                    agg["unpriced"] += 1
+                else:
+                    agg["cost_usd"] += c.cost_usd
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            by_kind = {kind: dict(agg) for kind, agg in self._by_kind.items()}
+        totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_s": 0.0, "cost_usd": 0.0, "unpriced": 0}
+        for agg in by_kind.values():
+            for key in totals:
+                totals[key] += agg[key]
+        return {
+            "totals": _finish(totals),
+            "by_kind": {kind: _finish(by_kind[kind]) for kind in sorted(by_kind)},
+        }
+
+
+def _finish(agg: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "calls": agg["calls"],
+        "prompt_tokens": agg["prompt_tokens"],
+        "completion_tokens": agg["completion_tokens"],
+        "latency_s": round(agg["latency_s"], 3),
+        "cost_usd": None if agg["unpriced"] else round(agg["cost_usd"], 6),
+    }
+
+
+# Child ledgers opened by `UsageLedger.scope` in the current context.
+_scopes: ContextVar[Tuple[UsageLedger, ...]] = ContextVar("usage_scopes", default=())
+
+
+def _aggregate(calls: List[CallRecord]) -> Dict[str, Any]:
+    costs = [c.cost_usd for c in calls]
+    return {
+        "calls": len(calls),
+        "prompt_tokens": sum(c.prompt_tokens for c in calls),
+        "completion_tokens": sum(c.completion_tokens for c in calls),
+        "latency_s": round(sum(c.latency_s for c in calls), 3),
+        "cost_usd": None if any(c is None for c in costs) else round(sum(costs), 6),
+    }
@@ -1,7 +1,41 @@
 """
 Embedding-based retrieval utilities.
+
+Exports are imported from their submodules on first access, so importing the
+package does not load numpy, faiss or sentence-transformers.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .bm25 import BM25Index
+    from .index import EmbeddingRetriever, EpisodeResult, RetrievalResult, build_index_from_chunks
+
+_EXPORTS = {
+    "BM25Index": ".bm25",
+    "EmbeddingRetriever": ".index",
+    "EpisodeResult": ".index",
+    "RetrievalResult": ".index",
+    "build_index_from_chunks": ".index",
+}
+
+__all__ = [
+    "BM25Index",
+    "EmbeddingRetriever",
+    "EpisodeResult",
+    "RetrievalResult",
+    "build_index_from_chunks",
+]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
-from .index import EmbeddingRetriever, RetrievalResult, build_index_from_chunks
 
-__all__ = ["EmbeddingRetriever", "RetrievalResult", "build_index_from_chunks"]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,582 @@
+"""
+Vector storage and inner-product search behind `EmbeddingRetriever`.
+
+`FaissBackend` wraps a flat FAISS index; `NumpyBackend` keeps the embeddings in
+one contiguous float32/float16 matrix (optionally memory-mapped) and scores it in
+row blocks, so retrieval still works in containers without faiss installed.
+`ScalarQuantizedBackend` (int8) and `ProductQuantizedBackend` (PQ codes) trade
+exactness for memory and can re-rank their top candidates against float32
+vectors memory-mapped from disk.
+"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+BACKENDS = ("auto", "faiss", "numpy")
+STORAGES = ("float32", "float16", "int8", "pq")
+
+_faiss = None
+_faiss_checked = False
+
+
+def load_faiss():
+    """
+    The faiss module, imported on first use (it pulls in a large native
+    library); None when it is not installed.
+    """
+    global _faiss, _faiss_checked
+    if not _faiss_checked:
+        try:
+            import faiss  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            faiss = None
+        _faiss, _faiss_checked = faiss, True
+    return _faiss
+
+
+def _require_faiss():
+    faiss = load_faiss()
+    if faiss is None:
+        raise ImportError("faiss is not installed. Install faiss-cpu from requirements.txt.")
+    return faiss
+
+
+class VectorBackend:
+    """
+    Inner-product search over L2-normalized row vectors. Rows are addressed by
+    position; `rows` filters are sorted int64 arrays of allowed row ids.
+    """
+
+    name = "base"
+    storage = "float32"
+
+    @property
+    def dim(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def ntotal(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def nbytes(self) -> int:
+        raise NotImplementedError
+
+    def search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        (row, score) pairs for the k best rows for one query vector, best first.
+        """
+        raise NotImplementedError
+
+    def reconstruct(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Stored vectors for `rows` as float32.
+        """
+        raise NotImplementedError
+
+    def save(self, index_path: Path) -> None:
+        raise NotImplementedError
+
+
+class FaissBackend(VectorBackend):
+    name = "faiss"
+
+    # Selectors kept for the most recently used filter arrays. The retriever's
+    # per-episode and per-speaker arrays are reused across queries; intersections
+    # are built per query and age out.
+    selector_cache_size = 64
+
+    def __init__(self, index):
+        _require_faiss()
+        self.index = index
+        # id(rows) -> (rows, selector), least recently used first.
+        self._selectors: "OrderedDict[int, Tuple[np.ndarray, object]]" = OrderedDict()
+        self._selectors_lock = threading.Lock()
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray) -> "FaissBackend":
+        index = _require_faiss().IndexFlatIP(vectors.shape[1])
+        index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+        return cls(index)
+
+    @property
+    def dim(self) -> int:
+        return self.index.d
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal
+
+    @property
+    def nbytes(self) -> int:
+        return self.index.ntotal * self.index.d * 4
+
+    def _params(self, rows: np.ndarray):
+        faiss = load_faiss()
+        with self._selectors_lock:
+            cached = self._selectors.get(id(rows))
+            if cached is None or cached[0] is not rows:
+                cached = (rows, faiss.IDSelectorBatch(rows))
+                self._selectors[id(rows)] = cached
+                while len(self._selectors) > self.selector_cache_size:
+                    self._selectors.popitem(last=False)
+            else:
+                self._selectors.move_to_end(id(rows))
+        return faiss.SearchParameters(sel=cached[1])
+
+    # Filters selecting at most this fraction of rows are scored directly on the
+    # reconstructed rows instead of a selector scan over the whole index.
+    direct_fraction = 0.05
+
+    def search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        params = None
+        if rows is not None:
+            k = min(k, rows.shape[0])
+            if 0 < k and rows.shape[0] <= self.direct_fraction * self.ntotal:
+                scores = self.reconstruct(rows) @ np.asarray(query, dtype=np.float32).reshape(-1)
+                top = np.argpartition(-scores, k - 1)[:k]
+                order = top[np.lexsort((rows[top], -scores[top]))]
+                return [(int(rows[i]), float(scores[i])) for i in order]
+            params = self._params(rows)
+        k = min(k, self.ntotal)
+        if k <= 0:
+            return []
+        query = np.ascontiguousarray(query.reshape(1, -1), dtype=np.float32)
+        scores, idxs = self.index.search(query, k, params=params)
+        return [(int(i), float(s)) for s, i in zip(scores[0], idxs[0]) if i != -1]
+
+    def reconstruct(self, rows: np.ndarray) -> np.ndarray:
+        if len(rows) == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self.index.reconstruct_batch(np.asarray(rows, dtype=np.int64)).astype(np.float32, copy=False)
+
+    def save(self, index_path: Path) -> None:
+        load_faiss().write_index(self.index, str(index_path))
+
+    @classmethod
+    def load(cls, index_path: Path) -> "FaissBackend":
+        return cls(_require_faiss().read_index(str(index_path)))
+
+
+class NumpyBackend(VectorBackend):
+    """
+    Search over a contiguous (n, d) matrix. Queries are scored one row block at
+    a time, keeping only each block's top k via `argpartition`, so peak extra
+    memory is one block. float16 halves memory but each block is upcast before
+    the matmul, which costs several times the float32 latency.
+
+    Subclasses store compressed codes instead and override `_prepare` and
+    `_score_block`. When `full` (float32 vectors, usually memory-mapped) is set,
+    non-float32 storage re-ranks its top `k * rerank_factor` candidates exactly.
+    """
+
+    name = "numpy"
+    rerank_factor = 4
+
+    def __init__(self, vectors: np.ndarray, block_size: int = 8192, full: Optional[np.ndarray] = None):
+        if vectors.dtype not in (np.float32, np.float16):
+            vectors = vectors.astype(np.float32)
+        # Memory-mapped arrays are already contiguous on disk; don't copy them into RAM.
+        self.vectors = vectors if isinstance(vectors, np.memmap) else np.ascontiguousarray(vectors)
+        self.storage = "float16" if vectors.dtype == np.float16 else "float32"
+        self.block_size = block_size
+        self.full = full
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray, storage: str = "float32") -> "NumpyBackend":
+        dtype = np.float16 if storage == "float16" else np.float32
+        return cls(np.ascontiguousarray(vectors, dtype=dtype))
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.vectors.nbytes)
+
+    def _prepare(self, query: np.ndarray):
+        return query
+
+    def _score_block(self, prepared, sel) -> np.ndarray:
+        return self.vectors[sel].astype(np.float32, copy=False) @ prepared
+
+    def _top_k(self, prepared, k: int, rows: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        total = self.ntotal if rows is None else rows.shape[0]
+        best_ids = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for lo in range(0, total, self.block_size):
+            hi = min(lo + self.block_size, total)
+            if rows is None:
+                ids = np.arange(lo, hi, dtype=np.int64)
+                scores = self._score_block(prepared, slice(lo, hi))
+            else:
+                ids = rows[lo:hi]
+                scores = self._score_block(prepared, ids)
+            if scores.shape[0] > k:
+                keep = np.argpartition(-scores, k - 1)[:k]
+                ids, scores = ids[keep], scores[keep]
+            best_ids = np.concatenate([best_ids, ids])
+            best_scores = np.concatenate([best_scores, scores])
+            if best_scores.shape[0] > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_ids, best_scores = best_ids[keep], best_scores[keep]
+        return best_ids, best_scores
+
+    def search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        total = self.ntotal if rows is None else rows.shape[0]
+        k = min(k, total)
+        if k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if self.full is not None and self.storage != "float32":
+            ids, _ = self._top_k(self._prepare(query), min(total, k * self.rerank_factor), rows)
+            ids = np.sort(ids)
+            scores = np.asarray(self.full[ids], dtype=np.float32) @ query
+        else:
+            ids, scores = self._top_k(self._prepare(query), k, rows)
+        # Ties broken by row id, matching FAISS flat search.
+        order = np.lexsort((ids, -scores))[:k]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def reconstruct(self, rows: np.ndarray) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.int64)
+        if self.full is not None:
+            return np.asarray(self.full[rows], dtype=np.float32)
+        return self._decode(rows)
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        return np.asarray(self.vectors[rows], dtype=np.float32)
+
+    def save(self, index_path: Path) -> None:
+        np.save(storage_path(index_path, self.storage), self.vectors)
+
+    @classmethod
+    def load(cls, index_path: Path, storage: str = "float32", mmap: bool = False) -> "NumpyBackend":
+        return cls(np.load(storage_path(index_path, storage), mmap_mode="r" if mmap else None))
+
+
+class ScalarQuantizedBackend(NumpyBackend):
+    """
+    int8 codes with a symmetric per-dimension scale (4x smaller than float32).
+    The scale is folded into the query, so a block scores as one int8->float32
+    upcast and a matmul.
+    """
+
+    storage = "int8"
+
+    def __init__(self, codes: np.ndarray, scale: np.ndarray, block_size: int = 8192, full: Optional[np.ndarray] = None):
+        self.codes = np.ascontiguousarray(codes, dtype=np.int8)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.block_size = block_size
+        self.full = full
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray, storage: str = "int8") -> "ScalarQuantizedBackend":
+        n, dim = vectors.shape
+        block_size = 65536
+        peak = np.zeros(dim, dtype=np.float32)
+        for lo in range(0, n, block_size):
+            np.maximum(peak, np.abs(vectors[lo : lo + block_size]).max(axis=0), out=peak)
+        scale = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+        codes = np.empty((n, dim), dtype=np.int8)
+        for lo in range(0, n, block_size):
+            block = np.asarray(vectors[lo : lo + block_size], dtype=np.float32)
+            codes[lo : lo + block_size] = np.clip(np.rint(block / scale), -127, 127)
+        return cls(codes, scale)
+
+    @property
+    def dim(self) -> int:
+        return int(self.codes.shape[1])
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.codes.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + self.scale.nbytes)
+
+    def _prepare(self, query: np.ndarray):
+        return query * self.scale
+
+    def _score_block(self, prepared, sel) -> np.ndarray:
+        return self.codes[sel].astype(np.float32) @ prepared
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        return self.codes[rows].astype(np.float32) * self.scale
+
+    def save(self, index_path: Path) -> None:
+        np.savez(storage_path(index_path, self.storage), codes=self.codes, scale=self.scale)
+
+    @classmethod
+    def load(cls, index_path: Path, storage: str = "int8", mmap: bool = False) -> "ScalarQuantizedBackend":
+        """
+        `mmap` is accepted for a uniform signature but ignored: the codes sit in
+        an `.npz` archive, which numpy cannot memory-map.
+        """
+        data = np.load(storage_path(index_path, storage))
+        return cls(data["codes"], data["scale"])
+
+
+class ProductQuantizedBackend(NumpyBackend):
+    """
+    Product quantization: each vector is split into `dim / subvector_dim`
+    sub-vectors, each stored as the uint8 id of its nearest of up to 256
+    k-means centroids (384-d MiniLM at subvector_dim=8: 48 bytes per vector).
+    Queries score codes by summing per-subspace lookup tables (asymmetric
+    distance computation).
+    """
+
+    storage = "pq"
+    # PQ scores are coarser than int8, so re-ranking needs a deeper candidate list.
+    rerank_factor = 10
+
+    def __init__(self, codes: np.ndarray, centroids: np.ndarray, block_size: int = 8192, full: Optional[np.ndarray] = None):
+        self.codes = np.ascontiguousarray(codes, dtype=np.uint8)
+        # (num_subspaces, num_centroids, subvector_dim)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.block_size = block_size
+        self.full = full
+        m, ksub, _ = self.centroids.shape
+        self._offsets = (np.arange(m, dtype=np.intp) * ksub)[None, :]
+
+    @classmethod
+    def from_vectors(
+        cls,
+        vectors: np.ndarray,
+        storage: str = "pq",
+        subvector_dim: int = 8,
+        num_centroids: int = 256,
+        iterations: int = 20,
+        sample_size: int = 20000,
+        seed: int = 0,
+    ) -> "ProductQuantizedBackend":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n, dim = vectors.shape
+        if dim % subvector_dim:
+            raise ValueError(f"Vector dim {dim} is not divisible by subvector_dim {subvector_dim}.")
+        m = dim // subvector_dim
+        ksub = max(1, min(num_centroids, n))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)] if n else vectors
+        centroids = np.zeros((m, ksub, subvector_dim), dtype=np.float32)
+        codes = np.zeros((n, m), dtype=np.uint8)
+        for j in range(m):
+            cols = slice(j * subvector_dim, (j + 1) * subvector_dim)
+            if n:
+                centroids[j] = _kmeans(sample[:, cols], ksub, iterations, rng)
+                codes[:, j] = _nearest(vectors[:, cols], centroids[j])
+        return cls(codes, centroids)
+
+    @property
+    def dim(self) -> int:
+        return int(self.centroids.shape[0] * self.centroids.shape[2])
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.codes.shape[0])
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + self.centroids.nbytes)
+
+    def _prepare(self, query: np.ndarray):
+        m, _, dsub = self.centroids.shape
+        table = np.einsum("mkd,md->mk", self.centroids, query.reshape(m, dsub))
+        return table.ravel()
+
+    def _score_block(self, prepared, sel) -> np.ndarray:
+        return prepared[self.codes[sel].astype(np.intp) + self._offsets].sum(axis=1)
+
+    def _decode(self, rows: np.ndarray) -> np.ndarray:
+        m = self.centroids.shape[0]
+        parts = self.centroids[np.arange(m)[None, :], self.codes[rows].astype(np.intp)]
+        return parts.reshape(len(rows), -1)
+
+    def save(self, index_path: Path) -> None:
+        np.savez(storage_path(index_path, self.storage), codes=self.codes, centroids=self.centroids)
+
+    @classmethod
+    def load(cls, index_path: Path, storage: str = "pq", mmap: bool = False) -> "ProductQuantizedBackend":
+        """
+        `mmap` is accepted for a uniform signature but ignored: the codes sit in
+        an `.npz` archive, which numpy cannot memory-map.
+        """
+        data = np.load(storage_path(index_path, storage))
+        return cls(data["codes"], data["centroids"])
+
+
+def _nearest(x: np.ndarray, centroids: np.ndarray, block_size: int = 65536) -> np.ndarray:
+    out = np.empty(x.shape[0], dtype=np.int64)
+    c_sq = (centroids**2).sum(axis=1)
+    for lo in range(0, x.shape[0], block_size):
+        block = x[lo : lo + block_size]
+        out[lo : lo + block_size] = np.argmin(c_sq[None, :] - 2.0 * block @ centroids.T, axis=1)
+    return out
+
+
+def _kmeans(x: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Lloyd's k-means; empty clusters keep their previous centroid.
+    """
+    centroids = x[rng.choice(x.shape[0], size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = _nearest(x, centroids)
+        counts = np.bincount(assign, minlength=k)
+        sums = np.stack([np.bincount(assign, weights=x[:, d], minlength=k) for d in range(x.shape[1])], axis=1)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+_STORAGE_CLASSES = {
+    "float32": NumpyBackend,
+    "float16": NumpyBackend,
+    "int8": ScalarQuantizedBackend,
+    "pq": ProductQuantizedBackend,
+}
+_STORAGE_SUFFIXES = {
+    "float32": ".vectors.npy",
+    "float16": ".f16.npy",
+    "int8": ".sq8.npz",
+    "pq": ".pq.npz",
+}
+
+
+def storage_path(index_path: Path, storage: str) -> Path:
+    return index_path.with_suffix(_STORAGE_SUFFIXES[storage])
+
+
+def vectors_path(index_path: Path) -> Path:
+    """
+    Portable float32 vectors: the numpy float32 store, and the re-rank source
+    for compressed storage.
+    """
+    return storage_path(index_path, "float32")
+
+
+def remove_stale_stores(index_path: Path, keep: Iterable[Path]) -> None:
+    """
+    Delete the FAISS index and storage sidecars for `index_path` that are not in
+    `keep`, so a rebuild with different storage cannot load an older store.
+    """
+    keep = set(keep)
+    for path in [index_path] + [storage_path(index_path, s) for s in STORAGES]:
+        if path not in keep and path.exists():
+            path.unlink()
+
+
+def _check_options(backend: str, storage: str) -> None:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector backend: {backend}")
+    if storage not in STORAGES:
+        raise ValueError(f"Unsupported vector storage: {storage}")
+    if backend == "faiss" and storage != "float32":
+        raise ValueError("The faiss backend stores float32 vectors only.")
+
+
+def build_backend(
+    blocks: Iterable[np.ndarray],
+    total: int,
+    dim: int,
+    backend: str = "auto",
+    storage: str = "float32",
+    rerank: bool = False,
+) -> VectorBackend:
+    """
+    Stream `total` vectors, arriving as row blocks, into the requested backend
+    and storage. "auto" uses FAISS when it is installed and the storage is
+    float32, numpy otherwise. Blocks are copied straight into the index (or
+    one preallocated matrix), so the full set is never held twice; int8/PQ
+    codes are then computed from that matrix, which is kept for exact
+    re-ranking only with `rerank`.
+    """
+    _check_options(backend, storage)
+    if backend == "faiss" or (backend == "auto" and storage == "float32" and load_faiss() is not None):
+        index = _require_faiss().IndexFlatIP(dim)
+        for block in blocks:
+            index.add(np.ascontiguousarray(block, dtype=np.float32))
+        if index.ntotal != total:
+            raise ValueError(f"Expected {total} vectors, got {index.ntotal}.")
+        return FaissBackend(index)
+
+    matrix = np.empty((total, dim), dtype=np.float16 if storage == "float16" else np.float32)
+    row = 0
+    for block in blocks:
+        matrix[row : row + block.shape[0]] = block
+        row += block.shape[0]
+    if row != total:
+        raise ValueError(f"Expected {total} vectors, got {row}.")
+    if storage in ("float32", "float16"):
+        return NumpyBackend(matrix)
+    store = _STORAGE_CLASSES[storage].from_vectors(matrix, storage=storage)
+    if rerank:
+        store.full = matrix
+    return store
+
+
+def make_backend(
+    vectors: np.ndarray,
+    backend: str = "auto",
+    storage: str = "float32",
+    rerank: bool = False,
+) -> VectorBackend:
+    """
+    Index an in-memory (n, d) matrix; see `build_backend`.
+    """
+    return build_backend([vectors], vectors.shape[0], vectors.shape[1], backend, storage, rerank)
+
+
+def load_backend(
+    index_path: Path,
+    backend: str = "auto",
+    mmap: bool = False,
+    storage: Optional[str] = None,
+    rerank: bool = False,
+) -> VectorBackend:
+    """
+    Load the vectors saved for `index_path`. Without `storage`, compressed
+    stores (pq, int8, float16) saved next to the index take precedence, then
+    the FAISS index itself, then the portable float32 `.vectors.npy`.
+    `mmap` memory-maps float32/float16 matrices (int8/PQ codes are always read
+    into RAM); `rerank` memory-maps the float32 vectors for re-ranking
+    compressed storage.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector backend: {backend}")
+    if storage is not None and storage not in STORAGES:
+        raise ValueError(f"Unsupported vector storage: {storage}")
+    has_faiss_index = index_path.exists()
+    compressed = [s for s in ("pq", "int8", "float16") if storage_path(index_path, s).exists()]
+    prefer_faiss = storage == "float32" or (storage is None and not compressed)
+    if backend == "faiss" or (
+        backend == "auto" and has_faiss_index and prefer_faiss and not mmap and load_faiss() is not None
+    ):
+        return FaissBackend.load(index_path)
+
+    candidates = [storage] if storage else compressed + ["float32"]
+    for name in candidates:
+        if storage_path(index_path, name).exists():
+            store = _STORAGE_CLASSES[name].load(index_path, storage=name, mmap=mmap)
+            if rerank and name != "float32":
+                if not vectors_path(index_path).exists():
+                    raise FileNotFoundError(f"Re-ranking needs float32 vectors at {vectors_path(index_path)}")
+                store.full = np.load(vectors_path(index_path), mmap_mode="r")
+            return store
+    if has_faiss_index:
+        if load_faiss() is None:
+            raise ImportError(
+                f"{index_path} is a FAISS index and faiss is not installed; "
+                "rebuild it with the numpy backend or save it with portable vectors."
+            )
+        return FaissBackend.load(index_path)
+    raise FileNotFoundError(f"No saved vectors for index {index_path}")
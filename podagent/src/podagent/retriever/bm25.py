@@ -0,0 +1,166 @@
+"""
+Compact in-process BM25 inverted index over chunk text.
+
+Postings are stored CSR-style in numpy arrays (`indptr`, `doc_ids`, `weights`)
+with each posting's BM25 term weight precomputed from the term's IDF and the
+document's length, so scoring a query is a few vectorized scatter-adds.
+"""
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def bm25_tokenize(text: str) -> List[str]:
+    """
+    Lowercased alphanumeric tokens; numbers and names are kept verbatim.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    def __init__(
+        self,
+        vocab: Sequence[str],
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        idf: np.ndarray,
+        doc_lens: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.vocab = list(vocab)
+        self.term_ids: Dict[str, int] = {t: i for i, t in enumerate(self.vocab)}
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.idf = idf
+        self.doc_lens = doc_lens
+        self.k1 = k1
+        self.b = b
+
+    @property
+    def num_docs(self) -> int:
+        return int(self.doc_lens.shape[0])
+
+    @classmethod
+    def build(cls, texts: Sequence[str], k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        term_ids: Dict[str, int] = {}
+        rows: List[np.ndarray] = []
+        terms: List[np.ndarray] = []
+        counts: List[np.ndarray] = []
+        doc_lens = np.zeros(len(texts), dtype=np.float32)
+        for doc, text in enumerate(texts):
+            tokens = bm25_tokenize(text)
+            doc_lens[doc] = len(tokens)
+            if not tokens:
+                continue
+            ids = np.fromiter((term_ids.setdefault(t, len(term_ids)) for t in tokens), dtype=np.int64)
+            uniq, tf = np.unique(ids, return_counts=True)
+            rows.append(np.full(uniq.shape[0], doc, dtype=np.int32))
+            terms.append(uniq)
+            counts.append(tf)
+
+        vocab = sorted(term_ids, key=term_ids.get)
+        if not rows:
+            return cls(
+                vocab,
+                np.zeros(1, dtype=np.int64),
+                np.zeros(0, dtype=np.int32),
+                np.zeros(0, dtype=np.float32),
+                np.zeros(0, dtype=np.float32),
+                doc_lens,
+                k1,
+                b,
+            )
+
+        doc_col = np.concatenate(rows)
+        term_col = np.concatenate(terms)
+        tf_col = np.concatenate(counts).astype(np.float32)
+        order = np.lexsort((doc_col, term_col))
+        doc_col, term_col, tf_col = doc_col[order], term_col[order], tf_col[order]
+
+        df = np.bincount(term_col, minlength=len(vocab)).astype(np.float32)
+        n = float(len(texts))
+        idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(df.astype(np.int64), out=indptr[1:])
+
+        avgdl = float(doc_lens.mean()) or 1.0
+        norm = k1 * (1.0 - b + b * doc_lens[doc_col] / avgdl)
+        weights = (idf[term_col] * tf_col * (k1 + 1.0) / (tf_col + norm)).astype(np.float32)
+        return cls(vocab, indptr, doc_col, weights, idf, doc_lens, k1, b)
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every document for `query` (dense float32 array).
+        """
+        out = np.zeros(self.num_docs, dtype=np.float32)
+        for term in bm25_tokenize(query):
+            tid = self.term_ids.get(term)
+            if tid is None:
+                continue
+            lo, hi = self.indptr[tid], self.indptr[tid + 1]
+            # Each term's postings hold a document at most once, so fancy-index add is safe.
+            out[self.doc_ids[lo:hi]] += self.weights[lo:hi]
+        return out
+
+    def top_k(self, query: str, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        (row, score) pairs for the k best-scoring documents with a positive score,
+        optionally restricted to the sorted row ids in `rows`.
+        """
+        return top_positive(self.scores(query), k, rows)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            vocab=np.frombuffer("\n".join(self.vocab).encode("utf-8"), dtype=np.uint8),
+            indptr=self.indptr,
+            doc_ids=self.doc_ids,
+            weights=self.weights,
+            idf=self.idf,
+            doc_lens=self.doc_lens,
+            params=np.asarray([self.k1, self.b], dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        data = np.load(path)
+        k1, b = data["params"].tolist()
+        vocab_blob = data["vocab"].tobytes().decode("utf-8")
+        return cls(
+            vocab_blob.split("\n") if vocab_blob else [],
+            data["indptr"],
+            data["doc_ids"],
+            data["weights"],
+            data["idf"],
+            data["doc_lens"],
+            k1,
+            b,
+        )
+
+
+def top_positive(scores: np.ndarray, k: int, rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+    """
+    (row, score) pairs for the k highest positive entries of `scores`, best
+    first, considering only `rows` when given.
+    """
+    candidates = np.arange(scores.shape[0]) if rows is None else rows
+    scores = scores if rows is None else scores[rows]
+    positive = np.flatnonzero(scores > 0)
+    if positive.size == 0 or k <= 0:
+        return []
+    k = min(k, positive.size)
+    part = positive[np.argpartition(-scores[positive], k - 1)[:k]]
+    part = part[np.argsort(-scores[part], kind="stable")]
+    return [(int(candidates[i]), float(scores[i])) for i in part]
+
+
+def bm25_path(index_path: Path) -> Path:
+    return index_path.with_suffix(".bm25.npz")
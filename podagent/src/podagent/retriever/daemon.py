@@ -0,0 +1,333 @@
+"""
+Optional long-lived embedding daemon on a Unix socket.
+
+The daemon keeps encoders (via `get_encoder`) and loaded indexes warm across
+processes and serves encode and search requests, so scripted runs skip the
+model and index load. `EmbeddingRetriever` asks `connect()` for a client and
+falls back to in-process encoding and search when no daemon is listening.
+
+Wire format: each message is a frame of two big-endian uint32 lengths, a JSON
+header, and a binary payload (float32 vectors for `encode` replies). Search
+replies carry row positions into the index's chunk list, which client and
+daemon both read from the same `.chunks.jsonl`.
+"""
+import json
+import os
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .encoding import get_encoder
+
+_FRAME = struct.Struct(">II")
+
+# Retriever methods the daemon runs on a client's behalf.
+SERVED_METHODS = ("search", "search_mmr", "search_episodes")
+
+
+class DaemonError(RuntimeError):
+    """
+    The daemon is unreachable or rejected a request.
+    """
+
+
+def default_socket_path() -> Path:
+    """
+    `PODAGENT_EMBED_SOCKET`, else a per-user socket in the temp directory
+    (kept short: Unix socket paths are limited to ~100 bytes).
+    """
+    env = os.getenv("PODAGENT_EMBED_SOCKET")
+    if env:
+        return Path(env)
+    return Path(tempfile.gettempdir()) / f"podagent-embed-{os.getuid()}.sock"
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytearray:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        read = sock.recv_into(view[got:], n - got)
+        if read == 0:
+            raise ConnectionError("Connection closed mid-frame.")
+        got += read
+    return buf
+
+
+def send_frame(sock: socket.socket, header: Dict[str, Any], payload: bytes = b"") -> None:
+    head = json.dumps(header).encode("utf-8")
+    sock.sendall(_FRAME.pack(len(head), len(payload)) + head)
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Tuple[Dict[str, Any], bytearray]]:
+    """
+    Next (header, payload) from `sock`, or None on a clean close.
+    """
+    first = sock.recv(_FRAME.size)
+    if not first:
+        return None
+    if len(first) < _FRAME.size:
+        first += bytes(_recv_exact(sock, _FRAME.size - len(first)))
+    head_len, payload_len = _FRAME.unpack(first)
+    header = json.loads(bytes(_recv_exact(sock, head_len)).decode("utf-8"))
+    payload = _recv_exact(sock, payload_len) if payload_len else bytearray()
+    return header, payload
+
+
+def _ranked_rows(results, rows_by_chunk: Dict[int, int]) -> List[List[float]]:
+    return [[rows_by_chunk[id(r.chunk)], r.score] for r in results]
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                frame = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            if frame is None:
+                return
+            header, payload = frame
+            try:
+                reply, body = self.server.daemon.handle(header, payload)
+            except Exception as exc:
+                reply, body = {"error": f"{type(exc).__name__}: {exc}"}, b""
+            try:
+                send_frame(self.request, reply, body)
+            except OSError:
+                return
+            if header.get("op") == "shutdown":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class EmbeddingDaemon:
+    """
+    Serves `encode`, `search`/`search_mmr`/`search_episodes`, `ping` and
+    `shutdown` requests. Indexes are loaded on first request (or preloaded)
+    and reloaded when their chunk metadata changes on disk.
+    """
+
+    def __init__(self, socket_path: Optional[Path] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.started = time.time()
+        self.requests = 0
+        self._retrievers: Dict[Tuple, Tuple[float, Any, Dict[int, int]]] = {}
+        self._lock = threading.Lock()
+        self._encode_locks: Dict[str, threading.Lock] = {}
+
+    def preload_model(self, model_name: str) -> None:
+        get_encoder(model_name)
+
+    def preload_index(self, index_path: Path, options: Dict[str, Any]) -> None:
+        self._retriever(str(index_path), options)
+
+    def _encode_lock(self, model_name: str) -> threading.Lock:
+        with self._lock:
+            return self._encode_locks.setdefault(model_name, threading.Lock())
+
+    def _retriever(self, index_path: str, options: Dict[str, Any]):
+        from .index import EmbeddingRetriever
+
+        path = Path(index_path)
+        mtime = path.with_suffix(".chunks.jsonl").stat().st_mtime
+        key = (str(path.resolve()),) + tuple(sorted(options.items()))
+        with self._lock:
+            cached = self._retrievers.get(key)
+            if cached is None or cached[0] != mtime:
+                retriever = EmbeddingRetriever.load(path, use_daemon=False, **options)
+                rows = {id(chunk): i for i, chunk in enumerate(retriever.chunks)}
+                cached = (mtime, retriever, rows)
+                self._retrievers[key] = cached
+        return cached[1], cached[2]
+
+    def handle(self, header: Dict[str, Any], payload: bytearray) -> Tuple[Dict[str, Any], bytes]:
+        self.requests += 1
+        op = header.get("op")
+        if op == "ping" or op == "shutdown":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "indexes": [key[0] for key in self._retrievers],
+            }, b""
+        if op == "encode":
+            model_name = header["model"]
+            model = get_encoder(model_name)
+            texts = header.get("texts") or []
+            with self._encode_lock(model_name):
+                if texts:
+                    vecs = model.encode(
+                        list(texts),
+                        batch_size=int(header.get("batch_size", 64)),
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                        show_progress_bar=False,
+                    )
+                    vecs = np.ascontiguousarray(vecs, dtype=np.float32)
+                else:
+                    vecs = np.zeros((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+            return {"shape": list(vecs.shape)}, vecs.tobytes()
+        if op == "call":
+            method = header["method"]
+            if method not in SERVED_METHODS:
+                raise ValueError(f"Method not served: {method}")
+            retriever, rows = self._retriever(header["index"], header.get("options") or {})
+            if len(retriever.chunks) != header.get("num_chunks"):
+                raise ValueError("Index on disk differs from the client's chunk metadata.")
+            results = getattr(retriever, method)(**header.get("kwargs", {}))
+            if method == "search_episodes":
+                served = [
+                    [r.episode_id, r.score, r.centroid_score, _ranked_rows(r.chunks, rows)] for r in results
+                ]
+            else:
+                served = _ranked_rows(results, rows)
+            return {"results": served}, b""
+        raise ValueError(f"Unknown op: {op}")
+
+    def serve_forever(self) -> None:
+        path = self.socket_path
+        if path.exists():
+            if DaemonClient(path).alive():
+                raise RuntimeError(f"An embedding daemon is already listening on {path}")
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        server = _Server(str(path), _Handler)
+        server.daemon = self
+        os.chmod(path, 0o600)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if path.exists():
+                path.unlink()
+
+
+class DaemonClient:
+    """
+    One persistent connection to the daemon; requests are serialized.
+    """
+
+    def __init__(self, socket_path: Path, timeout: float = 300.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def request(self, header: Dict[str, Any], payload: bytes = b"") -> Tuple[Dict[str, Any], bytearray]:
+        with self._lock:
+            try:
+                if self._sock is None:
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    sock.settimeout(self.timeout)
+                    sock.connect(str(self.socket_path))
+                    self._sock = sock
+                send_frame(self._sock, header, payload)
+                frame = recv_frame(self._sock)
+            except (OSError, ValueError) as exc:
+                self.close()
+                raise DaemonError(f"Embedding daemon at {self.socket_path} unavailable: {exc}") from exc
+            if frame is None:
+                self.close()
+                raise DaemonError("Embedding daemon closed the connection.")
+        reply, body = frame
+        if "error" in reply:
+            raise DaemonError(reply["error"])
+        return reply, body
+
+    def alive(self) -> bool:
+        try:
+            return bool(self.request({"op": "ping"})[0].get("ok"))
+        except DaemonError:
+            return False
+
+    def encode(self, model_name: str, texts: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        reply, body = self.request(
+            {"op": "encode", "model": model_name, "texts": list(texts), "batch_size": batch_size}
+        )
+        return np.frombuffer(body, dtype=np.float32).reshape(reply["shape"])
+
+    def dimension(self, model_name: str) -> int:
+        return int(self.encode(model_name, []).shape[1])
+
+    def call(
+        self,
+        index_path: Path,
+        options: Dict[str, Any],
+        num_chunks: int,
+        method: str,
+        kwargs: Dict[str, Any],
+    ) -> List[Any]:
+        reply, _ = self.request(
+            {
+                "op": "call",
+                "index": str(index_path),
+                "options": options,
+                "num_chunks": num_chunks,
+                "method": method,
+                "kwargs": kwargs,
+            }
+        )
+        return reply["results"]
+
+
+_client: Optional[DaemonClient] = None
+_retry_at = 0.0
+_client_lock = threading.Lock()
+
+# After a failed connection, don't try the socket again for this many seconds.
+RETRY_AFTER_S = 5.0
+
+
+def connect(socket_path: Optional[Path] = None) -> Optional[DaemonClient]:
+    """
+    A client for the running daemon, or None when there is none (no socket,
+    nothing listening, or `PODAGENT_EMBED_DAEMON=0`).
+    """
+    global _client, _retry_at
+    if os.getenv("PODAGENT_EMBED_DAEMON", "1") == "0":
+        return None
+    path = socket_path or default_socket_path()
+    with _client_lock:
+        if _client is not None and _client.socket_path == path:
+            return _client
+        if time.monotonic() < _retry_at or not path.exists():
+            return None
+        client = DaemonClient(path)
+        if not client.alive():
+            _retry_at = time.monotonic() + RETRY_AFTER_S
+            return None
+        _client = client
+        return client
+
+
+def disconnect() -> None:
+    """
+    Drop the cached client (e.g. after a request failed), so the next
+    `connect` probes the socket again after `RETRY_AFTER_S`.
+    """
+    global _client, _retry_at
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _retry_at = time.monotonic() + RETRY_AFTER_S
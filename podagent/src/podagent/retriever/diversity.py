@@ -0,0 +1,115 @@
+"""
+Context diversification: maximal marginal relevance over stored chunk vectors,
+and collapsing of overlapping chunk windows into single passages.
+"""
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def _offset(chunk: dict, key: str) -> int:
+    value = chunk.get(key)
+    return -1 if value is None else int(value)
+
+
+def span_overlap_matrix(chunks: Sequence[dict]) -> np.ndarray:
+    """
+    Pairwise overlap of chunk char spans within the same episode, as a share of
+    the shorter span (1.0 = one window contains the other). Chunks without
+    spans overlap nothing.
+    """
+    n = len(chunks)
+    starts = np.asarray([_offset(c, "char_start") for c in chunks], dtype=np.int64)
+    ends = np.asarray([_offset(c, "char_end") for c in chunks], dtype=np.int64)
+    _, episodes = np.unique([str(c.get("episode_id")) for c in chunks], return_inverse=True)
+    inter = np.minimum(ends[:, None], ends[None, :]) - np.maximum(starts[:, None], starts[None, :])
+    lengths = np.maximum(ends - starts, 1)
+    shorter = np.minimum(lengths[:, None], lengths[None, :])
+    share = np.clip(inter, 0, None) / shorter
+    valid = (starts >= 0) & (ends > starts)
+    share[~(valid[:, None] & valid[None, :])] = 0.0
+    share[episodes[:, None] != episodes[None, :]] = 0.0
+    share[np.arange(n), np.arange(n)] = 1.0
+    return share
+
+
+def mmr_select(
+    relevance: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.7,
+    redundancy: Optional[np.ndarray] = None,
+) -> List[int]:
+    """
+    Indices of k candidates chosen by maximal marginal relevance: each pick
+    maximizes `lambda_mult * relevance - (1 - lambda_mult) * max similarity to
+    the picks so far`. Similarity is the cosine of the (normalized) `vectors`,
+    raised to at least `redundancy[i, j]` where given (e.g. span overlap). The full
+    similarity matrix is computed once; each step is one vectorized update.
+    """
+    n = relevance.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return []
+    sims = vectors @ vectors.T
+    if redundancy is not None:
+        sims = np.maximum(sims, redundancy)
+    picked: List[int] = []
+    available = np.ones(n, dtype=bool)
+    max_sim = np.full(n, -np.inf, dtype=np.float64)
+    for _ in range(k):
+        penalty = np.where(np.isfinite(max_sim), max_sim, 0.0)
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * penalty
+        scores = np.where(available, scores, -np.inf)
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        np.maximum(max_sim, sims[best], out=max_sim)
+    return picked
+
+
+def collapse_overlaps(chunks: Sequence[dict]) -> List[dict]:
+    """
+    Merge chunks whose char spans overlap (or touch) within an episode into one
+    passage covering their union, so shared words appear once. Chunk text is
+    the cleaned-transcript slice [char_start, char_end), so the union text is
+    rebuilt from the pieces. Merged passages are returned in transcript order
+    and list their source ids under `chunk_ids`; chunks without spans are kept
+    as they are, after the passages.
+    """
+    spanned = [c for c in chunks if c.get("char_start") is not None and c.get("char_end") is not None]
+    rest = [c for c in chunks if c.get("char_start") is None or c.get("char_end") is None]
+    spanned.sort(key=lambda c: (str(c.get("episode_id")), c["char_start"], c["char_end"]))
+
+    merged: List[dict] = []
+    for chunk in spanned:
+        last = merged[-1] if merged else None
+        if (
+            last is not None
+            and last.get("episode_id") == chunk.get("episode_id")
+            # Touching windows are separated by a single space in the cleaned text.
+            and chunk["char_start"] <= last["char_end"] + 1
+        ):
+            if chunk["char_end"] > last["char_end"]:
+                gap = chunk["char_start"] - last["char_end"]
+                tail = chunk["text"][last["char_end"] - chunk["char_start"] :] if gap <= 0 else " " + chunk["text"]
+                last["text"] = last["text"] + tail
+                last["char_end"] = chunk["char_end"]
+                if chunk.get("end_time") is not None:
+                    last["end_time"] = max(last.get("end_time") or 0.0, chunk["end_time"])
+            last["chunk_ids"].append(chunk.get("chunk_id"))
+            # Per-chunk speaker shares no longer apply to the passage.
+            last.pop("speaker_shares", None)
+            names = chunk.get("speakers") or []
+            roles = chunk.get("speaker_roles") or [None] * len(names)
+            for name, role in zip(names, roles):
+                if name not in last["speakers"]:
+                    last["speakers"].append(name)
+                    last["speaker_roles"].append(role)
+            continue
+        passage = dict(chunk)
+        passage["chunk_ids"] = [chunk.get("chunk_id")]
+        passage["speakers"] = list(chunk.get("speakers") or [])
+        passage["speaker_roles"] = list(chunk.get("speaker_roles") or [None] * len(passage["speakers"]))
+        merged.append(passage)
+    return merged + rest
@@ -0,0 +1,193 @@
+"""
+Encoders for retrieval.
+
+`get_encoder` is a process-wide registry so every retriever using a model
+shares one instance, and `QueryEmbeddingCache` is an LRU of query embeddings
+so repeated queries skip the forward pass. For index builds, `encode_blocks`
+encodes the corpus in length-bucketed batches, optionally across a pool of
+worker processes, and yields block-wise output so callers can stream vectors
+into an index instead of holding every embedding at once.
+"""
+import multiprocessing
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _sentence_transformer_class():
+    # Deferred: sentence-transformers imports torch, which takes seconds.
+    try:
+        from sentence_transformers import SentenceTransformer
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise ImportError(
+            "sentence-transformers is not installed. "
+            "Install from requirements.txt before using the retriever."
+        ) from exc
+    return SentenceTransformer
+
+
+# Encoder loaded once per worker process by `_init_worker`.
+_worker_model = None
+
+_encoders: Dict[str, object] = {}
+_encoders_lock = threading.Lock()
+
+
+def get_encoder(model_name: str):
+    """
+    The process-wide SentenceTransformer for `model_name`, loaded on first use.
+    """
+    with _encoders_lock:
+        model = _encoders.get(model_name)
+        if model is None:
+            model = _sentence_transformer_class()(model_name)
+            _encoders[model_name] = model
+        return model
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key form of a query: NFKC-normalized with whitespace collapsed.
+    Case is kept, since cased encoders embed it.
+    """
+    return " ".join(unicodedata.normalize("NFKC", query).split())
+
+
+class QueryEmbeddingCache:
+    """
+    Thread-safe LRU of query embeddings keyed by (model name, normalized query).
+    Cached vectors are read-only.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, model_name: str, query: str) -> Optional[np.ndarray]:
+        key = (model_name, normalize_query(query))
+        with self._lock:
+            vec = self._items.get(key)
+            if vec is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return vec
+
+    def put(self, model_name: str, query: str, vec: np.ndarray) -> np.ndarray:
+        vec = np.array(vec, dtype=np.float32)
+        vec.setflags(write=False)
+        if self.maxsize <= 0:
+            return vec
+        key = (model_name, normalize_query(query))
+        with self._lock:
+            self._items[key] = vec
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return vec
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._items), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+query_cache = QueryEmbeddingCache()
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    global _worker_model
+    try:
+        import torch
+
+        # Workers split the cores between them instead of each using all of them.
+        torch.set_num_threads(threads)
+    except Exception:  # pragma: no cover - torch ships with sentence-transformers
+        pass
+    _worker_model = _sentence_transformer_class()(model_name)
+
+
+def _encode(model, texts: Sequence[str], batch_size: int) -> np.ndarray:
+    vecs = model.encode(
+        list(texts),
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(vecs, dtype=np.float32)
+
+
+def _encode_in_worker(texts: List[str], batch_size: int) -> np.ndarray:
+    return _encode(_worker_model, texts, batch_size)
+
+
+def length_order(texts: Sequence[str]) -> np.ndarray:
+    """
+    Indices sorting `texts` longest first, so consecutive batches hold texts of
+    similar length and pad to similar token counts.
+    """
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    return np.argsort(-lengths, kind="stable")
+
+
+def encode_blocks(
+    model,
+    texts: Sequence[str],
+    model_name: str,
+    batch_size: int = 64,
+    workers: int = 1,
+    block_size: int = 8192,
+) -> Iterator[np.ndarray]:
+    """
+    Yield L2-normalized float32 embeddings of `texts` in consecutive blocks of
+    `block_size` rows, in input order.
+
+    Each block is length-sorted before encoding. With `workers` > 1 the sorted
+    block is cut into contiguous slices of a few batches each and encoded by a
+    pool of processes that each load `model_name`; otherwise `model` encodes
+    in-process.
+    """
+    executor = None
+    if workers > 1 and len(texts) > batch_size:
+        threads = max(1, (os.cpu_count() or workers) // workers)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, threads),
+        )
+    try:
+        for lo in range(0, len(texts), block_size):
+            block = texts[lo : lo + block_size]
+            order = length_order(block)
+            ordered = [block[i] for i in order]
+            if executor is None:
+                vecs = _encode(model, ordered, batch_size)
+            else:
+                step = batch_size * 4
+                slices = [ordered[i : i + step] for i in range(0, len(ordered), step)]
+                vecs = np.vstack(list(executor.map(_encode_in_worker, slices, repeat(batch_size))))
+            out = np.empty_like(vecs)
+            out[order] = vecs
+            yield out
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,65 @@
+"""
+Episode-level vector index for coarse-to-fine retrieval across the archive.
+
+Each episode is represented by the normalized mean (centroid) of its chunk
+embeddings. Scoring a query against every centroid costs one small matmul per
+episode, so the first stage of `EmbeddingRetriever.search_episodes` scales
+with the number of episodes rather than the number of chunks.
+"""
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+class EpisodeIndex:
+    def __init__(self, episode_ids: Sequence[str], centroids: np.ndarray):
+        self.episode_ids = list(episode_ids)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.episode_ids)
+
+    @classmethod
+    def build(cls, episode_rows: Dict[str, np.ndarray], backend) -> "EpisodeIndex":
+        """
+        Centroids from the vectors stored in `backend`, one episode's rows at a
+        time, so only a single episode's vectors are materialized at once.
+        """
+        ids = sorted(episode_rows)
+        centroids = np.zeros((len(ids), backend.dim), dtype=np.float32)
+        for i, episode_id in enumerate(ids):
+            mean = backend.reconstruct(episode_rows[episode_id]).mean(axis=0)
+            norm = float(np.linalg.norm(mean))
+            centroids[i] = mean / norm if norm > 0 else mean
+        return cls(ids, centroids)
+
+    def search(self, query_vec: np.ndarray, n: int) -> List[Tuple[str, float]]:
+        """
+        (episode_id, cosine to centroid) for the n closest episodes.
+        """
+        if not self.episode_ids or n <= 0:
+            return []
+        scores = self.centroids @ np.asarray(query_vec, dtype=np.float32)
+        n = min(n, scores.shape[0])
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.episode_ids[i], float(scores[i])) for i in top]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            episode_ids=np.frombuffer("\n".join(self.episode_ids).encode("utf-8"), dtype=np.uint8),
+            centroids=self.centroids,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "EpisodeIndex":
+        data = np.load(path)
+        blob = data["episode_ids"].tobytes().decode("utf-8")
+        return cls(blob.split("\n") if blob else [], data["centroids"])
+
+
+def episodes_path(index_path: Path) -> Path:
+    return index_path.with_suffix(".episodes.npz")
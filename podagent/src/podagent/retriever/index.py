@@ -1,22 +1,29 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
 from podagent import config
+from podagent.tracing import span
 from podagent.utils import read_jsonl
 
+from . import daemon
+from .backends import (
+    FaissBackend,
+    NumpyBackend,
+    VectorBackend,
+    build_backend,
+    load_backend,
+    remove_stale_stores,
+    storage_path,
+    vectors_path,
+)
+from .bm25 import BM25Index, bm25_path, top_positive
+from .diversity import mmr_select, span_overlap_matrix
+from .encoding import encode_blocks, get_encoder, query_cache
+from .episodes import EpisodeIndex, episodes_path
 
-try:
-    import faiss  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    faiss = None
-
-try:
-    from sentence_transformers import SentenceTransformer
-except Exception:  # pragma: no cover - optional dependency
-    SentenceTransformer = None
 
 
 @dataclass
@@ -25,65 +32,573 @@ class RetrievalResult:
     score: float
 
 
+@dataclass
+class EpisodeResult:
+    episode_id: str
+    score: float  # best supporting chunk's score
+    centroid_score: float
+    chunks: List[RetrievalResult] = field(default_factory=list)
+
+
 class EmbeddingRetriever:
     """
-    Simple FAISS-backed retriever over transcript chunks.
+    Simple retriever over transcript chunks, with an optional BM25 inverted
+    index for hybrid (lexical + dense) search. Vectors live in a FAISS index
+    when faiss is installed and in a numpy matrix otherwise (see `backends`).
     """
 
+    # Minimum share of a chunk's text a speaker must hold to match a speaker filter.
+    speaker_min_share = 0.2
+    # Hybrid search fuses this many candidates per ranker for every result requested.
+    hybrid_depth = 4
+    # Reciprocal rank fusion constant; larger values flatten the rank weighting.
+    rrf_k = 60
+    # Chunks encoded per block while building; bounds the embeddings held outside the index.
+    encode_block_size = 8192
+    # search_episodes shortlists this many episodes by centroid per episode returned.
+    episode_depth = 2
+
     def __init__(
         self,
         chunks: Sequence[dict],
         model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
         index_path: Optional[Path] = None,
+        mode: str = "dense",
+        backend: str = "auto",
+        storage: str = "float32",
+        rerank: bool = False,
+        workers: int = 1,
+        batch_size: int = 64,
+        use_daemon: bool = True,
     ):
-        if SentenceTransformer is None:
-            raise ImportError(
-                "sentence-transformers is not installed. "
-                "Install from requirements.txt before using the retriever."
-            )
-        if faiss is None:
-            raise ImportError(
-                "faiss is not installed. Install faiss-cpu from requirements.txt."
-            )
-
         self.model_name = model_name
-        self.model = SentenceTransformer(model_name)
+        self._model = None
         self.chunks = list(chunks)
         self.index_path = index_path
+        self.mode = mode
+        self.use_daemon = use_daemon
+        self._load_options: Optional[Dict[str, Any]] = None
+        self._reset_caches()
 
-        # Build embeddings
+        # Build embeddings, streamed into the index block by block
         texts = [c["text"] for c in self.chunks]
-        embeddings = self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
-        self.index = self._build_index(embeddings)
+        client = self._daemon() if workers <= 1 else None
+        if client is not None:
+            blocks = (
+                client.encode(model_name, texts[lo : lo + self.encode_block_size], batch_size)
+                for lo in range(0, len(texts), self.encode_block_size)
+            )
+            dim = client.dimension(model_name)
+        else:
+            blocks = encode_blocks(
+                self.model,
+                texts,
+                model_name,
+                batch_size=batch_size,
+                workers=workers,
+                block_size=self.encode_block_size,
+            )
+            dim = self.model.get_sentence_embedding_dimension()
+        self._backend: Optional[VectorBackend] = build_backend(
+            blocks,
+            len(texts),
+            dim,
+            backend=backend,
+            storage=storage,
+            rerank=rerank,
+        )
+        self._bm25 = BM25Index.build(texts)
+        self._episodes: Optional[EpisodeIndex] = None
 
         # Optionally persist index
         if self.index_path:
             self.save(self.index_path)
 
-    def _build_index(self, embeddings: np.ndarray):
-        dim = embeddings.shape[1]
-        index = faiss.IndexFlatIP(dim)
-        index.add(embeddings.astype(np.float32))
-        return index
-
-    def search(self, query: str, k: int = 5) -> List[RetrievalResult]:
-        query_vec = self.model.encode([query], convert_to_numpy=True, normalize_embeddings=True)
-        scores, idxs = self.index.search(query_vec.astype(np.float32), k)
-        results: List[RetrievalResult] = []
-        for score, idx in zip(scores[0], idxs[0]):
-            if idx == -1:
-                continue
-            results.append(RetrievalResult(chunk=self.chunks[idx], score=float(score)))
+    def _reset_caches(self) -> None:
+        self._episode_cache: Dict[str, Tuple[List[dict], np.ndarray]] = {}
+        self._filter_rows: Optional[Dict[str, Dict[str, np.ndarray]]] = None
+
+    @property
+    def model(self):
+        """
+        The in-process encoder, loaded on first use (not at all while an
+        embedding daemon does the encoding).
+        """
+        if self._model is None:
+            self._model = get_encoder(self.model_name)
+        return self._model
+
+    @property
+    def backend(self) -> VectorBackend:
+        """
+        Vector store; loaded on first local use when the index was loaded
+        while a daemon was serving it.
+        """
+        if self._backend is None:
+            self._backend = self._load_backend()
+        return self._backend
+
+    def _load_backend(self) -> VectorBackend:
+        backend = load_backend(self.index_path, **self._backend_options())
+        if backend.ntotal != len(self.chunks):
+            raise ValueError(
+                f"Vector store for {self.index_path} holds {backend.ntotal} vectors but "
+                f"{len(self.chunks)} chunks are saved with it; rebuild the index."
+            )
+        return backend
+
+    def _backend_options(self) -> Dict[str, Any]:
+        options = dict(self._load_options or {})
+        options.pop("model_name", None)
+        return options
+
+    def _daemon(self) -> Optional["daemon.DaemonClient"]:
+        return daemon.connect() if self.use_daemon else None
+
+    def _served(self, method: str, **kwargs: Any):
+        """
+        Results of `method` computed by the embedding daemon on the same saved
+        index, mapped back onto this retriever's chunks; None when no daemon is
+        serving it (or the request fails), so the caller runs locally.
+        """
+        client = self._daemon() if self._load_options is not None else None
+        if client is None:
+            return None
+        with span(f"EmbeddingRetriever.{method}", daemon=True, **{k: v for k, v in kwargs.items() if k != "query"}):
+            try:
+                served = client.call(self.index_path, self._load_options, len(self.chunks), method, kwargs)
+            except daemon.DaemonError:
+                daemon.disconnect()
+                return None
+        if method == "search_episodes":
+            return [
+                EpisodeResult(
+                    episode_id,
+                    score,
+                    centroid_score,
+                    [RetrievalResult(chunk=self.chunks[i], score=s) for i, s in chunks],
+                )
+                for episode_id, score, centroid_score, chunks in served
+            ]
+        return [RetrievalResult(chunk=self.chunks[int(i)], score=score) for i, score in served]
+
+    @property
+    def bm25(self) -> BM25Index:
+        """
+        Lexical index over chunk text; built on first use for indices saved
+        without one.
+        """
+        if self._bm25 is None:
+            self._bm25 = BM25Index.build([c["text"] for c in self.chunks])
+        return self._bm25
+
+    @property
+    def episodes(self) -> EpisodeIndex:
+        """
+        Episode centroid index; built from the stored vectors on first use for
+        indices saved without one.
+        """
+        if self._episodes is None:
+            self._episodes = EpisodeIndex.build(self._filters()["episode"], self.backend)
+        return self._episodes
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed texts with the retriever's encoder (L2-normalized float32 rows),
+        through the embedding daemon when one is running.
+        """
+        client = self._daemon()
+        if client is not None:
+            try:
+                return client.encode(self.model_name, texts)
+            except daemon.DaemonError:
+                daemon.disconnect()
+        vecs = self.model.encode(list(texts), convert_to_numpy=True, normalize_embeddings=True)
+        return np.asarray(vecs, dtype=np.float32)
+
+    def embed_query(self, query: str) -> Tuple[np.ndarray, bool]:
+        """
+        Query embedding and whether it came from the process-wide LRU cache
+        (shared by every retriever on the same model).
+        """
+        vec = query_cache.get(self.model_name, query)
+        if vec is not None:
+            return vec, True
+        return query_cache.put(self.model_name, query, self.encode([query])[0]), False
+
+    def episode_vectors(self, episode_id: str) -> Tuple[List[dict], np.ndarray]:
+        """
+        Return an episode's chunks (in chunk order) and their stored embeddings,
+        read back from the index rather than re-encoded. Cached per episode.
+        """
+        cache = self._episode_cache
+        if episode_id not in cache:
+            rows = [i for i, c in enumerate(self.chunks) if c.get("episode_id") == episode_id]
+            rows.sort(key=lambda i: self.chunks[i].get("chunk_id", 0))
+            vecs = self.backend.reconstruct(np.asarray(rows, dtype=np.int64))
+            cache[episode_id] = ([self.chunks[i] for i in rows], vecs)
+        return cache[episode_id]
+
+    def _filters(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Sorted row ids per episode and per speaker key (lowercased name, and
+        "host"/"guest"), built once from chunk metadata on first use. A speaker
+        owns a chunk when they hold at least `speaker_min_share` of its text.
+        """
+        if self._filter_rows is None:
+            episodes: Dict[str, List[int]] = {}
+            speakers: Dict[str, List[int]] = {}
+            for i, chunk in enumerate(self.chunks):
+                episodes.setdefault(chunk.get("episode_id"), []).append(i)
+                names = chunk.get("speakers") or []
+                roles = chunk.get("speaker_roles") or [None] * len(names)
+                shares = chunk.get("speaker_shares") or [1.0] * len(names)
+                for name, role, share in zip(names, roles, shares):
+                    if share < self.speaker_min_share:
+                        continue
+                    for key in {name.lower(), (role or "").lower()} - {""}:
+                        ids = speakers.setdefault(key, [])
+                        if not ids or ids[-1] != i:
+                            ids.append(i)
+            self._filter_rows = {
+                "episode": {k: np.asarray(v, dtype=np.int64) for k, v in episodes.items()},
+                "speaker": {k: np.asarray(v, dtype=np.int64) for k, v in speakers.items()},
+            }
+        return self._filter_rows
+
+    def _rows_for(self, episode_id: Optional[str], speaker: Optional[str]) -> Optional[np.ndarray]:
+        """
+        Sorted row ids matching the filters, or None when unfiltered.
+        """
+        if episode_id is None and not speaker:
+            return None
+        filters = self._filters()
+        empty = np.zeros(0, dtype=np.int64)
+        rows = None
+        if episode_id is not None:
+            rows = filters["episode"].get(episode_id, empty)
+        if speaker:
+            by_speaker = filters["speaker"].get(speaker.strip().lower(), empty)
+            rows = by_speaker if rows is None else np.intersect1d(rows, by_speaker, assume_unique=True)
+        return rows
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        speaker: Optional[str] = None,
+        episode_id: Optional[str] = None,
+        mode: Optional[str] = None,
+        fusion: str = "rrf",
+        alpha: float = 0.5,
+    ) -> List[RetrievalResult]:
+        """
+        Top-k chunks for `query`. With `episode_id`, only that episode's chunks
+        are searched; with `speaker`, only chunks where that speaker (name, or
+        "host"/"guest") talks.
+
+        `mode` is "dense" (cosine only) or "hybrid" (defaults to `self.mode`).
+        Hybrid search fuses the dense and BM25 candidate lists, either by
+        reciprocal rank fusion (`fusion="rrf"`) or by a weighted sum of cosine
+        and max-normalized BM25 scores (`fusion="weighted"`, `alpha` on cosine).
+        """
+        mode = self._check_options(mode, fusion)
+        served = self._served(
+            "search", query=query, k=k, speaker=speaker, episode_id=episode_id, mode=mode, fusion=fusion, alpha=alpha
+        )
+        if served is not None:
+            return served
+        return self._search_local(query, k, speaker, episode_id, mode, fusion, alpha)
+
+    def _search_local(
+        self,
+        query: str,
+        k: int,
+        speaker: Optional[str],
+        episode_id: Optional[str],
+        mode: str,
+        fusion: str,
+        alpha: float,
+        embedded: Optional[Tuple[np.ndarray, bool]] = None,
+    ) -> List[RetrievalResult]:
+        """
+        `search` in this process; `embedded` is the (vector, cache_hit) pair when
+        the caller already embedded the query.
+        """
+        with span(
+            "EmbeddingRetriever.search",
+            k=k,
+            speaker=speaker,
+            episode_id=episode_id,
+            mode=mode,
+            backend=self.backend.name,
+        ) as sp:
+            rows = self._rows_for(episode_id, speaker)
+            if rows is not None and rows.shape[0] == 0:
+                return []
+            query_vec, cache_hit = embedded if embedded is not None else self.embed_query(query)
+            if mode == "dense":
+                ranked = self.backend.search(query_vec, k, rows)
+            else:
+                ranked = self._hybrid_search(query, query_vec, k, rows, fusion, alpha)
+            results = [RetrievalResult(chunk=self.chunks[i], score=score) for i, score in ranked]
+            if sp:
+                sp.set(
+                    num_results=len(results),
+                    chunk_ids=[[r.chunk.get("episode_id"), r.chunk.get("chunk_id")] for r in results],
+                    cache_hit=cache_hit,
+                )
         return results
 
-    def save(self, path: Path) -> None:
+    def search_many(
+        self,
+        queries: Sequence[str],
+        k: int = 5,
+        speaker: Optional[str] = None,
+        episode_id: Optional[str] = None,
+        mode: Optional[str] = None,
+        fusion: str = "rrf",
+        alpha: float = 0.5,
+    ) -> List[List[RetrievalResult]]:
+        """
+        `search` for each of `queries`, with every uncached query embedded in
+        one encoder batch up front instead of one encoder call per query. Each
+        distinct query is looked up in the query cache once.
+        """
+        mode = self._check_options(mode, fusion)
+        if self._load_options is not None and self._daemon() is not None:
+            return [
+                self.search(q, k=k, speaker=speaker, episode_id=episode_id, mode=mode, fusion=fusion, alpha=alpha)
+                for q in queries
+            ]
+        embedded: Dict[str, Tuple[np.ndarray, bool]] = {}
+        missing = []
+        for query in dict.fromkeys(queries):
+            vec = query_cache.get(self.model_name, query)
+            if vec is None:
+                missing.append(query)
+            else:
+                embedded[query] = (vec, True)
+        if missing:
+            with span("EmbeddingRetriever.search_many.encode", queries=len(missing)):
+                for query, vec in zip(missing, self.encode(missing)):
+                    embedded[query] = (query_cache.put(self.model_name, query, vec), False)
+        return [
+            self._search_local(q, k, speaker, episode_id, mode, fusion, alpha, embedded=embedded[q])
+            for q in queries
+        ]
+
+    def search_mmr(
+        self,
+        query: str,
+        k: int = 5,
+        fetch_k: Optional[int] = None,
+        lambda_mult: float = 0.7,
+        speaker: Optional[str] = None,
+        episode_id: Optional[str] = None,
+        mode: Optional[str] = None,
+        fusion: str = "rrf",
+        alpha: float = 0.5,
+    ) -> List[RetrievalResult]:
         """
-        Persist FAISS index and chunk metadata next to it.
+        Top-k chunks for `query` diversified by maximal marginal relevance: the
+        best `fetch_k` candidates (default 4k) are re-picked so each one adds
+        the most relevance for the least similarity to those already chosen.
+        Similarity uses the stored vectors (no re-encoding), floored by char
+        span overlap so overlapping windows count as near-duplicates. Results
+        keep their retrieval scores, in pick order. Filters and `mode` are as
+        in `search`; hybrid scores are min-max scaled into relevance.
+        """
+        mode = self._check_options(mode, fusion)
+        fetch_k = max(k, fetch_k or k * 4)
+        served = self._served(
+            "search_mmr",
+            query=query,
+            k=k,
+            fetch_k=fetch_k,
+            lambda_mult=lambda_mult,
+            speaker=speaker,
+            episode_id=episode_id,
+            mode=mode,
+            fusion=fusion,
+            alpha=alpha,
+        )
+        if served is not None:
+            return served
+        with span("EmbeddingRetriever.search_mmr", k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, mode=mode) as sp:
+            rows = self._rows_for(episode_id, speaker)
+            if rows is not None and rows.shape[0] == 0:
+                return []
+            query_vec, cache_hit = self.embed_query(query)
+            if mode == "dense":
+                ranked = self.backend.search(query_vec, fetch_k, rows)
+            else:
+                ranked = self._hybrid_search(query, query_vec, fetch_k, rows, fusion, alpha)
+            if not ranked:
+                return []
+            ids = np.asarray([i for i, _ in ranked], dtype=np.int64)
+            scores = np.asarray([score for _, score in ranked], dtype=np.float64)
+            relevance = scores
+            if mode == "hybrid":
+                spread = scores.max() - scores.min()
+                relevance = (scores - scores.min()) / spread if spread > 0 else np.ones_like(scores)
+            candidates = [self.chunks[i] for i in ids]
+            picked = mmr_select(
+                relevance,
+                self.backend.reconstruct(ids),
+                k,
+                lambda_mult=lambda_mult,
+                redundancy=span_overlap_matrix(candidates),
+            )
+            results = [RetrievalResult(chunk=candidates[j], score=float(scores[j])) for j in picked]
+            if sp:
+                sp.set(
+                    cache_hit=cache_hit,
+                    candidates=len(ranked),
+                    chunk_ids=[[r.chunk.get("episode_id"), r.chunk.get("chunk_id")] for r in results],
+                )
+        return results
+
+    def search_episodes(
+        self,
+        query: str,
+        num_episodes: int = 5,
+        chunks_per_episode: int = 3,
+        speaker: Optional[str] = None,
+        mode: Optional[str] = None,
+        fusion: str = "rrf",
+        alpha: float = 0.5,
+    ) -> List[EpisodeResult]:
+        """
+        Episodes most relevant to `query`, each with its best supporting chunks.
+
+        Stage one scores the query against every episode centroid and keeps
+        `num_episodes * episode_depth` candidates; stage two searches only those
+        episodes' chunks (as `search` would with `episode_id`). Episodes are
+        ranked by their best chunk's score, so one focused passage can lift an
+        episode whose centroid is diluted; under hybrid RRF, whose scores are
+        only ranks within an episode, the centroid order is kept instead.
+        """
+        mode = self._check_options(mode, fusion)
+        served = self._served(
+            "search_episodes",
+            query=query,
+            num_episodes=num_episodes,
+            chunks_per_episode=chunks_per_episode,
+            speaker=speaker,
+            mode=mode,
+            fusion=fusion,
+            alpha=alpha,
+        )
+        if served is not None:
+            return served
+        with span(
+            "EmbeddingRetriever.search_episodes",
+            num_episodes=num_episodes,
+            chunks_per_episode=chunks_per_episode,
+            speaker=speaker,
+            mode=mode,
+        ) as sp:
+            query_vec, cache_hit = self.embed_query(query)
+            shortlist = self.episodes.search(query_vec, num_episodes * self.episode_depth)
+            lexical_scores = self.bm25.scores(query) if mode == "hybrid" else None
+            results: List[EpisodeResult] = []
+            for episode_id, centroid_score in shortlist:
+                rows = self._rows_for(episode_id, speaker)
+                if mode == "dense":
+                    ranked = self.backend.search(query_vec, chunks_per_episode, rows)
+                else:
+                    ranked = self._hybrid_search(
+                        query, query_vec, chunks_per_episode, rows, fusion, alpha, lexical_scores
+                    )
+                if not ranked:
+                    continue
+                chunks = [RetrievalResult(chunk=self.chunks[i], score=score) for i, score in ranked]
+                score = centroid_score if (mode, fusion) == ("hybrid", "rrf") else chunks[0].score
+                results.append(EpisodeResult(episode_id, score, centroid_score, chunks))
+            results.sort(key=lambda r: -r.score)
+            results = results[:num_episodes]
+            if sp:
+                sp.set(
+                    cache_hit=cache_hit,
+                    shortlisted=len(shortlist),
+                    episode_ids=[r.episode_id for r in results],
+                )
+        return results
+
+    def _check_options(self, mode: Optional[str], fusion: str) -> str:
+        mode = mode or self.mode
+        if mode not in ("dense", "hybrid"):
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        return mode
+
+    def _hybrid_search(
+        self,
+        query: str,
+        query_vec: np.ndarray,
+        k: int,
+        rows: Optional[np.ndarray],
+        fusion: str,
+        alpha: float,
+        lexical_scores: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float]]:
+        depth = max(k, k * self.hybrid_depth)
+        dense = self.backend.search(query_vec, depth, rows)
+        if lexical_scores is None:
+            lexical_scores = self.bm25.scores(query)
+        lexical = top_positive(lexical_scores, depth, rows)
+
+        candidates = np.asarray(
+            list(dict.fromkeys([i for i, _ in dense] + [i for i, _ in lexical])), dtype=np.int64
+        )
+        if candidates.size == 0:
+            return []
+
+        if fusion == "rrf":
+            fused = np.zeros(candidates.shape[0], dtype=np.float64)
+            position = {int(row): j for j, row in enumerate(candidates)}
+            for ranking in (dense, lexical):
+                for rank, (row, _) in enumerate(ranking):
+                    fused[position[row]] += 1.0 / (self.rrf_k + rank + 1)
+        else:
+            # Cosine for lexical-only candidates comes from the stored vectors.
+            cosine = dict(dense)
+            missing = [int(i) for i in candidates if int(i) not in cosine]
+            if missing:
+                vecs = self.backend.reconstruct(np.asarray(missing, dtype=np.int64))
+                cosine.update(zip(missing, (vecs @ query_vec).tolist()))
+            dense_part = np.asarray([cosine[int(i)] for i in candidates], dtype=np.float64)
+            lexical_part = lexical_scores[candidates].astype(np.float64)
+            top = lexical_part.max()
+            if top > 0:
+                lexical_part /= top
+            fused = alpha * dense_part + (1.0 - alpha) * lexical_part
+
+        order = np.argsort(-fused, kind="stable")[:k]
+        return [(int(candidates[j]), float(fused[j])) for j in order]
+
+    def save(self, path: Path, portable: bool = True) -> None:
+        """
+        Persist the vector index, BM25 postings, episode centroids, and chunk
+        metadata next to it.
+        With `portable`, float32 vectors are also written as `.vectors.npy` so
+        hosts without faiss can load a FAISS-built index and compressed storage
+        can re-rank; int8/PQ stores only have them when built with `rerank`.
         """
-        if faiss is None:
-            raise ImportError("faiss is required to save or load indices.")
         path.parent.mkdir(parents=True, exist_ok=True)
-        faiss.write_index(self.index, str(path))
+        backend = self.backend
+        backend.save(path)
+        written = [path if isinstance(backend, FaissBackend) else storage_path(path, backend.storage)]
+        is_float32_store = isinstance(backend, NumpyBackend) and backend.storage == "float32"
+        exact = backend.storage in ("float32", "float16") or getattr(backend, "full", None) is not None
+        if portable and exact and not is_float32_store:
+            np.save(vectors_path(path), backend.reconstruct(np.arange(backend.ntotal)))
+            written.append(vectors_path(path))
+        remove_stale_stores(path, written)
+        self.bm25.save(bm25_path(path))
+        self.episodes.save(episodes_path(path))
         meta_path = path.with_suffix(".chunks.jsonl")
         from podagent.utils import write_jsonl
 
@@ -94,31 +609,64 @@ class EmbeddingRetriever:
         cls,
         index_path: Path,
         model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        mode: str = "dense",
+        backend: str = "auto",
+        mmap: bool = False,
+        storage: Optional[str] = None,
+        rerank: bool = False,
+        use_daemon: bool = True,
     ) -> "EmbeddingRetriever":
-        if SentenceTransformer is None:
-            raise ImportError("sentence-transformers is not installed.")
-        if faiss is None:
-            raise ImportError("faiss is not installed.")
-        model = SentenceTransformer(model_name)
-        index = faiss.read_index(str(index_path))
-        meta_path = index_path.with_suffix(".chunks.jsonl")
-        chunks = read_jsonl(meta_path)
+        """
+        Load a saved index. `backend` "auto" uses compressed storage saved with
+        the index if any, else FAISS when installed, else the portable numpy
+        vectors; `mmap` memory-maps numpy matrices instead of reading them into
+        RAM, and `rerank` re-scores compressed-storage candidates in float32.
+
+        While an embedding daemon is running (and `use_daemon`), searches and
+        query encoding are served by it, and neither the model nor the vectors
+        are loaded here unless a local-only method needs them.
+        """
         retriever = cls.__new__(cls)
         retriever.model_name = model_name
-        retriever.model = model
+        retriever._model = None
         retriever.index_path = index_path
-        retriever.index = index
+        retriever.use_daemon = use_daemon
+        retriever._load_options = {
+            "model_name": model_name,
+            "backend": backend,
+            "mmap": mmap,
+            "storage": storage,
+            "rerank": rerank,
+        }
+        retriever._backend = None
+        meta_path = index_path.with_suffix(".chunks.jsonl")
+        chunks = read_jsonl(meta_path)
         retriever.chunks = chunks
+        if retriever._daemon() is None:
+            retriever._backend = retriever._load_backend()
+        lexical_path = bm25_path(index_path)
+        retriever.mode = mode
+        retriever._bm25 = BM25Index.load(lexical_path) if lexical_path.exists() else None
+        centroid_path = episodes_path(index_path)
+        retriever._episodes = EpisodeIndex.load(centroid_path) if centroid_path.exists() else None
+        retriever._reset_caches()
         return retriever
 
 
 def build_index_from_chunks(
     interim_dir: Optional[Path] = None,
     model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    mode: str = "dense",
+    backend: str = "auto",
+    storage: str = "float32",
+    rerank: bool = False,
+    workers: int = 1,
+    batch_size: int = 64,
 ) -> EmbeddingRetriever:
     """
     Convenience helper: load all chunks from JSONL files under interim_dir and
-    return an EmbeddingRetriever instance.
+    return an EmbeddingRetriever instance. `workers` > 1 encodes with a pool of
+    encoder processes.
     """
     interim_dir = interim_dir or config.INTERIM_DIR
     chunk_files = [p for p in interim_dir.glob("*.jsonl") if p.name != "manifest.jsonl"]
@@ -126,4 +674,13 @@ def build_index_from_chunks(
     for cf in chunk_files:
         chunks.extend(read_jsonl(cf))
 
-    return EmbeddingRetriever(chunks=chunks, model_name=model_name)
+    return EmbeddingRetriever(
+        chunks=chunks,
+        model_name=model_name,
+        mode=mode,
+        backend=backend,
+        storage=storage,
+        rerank=rerank,
+        workers=workers,
+        batch_size=batch_size,
+    )
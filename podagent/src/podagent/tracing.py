@@ -0,0 +1,162 @@
+"""
+Lightweight span tracing for the summarization pipeline.
+
+Tracing is off by default: `span()` then returns a shared no-op span, so the hot
+path only pays a global lookup. Call `start_trace()` to begin collecting spans and
+`Tracer.export()` to write them as Chrome trace-event JSON (open the file in
+chrome://tracing or https://ui.perfetto.dev).
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class Span:
+    """
+    One timed region of work. Use as a context manager; attach attributes with `set()`.
+    """
+
+    __slots__ = ("tracer", "name", "attrs", "start_ns", "end_ns", "tid")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+        self.end_ns = 0
+        self.tid = 0
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __enter__(self) -> "Span":
+        self.tid = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+
+class _NullSpan:
+    """
+    Stand-in returned when tracing is off. It is falsy so callers can skip
+    computing expensive attributes with `if sp: sp.set(...)`.
+    """
+
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects finished spans for a single run.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name: str, **attrs: Any) -> Span:
+        return Span(self, name, attrs)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Render spans as Chrome trace-event "complete" (ph=X) events.
+        """
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        events = []
+        for s in spans:
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": "podagent",
+                    "ph": "X",
+                    "ts": (s.start_ns - self._origin_ns) / 1000.0,
+                    "dur": (s.end_ns - s.start_ns) / 1000.0,
+                    "pid": pid,
+                    "tid": s.tid,
+                    "args": {k: _jsonable(v) for k, v in s.attrs.items()},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), ensure_ascii=False), encoding="utf-8")
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    return str(value)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def start_trace() -> Tracer:
+    """
+    Enable tracing for this process and return the active tracer.
+    """
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_trace() -> Optional[Tracer]:
+    """
+    Disable tracing and return the tracer that was active, if any.
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **attrs: Any):
+    """
+    Open a span on the active tracer, or a shared no-op span when tracing is off.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **attrs)
@@ -1,7 +1,8 @@
+import hashlib
 import re
 import unicodedata
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
 import json
 
 
@@ -73,6 +74,25 @@ def clean_transcript_text(text: str) -> str:
     return text
 
 
+def parse_timestamp(value: str) -> float:
+    """
+    Parse "SS", "MM:SS" or "H:MM:SS" (optionally wrapped in parentheses) into seconds.
+    """
+    parts = value.strip().strip("()").split(":")
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_timestamp(seconds: float) -> str:
+    """
+    Format seconds as HH:MM:SS, matching the transcript markers.
+    """
+    total = int(seconds)
+    return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+
+
 def sentence_split(text: str) -> List[str]:
     """
     Lightweight sentence splitter based on punctuation.
@@ -92,34 +112,108 @@ def chunk_text(
 
     Returns a list of (chunk_id, chunk_text).
     """
+    return [
+        (chunk_id, ctext)
+        for chunk_id, ctext, _, _ in chunk_text_with_spans(text, max_words, overlap_words)
+    ]
+
+
+def chunk_text_with_spans(
+    text: str,
+    max_words: int = 400,
+    overlap_words: int = 120,
+    breaks: Optional[Iterable[int]] = None,
+    min_fill: float = 0.75,
+    content_defined: bool = False,
+) -> List[Tuple[int, str, int, int]]:
+    """
+    Same windows as `chunk_text`, plus each chunk's [char_start, char_end) span in
+    `text`. For whitespace-collapsed text (see `clean_transcript_text`) the chunk
+    text equals `text[char_start:char_end]`.
+
+    `breaks` are char offsets of preferred boundaries (e.g. speaker-turn starts).
+    When a full window has a break in its last (1 - min_fill) share of words, the
+    chunk ends just before it and the next chunk starts at the break without
+    overlap, so chunks stay within one turn where possible.
+
+    With `content_defined`, a full window without such a break ends at a
+    content anchor instead of exactly `max_words`: among the positions in its
+    last (1 - min_fill) share of words (sentence ends preferred), the one whose
+    preceding words hash lowest. Boundaries then depend only on nearby text, so
+    after a small edit the following chunks fall back onto the same cuts.
+
+    Returns a list of (chunk_id, chunk_text, char_start, char_end).
+    """
     if max_words <= 0:
         return []
     if overlap_words >= max_words:
         overlap_words = max_words // 2
+    break_set = set(breaks or ())
+    floor = max(1, int(max_words * min_fill))
 
-    chunks: List[Tuple[int, str]] = []
+    chunks: List[Tuple[int, str, int, int]] = []
     window: List[str] = []
+    spans: List[Tuple[int, int]] = []
     chunk_id = 0
 
     for match in re.finditer(r"\S+", text):
         window.append(match.group())
+        spans.append(match.span())
         if len(window) >= max_words:
-            chunk_text = " ".join(window)
-            chunks.append((chunk_id, chunk_text))
+            cut = len(window)
+            at_break = False
+            if break_set:
+                for k in range(len(window) - 1, floor - 1, -1):
+                    if spans[k][0] in break_set:
+                        cut = k
+                        at_break = True
+                        break
+            if content_defined and not at_break:
+                cut = content_anchor(window, floor)
+            chunks.append((chunk_id, " ".join(window[:cut]), spans[0][0], spans[cut - 1][1]))
             chunk_id += 1
+            if at_break:
+                # Aligned to a break: the next chunk starts there.
+                window = window[cut:]
+                spans = spans[cut:]
+            elif cut < len(window):
+                # Content anchor: overlap is taken back from the cut.
+                start = max(1, cut - overlap_words)
+                window = window[start:]
+                spans = spans[start:]
             # Keep only the overlap from the current window
-            if overlap_words > 0:
+            elif overlap_words > 0:
                 window = window[-overlap_words :]
+                spans = spans[-overlap_words :]
             else:
                 window = []
+                spans = []
 
     # Flush remainder
     if window:
-        chunks.append((chunk_id, " ".join(window)))
+        chunks.append((chunk_id, " ".join(window), spans[0][0], spans[-1][1]))
 
     return chunks
 
 
+def anchor_hash(words: Sequence[str]) -> int:
+    """
+    Stable (process-independent) 64-bit hash of a few words, case-insensitive.
+    """
+    data = " ".join(w.lower() for w in words).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def content_anchor(words: Sequence[str], floor: int, context: int = 3) -> int:
+    """
+    Cut position in (`floor`, len(words)] chosen by content: the candidate whose
+    `context` preceding words hash lowest, among sentence ends if any.
+    """
+    candidates = range(max(1, floor), len(words) + 1)
+    sentence_ends = [k for k in candidates if words[k - 1][-1:] in ".?!"]
+    return min(sentence_ends or candidates, key=lambda k: anchor_hash(words[max(0, k - context) : k]))
+
+
 def read_jsonl(path: Path) -> List[dict]:
     records: List[dict] = []
     if not path.exists():
@@ -1,18 +1,32 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from podagent import config
-from podagent.models import OpenAISummarizer, PodcastSummarizer
+from podagent.data_pipeline.timeline import ChunkTimeIndex
+from podagent.data_pipeline.transcript_index import TranscriptIndex, transcript_index_path
+from podagent.models import LoopBudget, PodcastSummarizer
+from podagent.models.cache import SummaryCache
+from podagent.models.providers import available_providers, create_summarizer
+from podagent.models.usage import UsageLedger, UsageTotals, load_price_table
 from podagent.retriever import build_index_from_chunks
-from podagent.utils import read_jsonl
+from podagent.utils import format_timestamp, parse_timestamp, read_jsonl
 
 
 app = FastAPI(title="PodAgent API", version="0.1.0")
 
+# Running per-kind usage totals across every summarization request served; per-call
+# records live only in each request's own ledger.
+_usage = UsageTotals()
+_prices = load_price_table()
+
+# Captured responses for `provider="replay"` (written by scripts/summarize.py --mode record).
+CASSETTE_DIR = config.PROCESSED_DIR / "cassettes"
+
 # Allow local frontend/dev servers
 app.add_middleware(
     CORSMiddleware,
@@ -26,14 +40,31 @@ app.add_middleware(
 class SummarizeRequest(BaseModel):
     episode_id: str
     query: Optional[str] = None
+    speaker: Optional[str] = None
+    retrieval: str = "dense"
     use_transformer: bool = False
     use_openai: bool = True
     use_extractive: bool = False
     model_name: Optional[str] = None
+    # Registered provider name (models/providers.py); defaults to OpenAI.
+    provider: str = "openai"
+    provider_options: Dict[str, Any] = {}
     context_chunks: int = 8
+    mmr_lambda: float = 0.7
     hierarchical: bool = False
     group_size: int = 8
     structured: bool = False
+    # Let the planner choose single-pass / map-reduce / tree reduce; overrides hierarchical and group_size.
+    auto: bool = False
+    # Planner/retriever/critic loop (models/loop.py) within these per-request limits.
+    agentic: bool = False
+    max_calls: int = 16
+    max_tokens: int = 80_000
+    max_seconds: float = 60.0
+    critic_rounds: int = 1
+    loop_workers: int = 4
+    # Serve unchanged group and final summaries from config.SUMMARY_CACHE_DIR.
+    use_cache: bool = False
 
 
 @app.on_event("startup")
@@ -49,32 +80,62 @@ def summarize(req: SummarizeRequest):
     if not chunk_path.exists():
         raise HTTPException(status_code=404, detail="Episode chunks not found. Run ingest first.")
 
+    if req.retrieval not in ("dense", "hybrid"):
+        raise HTTPException(status_code=400, detail="retrieval must be 'dense' or 'hybrid'.")
+
     retriever = None
     if req.query:
         try:
-            retriever = build_index_from_chunks()
+            retriever = build_index_from_chunks(mode=req.retrieval)
         except Exception:
             retriever = None
 
     if req.use_transformer or req.use_extractive or not req.use_openai:
-        raise HTTPException(status_code=400, detail="Only OpenAI gpt-4o summarization is supported.")
+        raise HTTPException(status_code=400, detail="Only LLM summarization through a registered provider is supported.")
+    # Recording writes files, so it is left to the scripts; cassettes are served from CASSETTE_DIR only.
+    providers = [p for p in available_providers() if p != "record"]
+    if req.provider not in providers:
+        raise HTTPException(status_code=400, detail=f"provider must be one of: {', '.join(providers)}.")
+    options = dict(req.provider_options)
+    if "cassette" in options:
+        name = str(options["cassette"])
+        if Path(name).name != name:
+            raise HTTPException(status_code=400, detail="cassette must be a file name in the cassettes directory.")
+        options["cassette"] = str(CASSETTE_DIR / name)
     try:
-        summarizer = OpenAISummarizer(model=req.model_name or "gpt-4o")
+        summarizer = create_summarizer(
+            req.provider,
+            model=req.model_name,
+            ledger=UsageLedger(prices=_prices),
+            **options,
+        )
+    except (TypeError, ValueError, FileNotFoundError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid provider options: {exc}")
     except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"OpenAI summarizer failed: {exc}")
+        raise HTTPException(status_code=500, detail=f"{req.provider} summarizer failed: {exc}")
 
     agent = PodcastSummarizer(
         summarizer=summarizer,
         retriever=retriever,
         max_context_chunks=max(1, req.context_chunks),
+        mmr_lambda=req.mmr_lambda,
+        summary_cache=SummaryCache(config.SUMMARY_CACHE_DIR) if req.use_cache else None,
+        stable_groups=req.use_cache,
     )
-    result = agent.summarize_episode(
-        req.episode_id,
-        query=req.query,
-        hierarchical=req.hierarchical,
-        group_size=req.group_size,
-        structured=req.structured,
-    )
+    try:
+        result = agent.summarize_episode(
+            req.episode_id,
+            query=req.query,
+            hierarchical=req.hierarchical,
+            group_size=req.group_size,
+            structured=req.structured,
+            speaker=req.speaker,
+            auto=req.auto,
+            agentic=req.agentic,
+            budget=LoopBudget(req.max_calls, req.max_tokens, req.max_seconds, req.critic_rounds, req.loop_workers),
+        )
+    finally:
+        _usage.add(summarizer.ledger.calls)
     return {
         "episode_id": result.episode_id,
         "abstract": result.abstract,
@@ -82,14 +143,100 @@ def summarize(req: SummarizeRequest):
         "quotes": result.quotes,
         "q_and_a": result.q_and_a,
         "keywords": result.keywords,
-        "evidence": [
-            {"chunk": r.chunk, "score": r.score} for r in (result.evidence or [])
-        ],
+        # References only; chunk text is served by /chunks/{episode_id}/{chunk_id}.
+        "evidence": [r.to_dict() for r in (result.evidence or [])],
+        "usage": result.usage,
+        "verification": result.verification,
+        "plan": result.plan,
+        "cache": result.cache,
+        "loop": result.loop,
     }
 
 
+@app.get("/usage")
+def usage():
+    """
+    Token, latency, and cost totals across every request served by this process.
+    """
+    return _usage.summary()
+
+
 @app.get("/episodes")
 def list_episodes():
     manifest_path = config.INTERIM_DIR / "manifest.jsonl"
     manifest = read_jsonl(manifest_path)
     return {"episodes": manifest}
+
+
+@lru_cache(maxsize=64)
+def _chunk_time_index(episode_id: str, mtime: float) -> ChunkTimeIndex:
+    # mtime is part of the cache key so re-ingested episodes are reloaded.
+    return ChunkTimeIndex(read_jsonl(config.INTERIM_DIR / f"{episode_id}.jsonl"))
+
+
+@lru_cache(maxsize=64)
+def _chunks_by_id(episode_id: str, mtime: float) -> Dict[int, dict]:
+    return {c.get("chunk_id"): c for c in read_jsonl(config.INTERIM_DIR / f"{episode_id}.jsonl")}
+
+
+@lru_cache(maxsize=64)
+def _transcript_index(episode_id: str, mtime: float) -> TranscriptIndex:
+    return TranscriptIndex.load(transcript_index_path(episode_id, config.INTERIM_DIR))
+
+
+def _parse_time_param(value: str) -> float:
+    try:
+        return parse_timestamp(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid time: {value!r}. Use seconds or H:MM:SS.")
+
+
+@app.get("/episodes/{episode_id}/chunks")
+def chunks_in_range(episode_id: str, start: str, end: Optional[str] = None):
+    """
+    Chunks whose time range overlaps [start, end] (seconds or H:MM:SS); with no
+    `end`, the chunks covering `start`.
+    """
+    chunk_path = config.INTERIM_DIR / f"{episode_id}.jsonl"
+    if not chunk_path.exists():
+        raise HTTPException(status_code=404, detail="Episode chunks not found. Run ingest first.")
+    index = _chunk_time_index(episode_id, chunk_path.stat().st_mtime)
+    start_s = _parse_time_param(start)
+    end_s = _parse_time_param(end) if end is not None else None
+    return {
+        "episode_id": episode_id,
+        "start": start_s,
+        "end": end_s,
+        "chunks": index.covering(start_s, end_s),
+    }
+
+
+@app.get("/chunks/{episode_id}/{chunk_id}")
+def chunk_by_id(episode_id: str, chunk_id: int):
+    """
+    Resolve an evidence reference: the chunk's text, span, times and speakers.
+    """
+    chunk_path = config.INTERIM_DIR / f"{episode_id}.jsonl"
+    if not chunk_path.exists():
+        raise HTTPException(status_code=404, detail="Episode chunks not found. Run ingest first.")
+    chunk = _chunks_by_id(episode_id, chunk_path.stat().st_mtime).get(chunk_id)
+    if chunk is None:
+        raise HTTPException(status_code=404, detail=f"Chunk {chunk_id} not found in {episode_id}.")
+    return {k: v for k, v in chunk.items() if k != "source_path"}
+
+
+@app.get("/episodes/{episode_id}/timestamp")
+def timestamp_of_offset(episode_id: str, offset: int):
+    """
+    Resolve a character offset in the cleaned transcript to a time.
+    """
+    path = transcript_index_path(episode_id, config.INTERIM_DIR)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Transcript index not found. Run ingest first.")
+    seconds = _transcript_index(episode_id, path.stat().st_mtime).timeline.time_at(offset)
+    return {
+        "episode_id": episode_id,
+        "offset": offset,
+        "seconds": seconds,
+        "timestamp": format_timestamp(seconds) if seconds is not None else None,
+    }